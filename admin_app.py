@@ -1,11 +1,14 @@
 import streamlit as st
 from shared import *
-from database import DatabaseManager
-from mediconnect_app import AdvancedSymptomAnalyzer, HealthcareAnalytics
+from analyzer import AdvancedSymptomAnalyzer, HealthcareAnalytics
+from resources import get_shared_db_manager
+from components import record_list
+from page_metrics import instrument_page
+from profiler import profile_reruns
 
 # Initialize database and session state
 if 'db_manager' not in st.session_state:
-    st.session_state.db_manager = DatabaseManager()
+    st.session_state.db_manager = get_shared_db_manager()
 
 if 'user_logged_in' not in st.session_state:
     st.session_state.user_logged_in = False
@@ -14,6 +17,7 @@ if 'user_info' not in st.session_state:
 if 'current_screen' not in st.session_state:
     st.session_state.current_screen = 'admin_dashboard'
 
+@profile_reruns
 def main():
     # Check if admin is logged in
     if not st.session_state.user_logged_in or st.session_state.user_info.get('role') != 'admin':
@@ -67,6 +71,7 @@ def main():
     with tab5:
         show_analytics()
 
+@instrument_page
 def show_admin_dashboard():
     st.markdown('<h2 class="sub-header">📊 System Overview</h2>', unsafe_allow_html=True)
 
@@ -107,19 +112,31 @@ def show_admin_dashboard():
     with col1:
         st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
         st.write("**Recent Appointments:**")
-        appointments = st.session_state.db_manager.get_all_appointments()
-        for apt in appointments[:5]:
-            st.write(f"• {apt[1]} - {apt[3]} with {apt[5]} ({apt[4]})")
+        appointments = st.session_state.db_manager.get_all_appointments(limit=5)
+        for apt in appointments:
+            st.write(f"• {apt.patient_name} - {apt.appointment_date} with {apt.doctor_name} ({apt.appointment_time})")
         st.markdown('</div>', unsafe_allow_html=True)
 
     with col2:
         st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
         st.write("**Recent Symptom Analyses:**")
-        analyses = st.session_state.db_manager.get_all_symptom_analyses_with_patients()
-        for analysis in analyses[:5]:
-            st.write(f"• {analysis[1]}: {analysis[2][:30]}...")
+        # Summary columns only; the analysis text is fetched for the one that is opened
+        analyses = {analysis.id: analysis for analysis in
+                    st.session_state.db_manager.list_symptom_analyses_with_patients(limit=5)}
+        for analysis in analyses.values():
+            st.write(f"• {analysis.full_name}: {analysis.symptoms[:30]}...")
+        opened = st.selectbox(
+            "Open analysis",
+            [None] + list(analyses),
+            format_func=lambda analysis_id: "Select an analysis..." if analysis_id is None
+            else f"{analyses[analysis_id].full_name} - {analyses[analysis_id].timestamp}",
+            key="dashboard_recent_analysis"
+        )
+        if opened is not None:
+            st.success(st.session_state.db_manager.get_analysis_text(opened))
         st.markdown('</div>', unsafe_allow_html=True)
 
+@instrument_page
 def show_user_management():
     st.markdown('<h2 class="sub-header">👥 User Management</h2>', unsafe_allow_html=True)
 
@@ -169,30 +186,40 @@ def show_user_management():
     # User list
     st.markdown('<h3 class="sub-header">📋 All Users</h3>', unsafe_allow_html=True)
 
-    users = st.session_state.db_manager.get_all_users()
+    db = st.session_state.db_manager
+    fields = ('id', 'full_name', 'email', 'location', 'age', 'gender', 'phone', 'role')
+    total = db.count_users()
 
-    if users:
-        # Search and filter
+    if total:
+        # Search and filter (in the database)
         search = st.text_input("Search users", placeholder="Name or email")
-
-        if search:
-            users = [user for user in users if search.lower() in user[1].lower() or search.lower() in user[4].lower()]
-
-        for user in users:
+        matching = db.count_users(search=search) if search else total
+
+        user = record_list(
+            "admin_all_users",
+            matching,
+            lambda limit, offset: db.list_users(fields=fields, search=search or None, limit=limit, offset=offset),
+            lambda u: {"ID": u.id, "Name": u.full_name, "Role": u.role, "Email": u.email, "Location": u.location},
+            lambda u: f"{u.full_name} ({u.role}) - {u.email}"
+        )
+        if not matching:
+            st.info("No users match your search")
+
+        if user:
             st.markdown('<div class="patient-record">', unsafe_allow_html=True)
             col1, col2, col3 = st.columns([3, 1, 1])
 
             with col1:
-                st.write(f"**{user[1]}** ({user[9]})")  # name and role
-                st.write(f"📧 {user[4]} • 📍 {user[6]}")  # email and location
-                st.write(f"🎂 {user[2]} years • {user[3]}")  # age and gender
+                st.write(f"**{user.full_name}** ({user.role})")
+                st.write(f"📧 {user.email} • 📍 {user.location}")
+                st.write(f"🎂 {user.age} years • {user.gender}")
 
             with col2:
-                st.write(f"📞 {user[5] or 'N/A'}")  # phone
+                st.write(f"📞 {user.phone or 'N/A'}")
 
             with col3:
-                if st.button("🗑️ Delete", key=f"delete_user_{user[0]}"):
-                    if st.session_state.db_manager.delete_user(user[0]):
+                if st.button("🗑️ Delete", key=f"delete_user_{user.id}"):
+                    if db.delete_user(user.id):
                         st.success("User deleted successfully!")
                         st.rerun()
                     else:
@@ -202,14 +229,10 @@ def show_user_management():
     else:
         st.info("No users found")
 
+@instrument_page
 def show_doctor_management():
     st.markdown('<h2 class="sub-header">👨‍⚕️ Doctor Management</h2>', unsafe_allow_html=True)
 
-    # Get all users with role 'doctor' to filter valid doctors
-    all_users = st.session_state.db_manager.get_all_users()
-    doctor_users = [user for user in all_users if user[10] == 'doctor']  # role is at index 10
-    doctor_names = {user[1] for user in doctor_users}  # full_name is at index 1
-
     # Add new doctor
     with st.expander("➕ Add New Doctor"):
         with st.form("add_doctor_form"):
@@ -231,7 +254,8 @@ def show_doctor_management():
 
             if submitted and name and specialty:
                 # Check if doctor has a user account
-                if name not in doctor_names:
+                user_id = st.session_state.db_manager.find_doctor_user_id(name)
+                if user_id is None:
                     st.error("Cannot add doctor without a corresponding user account. Please create a doctor user account first.")
                 else:
                     doctor_data = {
@@ -243,7 +267,8 @@ def show_doctor_management():
                         'location': location,
                         'languages': languages.split(',') if languages else [],
                         'consultation_fee': consultation_fee,
-                        'available': available
+                        'available': available,
+                        'user_id': user_id
                     }
 
                     doctor_id = st.session_state.db_manager.add_doctor(doctor_data)
@@ -257,7 +282,7 @@ def show_doctor_management():
 
     doctors = st.session_state.db_manager.get_all_doctors()
     # Filter to only show doctors who have user accounts
-    valid_doctors = [doc for doc in doctors if doc['name'] in doctor_names]
+    valid_doctors = [doc for doc in doctors if doc['user_id'] is not None]
 
     if valid_doctors:
         st.write(f"Total Doctors: {len(valid_doctors)}")
@@ -297,80 +322,58 @@ def show_doctor_management():
     else:
         st.info("No doctor user accounts found")
 
+@instrument_page
 def show_doctor_user_accounts():
     st.markdown('<h3 class="sub-header">👨‍⚕️ Doctor User Accounts</h3>', unsafe_allow_html=True)
 
-    # Get all users with role 'doctor'
-    all_users = st.session_state.db_manager.get_all_users()
-    doctor_users = [user for user in all_users if user[10] == 'doctor']  # role is at index 10
+    # Search filter
+    search_term = st.text_input("🔍 Search doctors by name or email...", key="doctor_search")
 
-    # Get all doctors from doctors table
-    doctors_table = st.session_state.db_manager.get_all_doctors()
-    doctor_names = {doc['name'] for doc in doctors_table}
+    # Doctor accounts joined with their doctors record (only doctors that exist in both tables)
+    doctor_accounts = st.session_state.db_manager.get_doctor_accounts(search=search_term)
 
-    # Filter to only show doctors who exist in both users and doctors tables
-    valid_doctor_users = [user for user in doctor_users if user[1] in doctor_names]
-
-    if valid_doctor_users:
-        st.write(f"Total Doctor Accounts: {len(valid_doctor_users)}")
-
-        # Search filter
-        search_term = st.text_input("🔍 Search doctors by name or email...", key="doctor_search")
-
-        # Filter doctors
-        filtered_doctors = valid_doctor_users
-        if search_term:
-            filtered_doctors = [doc for doc in valid_doctor_users if
-                               search_term.lower() in doc[1].lower() or  # full_name
-                               search_term.lower() in doc[4].lower()]    # email
+    if doctor_accounts:
+        st.write(f"Total Doctor Accounts: {len(doctor_accounts)}")
 
         # Display doctor user accounts
-        for doctor in filtered_doctors:
-            # Get doctor record from doctors table to get status
-            doctor_record = next((d for d in doctors_table if d['name'] == doctor[1]), None)
-
-            with st.expander(f"👨‍⚕️ {doctor[1]} (ID: {doctor[0]})"):
+        for doctor in doctor_accounts:
+            with st.expander(f"👨‍⚕️ {doctor['full_name']} (ID: {doctor['user_id']})"):
                 col1, col2, col3 = st.columns([2, 1, 1])
 
                 with col1:
-                    st.write(f"**Name:** {doctor[1]}")
-                    st.write(f"**Email:** {doctor[4]}")
-                    st.write(f"**Phone:** {doctor[5] if doctor[5] else 'N/A'}")
-                    st.write(f"**Location:** {doctor[6]}")
-                    st.write(f"**Age:** {doctor[2]} • **Gender:** {doctor[3]}")
-
-                    # Show doctor-specific info if available
-                    if doctor_record:
-                        st.write(f"**Specialty:** {doctor_record['specialty']}")
-                        st.write(f"**Experience:** {doctor_record['experience']}")
-                        st.write(f"**Languages:** {', '.join(doctor_record['languages'])}")
-                        st.write(f"**Consultation Fee:** ₱{doctor_record['consultation_fee']}")
+                    st.write(f"**Name:** {doctor['full_name']}")
+                    st.write(f"**Email:** {doctor['email']}")
+                    st.write(f"**Phone:** {doctor['phone'] if doctor['phone'] else 'N/A'}")
+                    st.write(f"**Location:** {doctor['location']}")
+                    st.write(f"**Age:** {doctor['age']} • **Gender:** {doctor['gender']}")
+
+                    # Doctor-specific info from the doctors table
+                    st.write(f"**Specialty:** {doctor['specialty']}")
+                    st.write(f"**Experience:** {doctor['experience']}")
+                    st.write(f"**Languages:** {', '.join(doctor['languages'])}")
+                    st.write(f"**Consultation Fee:** ₱{doctor['consultation_fee']}")
 
                 with col2:
                     # Status display
-                    if doctor_record:
-                        status = doctor_record['status']
-                        status_color = {"online": "🟢", "available": "🟡", "offline": "🔴"}
-                        st.write(f"**Status:** {status_color.get(status, '⚪')} {status.title()}")
-                        st.write(f"**Available:** {'Yes' if doctor_record['available'] else 'No'}")
-                    else:
-                        st.write("**Status:** Not set")
-                        st.write("**Available:** Unknown")
+                    status = doctor['status']
+                    status_color = {"online": "🟢", "available": "🟡", "offline": "🔴"}
+                    st.write(f"**Status:** {status_color.get(status, '⚪')} {status.title()}")
+                    st.write(f"**Available:** {'Yes' if doctor['available'] else 'No'}")
 
                     # Last login
-                    last_login = doctor[12] if doctor[12] else "Never"
+                    last_login = doctor['last_login'] if doctor['last_login'] else "Never"
                     st.write(f"**Last Login:** {last_login}")
 
                 with col3:
                     # Action buttons
-                    if st.button("View Profile", key=f"view_{doctor[0]}"):
+                    if st.button("View Profile", key=f"view_{doctor['user_id']}"):
                         st.info("Profile viewing functionality can be implemented here.")
 
-                    if st.button("Contact", key=f"contact_{doctor[0]}"):
+                    if st.button("Contact", key=f"contact_{doctor['user_id']}"):
                         st.info("Contact functionality can be implemented here.")
 
-                    if st.button("Delete Account", key=f"delete_doctor_{doctor[0]}"):
-                        if st.session_state.db_manager.delete_user(doctor[0]):
+                    if st.button("Delete Account", key=f"delete_doctor_{doctor['user_id']}"):
+                        if st.session_state.db_manager.delete_user(doctor['user_id']):
                             st.success("Doctor account deleted successfully!")
                             st.rerun()
                         else:
@@ -378,40 +381,54 @@ def show_doctor_user_accounts():
     else:
         st.info("No doctor user accounts found.")
 
+@instrument_page
 def show_patient_records():
     st.markdown('<h2 class="sub-header">📋 Patient Records</h2>', unsafe_allow_html=True)
 
     # Appointments
     st.markdown('<h3 class="sub-header">📅 All Appointments</h3>', unsafe_allow_html=True)
 
-    appointments = st.session_state.db_manager.get_all_appointments()
-
-    if appointments:
-        for apt in appointments:
+    db = st.session_state.db_manager
+    total_appointments = db.count_appointments()
+
+    if total_appointments:
+        # One page in a table; the selected appointment gets the status controls
+        apt = record_list(
+            "admin_appointments",
+            total_appointments,
+            lambda limit, offset: db.list_appointments(limit=limit, offset=offset),
+            lambda a: {"Patient": a.patient_name, "Doctor": a.doctor_name, "Date": a.appointment_date,
+                       "Time": a.appointment_time, "Status": a.status.title()},
+            lambda a: f"{a.patient_name} - {a.appointment_date} {a.appointment_time} with {a.doctor_name}"
+        )
+
+        if apt:
             st.markdown('<div class="patient-record">', unsafe_allow_html=True)
             col1, col2, col3 = st.columns([3, 1, 1])
 
             with col1:
-                st.write(f"**{apt[1]}** - {apt[3]} at {apt[4]}")  # patient name, date, time
-                st.write(f"👨‍⚕️ {apt[5]} ({apt[6]})")  # doctor name, specialty
-                st.write(f"📝 {apt[2] or 'No reason provided'}")  # reason
+                st.write(f"**{apt.patient_name}** - {apt.appointment_date} at {apt.appointment_time}")
+                st.write(f"👨‍⚕️ {apt.doctor_name} ({apt.specialty})")
+                st.write(f"📝 {apt.reason or 'No reason provided'}")
 
             with col2:
                 status_color = {"scheduled": "🟡", "completed": "🟢", "cancelled": "🔴"}
-                st.write(f"{status_color.get(apt[7], '⚪')} {apt[7].title()}")
+                st.write(f"{status_color.get(apt.status, '⚪')} {apt.status.title()}")
 
             with col3:
                 new_status = st.selectbox(
                     "Update Status",
                     ["scheduled", "completed", "cancelled"],
-                    index=["scheduled", "completed", "cancelled"].index(apt[7]),
-                    key=f"apt_status_{apt[0]}"
+                    index=["scheduled", "completed", "cancelled"].index(apt.status),
+                    key=f"apt_status_{apt.id}"
                 )
 
-                if st.button("Update", key=f"update_apt_{apt[0]}"):
-                    st.session_state.db_manager.update_appointment_status(apt[0], new_status)
-                    st.success("Appointment updated!")
-                    st.rerun()
+                if st.button("Update", key=f"update_apt_{apt.id}"):
+                    if db.update_appointment_status(apt.id, new_status):
+                        st.success("Appointment updated!")
+                        st.rerun()
+                    else:
+                        st.error("The doctor has another appointment at this time; it can't be reopened.")
 
             st.markdown('</div>', unsafe_allow_html=True)
     else:
@@ -420,19 +437,29 @@ def show_patient_records():
     # Symptom Analyses
     st.markdown('<h3 class="sub-header">🩺 Symptom Analyses</h3>', unsafe_allow_html=True)
 
-    analyses = st.session_state.db_manager.get_all_symptom_analyses_with_patients()
+    total_analyses = db.count_symptom_analyses()
+
+    if total_analyses:
+        # Summary columns per page; the analysis text is fetched for the selected one
+        analysis = record_list(
+            "admin_analyses",
+            total_analyses,
+            lambda limit, offset: db.list_symptom_analyses_with_patients(limit=limit, offset=offset),
+            lambda a: {"Patient": a.full_name, "Symptoms": a.symptoms[:60], "Date": a.timestamp},
+            lambda a: f"{a.full_name} - {a.timestamp}"
+        )
 
-    if analyses:
-        for analysis in analyses:
+        if analysis:
             st.markdown('<div class="analysis-result">', unsafe_allow_html=True)
-            st.write(f"**Patient:** {analysis[1]} ({analysis[2]} years, {analysis[3]})")
-            st.write(f"**Symptoms:** {analysis[4]}")
-            st.write(f"**Analysis:** {analysis[5][:200]}...")
-            st.write(f"**Date:** {analysis[6]}")
+            st.write(f"**Patient:** {analysis.full_name} ({analysis.age} years, {analysis.gender})")
+            st.write(f"**Symptoms:** {analysis.symptoms}")
+            st.write(f"**Analysis:** {db.get_analysis_text(analysis.id)}")
+            st.write(f"**Date:** {analysis.timestamp}")
             st.markdown('</div>', unsafe_allow_html=True)
     else:
         st.info("No symptom analyses found")
 
+@instrument_page
 def show_analytics():
     st.markdown('<h2 class="sub-header">📈 Analytics & Insights</h2>', unsafe_allow_html=True)
 
@@ -443,8 +470,8 @@ def show_analytics():
 
     if analyses_data:
         # Age distribution
-        ages = [row[1] for row in analyses_data]
-        genders = [row[2] for row in analyses_data]
+        ages = [row.age for row in analyses_data]
+        genders = [row.gender for row in analyses_data]
 
         col1, col2 = st.columns(2)
 
@@ -482,7 +509,7 @@ def show_analytics():
     if analyses_data:
         all_symptoms = []
         for row in analyses_data:
-            symptoms = row[0].lower().split(',')
+            symptoms = row.symptoms.lower().split(',')
             all_symptoms.extend([s.strip() for s in symptoms])
 
         symptom_counts = pd.Series(all_symptoms).value_counts().head(10)
@@ -0,0 +1,552 @@
+import os
+import streamlit as st
+from components import record_list
+from page_metrics import get_page_metrics, instrument_page
+from profiler import MODES, get_profiler
+from session_memory import get_session_auditor
+from sql_metrics import get_sql_recorder
+
+@instrument_page
+def show_admin():
+    st.markdown("### Admin Dashboard")
+    st.write("Manage users, patients, doctors, and system analytics")
+    
+    # Quick Stats from database
+    stats = st.session_state.db_manager.get_stats()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown(f'''
+        <div class="stat-card">
+            <div class="stat-number">{stats['total_users']}</div>
+            <div class="stat-label">Total Patients</div>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f'''
+        <div class="stat-card">
+            <div class="stat-number">{stats['active_today']}</div>
+            <div class="stat-label">Active Today</div>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(f'''
+        <div class="stat-card">
+            <div class="stat-number">{stats['total_appointments']}</div>
+            <div class="stat-label">Consultations</div>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown(f'''
+        <div class="stat-card">
+            <div class="stat-number">{stats['total_analyses']}</div>
+            <div class="stat-label">AI Analyses</div>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Admin navigation
+    col1, col2, col3, col4, col5 = st.columns(5)
+
+    with col1:
+        if st.button("👥 Manage Users", use_container_width=True):
+            st.session_state.admin_section = 'users'
+            st.rerun()
+
+    with col2:
+        if st.button("📊 Manage Patients", use_container_width=True):
+            st.session_state.admin_section = 'patients'
+            st.rerun()
+
+    with col3:
+        if st.button("👨‍⚕️ Manage Doctors", use_container_width=True):
+            st.session_state.admin_section = 'doctors'
+            st.rerun()
+
+    with col4:
+        if st.button("📈 System Analytics", use_container_width=True):
+            st.session_state.admin_section = 'analytics'
+            st.rerun()
+
+    with col5:
+        if st.button("🩺 Diagnostics", use_container_width=True):
+            st.session_state.admin_section = 'diagnostics'
+            st.rerun()
+
+    # Initialize admin section
+    if 'admin_section' not in st.session_state:
+        st.session_state.admin_section = 'users'
+
+    # Display selected section
+    if st.session_state.admin_section == 'users':
+        show_admin_users()
+    elif st.session_state.admin_section == 'patients':
+        show_admin_patients()
+    elif st.session_state.admin_section == 'doctors':
+        show_admin_doctors()
+    elif st.session_state.admin_section == 'analytics':
+        show_admin_analytics()
+    elif st.session_state.admin_section == 'diagnostics':
+        show_admin_diagnostics()
+
+    # Logout button
+    st.markdown("---")
+    if st.button("🚪 Logout", use_container_width=True):
+        st.session_state.user_logged_in = False
+        st.session_state.current_screen = 'login_signup'
+        st.session_state.user_info = {}
+        st.rerun()
+
+def show_medical_history(user_id, key):
+    """Medical history is only read from the database once the viewer asks for it"""
+    if st.checkbox("Show medical history", key=key):
+        medical_history = st.session_state.db_manager.get_user_medical_history(user_id)
+        st.write(f"**Medical History:** {medical_history if medical_history else 'None recorded'}")
+
+@instrument_page
+def show_admin_users():
+    st.markdown("#### 👥 User Management")
+
+    # Display success/error messages if any
+    if 'user_delete_message' in st.session_state:
+        if st.session_state['user_delete_message']['type'] == 'success':
+            st.success(st.session_state['user_delete_message']['text'])
+        else:
+            st.error(st.session_state['user_delete_message']['text'])
+        # Clear message after displaying
+        del st.session_state['user_delete_message']
+
+    # Create tabs for Patients and Doctors
+    tab1, tab2 = st.tabs(["👤 Patients", "👨‍⚕️ Doctors"])
+
+    with tab1:
+        st.markdown("### 👤 Patient Accounts")
+        show_user_accounts('patient', "Patient")
+
+    with tab2:
+        st.markdown("### 👨‍⚕️ Doctor Accounts")
+        show_user_accounts('doctor', "Doctor")
+
+def show_user_accounts(role, noun):
+    """Paged, searchable accounts of one role; only the selected account gets a detail panel"""
+    db = st.session_state.db_manager
+    total = db.count_users(role=role)
+    if not total:
+        st.info(f"No {noun.lower()}s registered yet.")
+        return
+
+    st.write(f"Total {noun}s: {total}")
+
+    # Search filter (applied in the database)
+    search_term = st.text_input(f"🔍 Search {noun.lower()}s by name or email...", key=f"search_{role}s")
+    matching = db.count_users(role=role, search=search_term) if search_term else total
+
+    user = record_list(
+        f"admin_{role}s",
+        matching,
+        lambda limit, offset: db.list_users(role=role, search=search_term or None, limit=limit, offset=offset),
+        lambda u: {"ID": u.id, "Name": u.full_name, "Email": u.email, "Location": u.location,
+                   "Last Login": u.last_login or 'Never'},
+        lambda u: f"{noun} ID {u.id}: {u.full_name} ({u.email})"
+    )
+    if not matching:
+        st.info("No accounts match your search.")
+
+    if user:
+        show_user_detail(user, noun)
+
+def show_user_detail(user, noun):
+    user_id = user.id
+    st.markdown(f"##### {noun} ID {user_id}: {user.full_name}")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write(f"**Name:** {user.full_name}")
+        st.write(f"**Email:** {user.email}")
+        st.write(f"**Age:** {user.age}")
+        st.write(f"**Gender:** {user.gender}")
+        st.write(f"**Role:** {user.role}")
+    with col2:
+        st.write(f"**Location:** {user.location}")
+        st.write(f"**Phone:** {user.phone if user.phone else 'N/A'}")
+        st.write(f"**Emergency Contact:** {user.emergency_contact if user.emergency_contact else 'N/A'}")
+        st.write(f"**Registered:** {user.created_at if user.created_at else 'N/A'}")
+        st.write(f"**Last Login:** {user.last_login if user.last_login else 'Never'}")
+    show_medical_history(user_id, key=f"history_{user_id}")
+
+    # Delete button
+    st.markdown("---")
+    col1, col2 = st.columns([3, 1])
+    with col2:
+        if str(user_id) == str(st.session_state.user_info.get('patient_id')):
+            st.warning("⚠️ Cannot delete your own account")
+            return
+
+        # One pending confirmation at a time: the id of the user being deleted
+        if st.session_state.get('confirm_delete_user') != user_id:
+            if st.button(f"🗑️ Delete {noun}", key=f"delete_user_{user_id}", type="secondary",
+                         use_container_width=True):
+                st.session_state['confirm_delete_user'] = user_id
+                st.rerun()
+            return
+
+        st.warning(f"⚠️ Are you sure? This will permanently delete the {noun.lower()} and all their data.")
+        col_yes, col_no = st.columns(2)
+        with col_yes:
+            if st.button("✅ Yes, Delete", key=f"yes_delete_user_{user_id}", type="primary"):
+                success = st.session_state.db_manager.delete_user(user_id)
+                del st.session_state['confirm_delete_user']
+                if success:
+                    st.session_state['user_delete_message'] = {
+                        'type': 'success',
+                        'text': f"✅ {noun} {user.full_name} has been deleted successfully."
+                    }
+                else:
+                    st.session_state['user_delete_message'] = {
+                        'type': 'error',
+                        'text': f"❌ Failed to delete {noun.lower()}. Please try again."
+                    }
+                st.rerun()
+        with col_no:
+            if st.button("❌ Cancel", key=f"cancel_delete_user_{user_id}"):
+                del st.session_state['confirm_delete_user']
+                st.rerun()
+
+@instrument_page
+def show_admin_patients():
+    st.markdown("#### 📊 Manage Patients")
+    st.write("View patient records with symptoms and doctor/AI advice")
+    
+    db = st.session_state.db_manager
+    total_analyses = db.count_symptom_analyses()
+    
+    if total_analyses:
+        st.write(f"Total Symptom Analyses: {total_analyses}")
+        
+        # Search filter (applied in the database)
+        search_term = st.text_input("🔍 Search patients by name or email...")
+        matching = (db.count_symptom_analyses(search=search_term, search_email=True)
+                    if search_term else total_analyses)
+        
+        # Summary table; only the selected record gets a detail panel
+        analysis = record_list(
+            "admin_patients",
+            matching,
+            lambda limit, offset: db.list_symptom_analyses_with_patients(
+                search=search_term, search_email=True, limit=limit, offset=offset),
+            lambda a: {"Patient": a.full_name, "Email": a.email, "Symptoms": a.symptoms[:60], "Date": a.timestamp},
+            lambda a: f"{a.full_name} - {a.timestamp}"
+        )
+        if not matching:
+            st.info("No records match your search.")
+        
+        if analysis:
+            st.markdown(f"##### Patient: {analysis.full_name} - {analysis.timestamp}")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown("**Patient Information**")
+                st.write(f"**Name:** {analysis.full_name}")
+                st.write(f"**Age:** {analysis.age}")
+                st.write(f"**Gender:** {analysis.gender}")
+                st.write(f"**Email:** {analysis.email}")
+                st.write(f"**Patient ID:** {analysis.patient_id}")
+            
+            with col2:
+                st.markdown("**Analysis Information**")
+                st.write(f"**Date:** {analysis.timestamp}")
+                st.write(f"**Analysis ID:** {analysis.id}")
+            
+            st.markdown("---")
+            st.markdown("**Symptoms Reported:**")
+            st.info(analysis.symptoms)
+            
+            st.markdown("**Doctor/AI Advice:**")
+            st.success(db.get_analysis_text(analysis.id))
+    else:
+        st.info("No patient symptom analyses recorded yet.")
+
+@instrument_page
+def show_admin_doctors():
+    st.markdown("#### 👨‍⚕️ Manage Doctors")
+    st.write("View doctor availability and online status")
+    
+    # Get all doctors from database
+    doctors = st.session_state.db_manager.get_all_doctors()
+    
+    if doctors:
+        # Count online doctors
+        online_doctors = [d for d in doctors if d['status'] == 'online']
+        available_doctors = [d for d in doctors if d['available']]
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Doctors", len(doctors))
+        with col2:
+            st.metric("Online Now", len(online_doctors))
+        with col3:
+            st.metric("Available", len(available_doctors))
+        
+        st.markdown("---")
+        
+        # Filter options
+        col1, col2 = st.columns(2)
+        with col1:
+            status_filter = st.selectbox("Filter by Status", ["All", "Online", "Available", "Offline"])
+        with col2:
+            specialty_filter = st.selectbox("Filter by Specialty", 
+                                           ["All"] + list(set([d['specialty'] for d in doctors])))
+        
+        # Filter doctors
+        filtered_doctors = doctors
+        if status_filter == "Online":
+            filtered_doctors = [d for d in filtered_doctors if d['status'] == 'online']
+        elif status_filter == "Available":
+            filtered_doctors = [d for d in filtered_doctors if d['available']]
+        elif status_filter == "Offline":
+            filtered_doctors = [d for d in filtered_doctors if d['status'] == 'offline']
+        
+        if specialty_filter != "All":
+            filtered_doctors = [d for d in filtered_doctors if d['specialty'] == specialty_filter]
+        
+        # Display doctors
+        st.markdown(f"### 📋 Doctors ({len(filtered_doctors)})")
+        
+        for doctor in filtered_doctors:
+            with st.container():
+                st.markdown('<div class="doctor-card">', unsafe_allow_html=True)
+                col1, col2, col3 = st.columns([2, 2, 1])
+                
+                with col1:
+                    st.markdown(f"**{doctor['name']}**")
+                    st.write(f"🏥 {doctor['specialty']}")
+                    st.write(f"📍 {doctor['location']}")
+                    st.write(f"⭐ {doctor['rating']}/5.0 • {doctor['experience']} experience")
+                
+                with col2:
+                    status_color = "🟢" if doctor['status'] == 'online' else "🔵" if doctor['status'] == 'available' else "⚪"
+                    st.write(f"{status_color} Status: {doctor['status'].title()}")
+                    st.write(f"✅ Available: {'Yes' if doctor['available'] else 'No'}")
+                    st.write(f"🗣️ Languages: {', '.join(doctor['languages'])}")
+                    if doctor.get('consultation_fee'):
+                        st.write(f"💰 Consultation: ₱{doctor['consultation_fee']}")
+                
+                with col3:
+                    if doctor['status'] == 'online':
+                        st.success("🟢 Online")
+                    elif doctor['available']:
+                        st.info("🔵 Available")
+                    else:
+                        st.warning("⚪ Offline")
+                
+                st.markdown('</div>', unsafe_allow_html=True)
+    else:
+        st.info("No doctors in the system.")
+
+@instrument_page
+def show_admin_analytics():
+    # Charting libraries are only loaded once an analytics page is opened
+    import pandas as pd
+    import plotly.express as px
+
+    st.markdown("#### 📈 System Analytics")
+    st.write("View statistics on symptom checker usage, user demographics, and condition severity")
+    
+    # Aggregated in the database; the analysis texts themselves are never loaded
+    db = st.session_state.db_manager
+    total_analyses = db.count_symptom_analyses()
+    
+    if total_analyses:
+        # (age, gender, number of analyses) groups
+        demographics = db.get_analysis_demographics()
+
+        st.markdown("### Symptom Checker Usage Statistics")
+        
+        # Key metrics
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Symptom Checks", total_analyses)
+        with col2:
+            st.metric("Total Users", db.count_users())
+        with col3:
+            # Count analyses today (indexed range query)
+            today_count = st.session_state.db_manager.count_analyses_in_window('today')
+            st.metric("Analyses Today", today_count)
+        with col4:
+            # Count by gender
+            gender_dist = {}
+            for _, gender, count in demographics:
+                if gender:
+                    gender_dist[gender] = gender_dist.get(gender, 0) + count
+            most_common_gender = max(gender_dist.items(), key=lambda x: x[1])[0] if gender_dist else "N/A"
+            st.metric("Most Common Gender", most_common_gender)
+        
+        st.markdown("---")
+        
+        # Age distribution
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("### Age Distribution")
+            age_counts = [(age, count) for age, _, count in demographics if age]
+            if age_counts:
+                fig_age = px.histogram(x=[age for age, _ in age_counts], y=[count for _, count in age_counts],
+                                     histfunc='sum', nbins=10, labels={'x': 'Age', 'y': 'Analyses'},
+                                     title="Age Distribution of Symptom Checker Users",
+                                     color_discrete_sequence=['#1a73e8'])
+                st.plotly_chart(fig_age, use_container_width=True)
+            else:
+                st.info("No age data available")
+        
+        with col2:
+            st.markdown("### Gender Distribution")
+            if gender_dist:
+                fig_gender = px.pie(values=list(gender_dist.values()), names=list(gender_dist),
+                                  title="Gender Distribution of Symptom Checker Users")
+                st.plotly_chart(fig_gender, use_container_width=True)
+            else:
+                st.info("No gender data available")
+        
+        # Condition severity analysis
+        st.markdown("---")
+        st.markdown("### Condition Severity Analysis")
+        
+        # Analyze severity from analysis text
+        severity_keywords = {
+            'Emergency': ['emergency', 'immediate', 'urgent', 'severe', 'call 911', 'seek emergency'],
+            'Moderate': ['moderate', 'contact', 'within 24 hours', 'schedule'],
+            'Low': ['low', 'mild', 'schedule', 'monitor', 'home care']
+        }
+        
+        # First matching severity wins, as the keywords overlap
+        severity_counts = db.count_analyses_by_keywords(severity_keywords)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            severity_df = pd.DataFrame(list(severity_counts.items()), columns=['Severity', 'Count'])
+            fig_severity = px.bar(severity_df, x='Severity', y='Count', 
+                                title="Condition Severity Distribution",
+                                color='Severity',
+                                color_discrete_map={
+                                    'Emergency': '#ff6b6b',
+                                    'Moderate': '#ffa500',
+                                    'Low': '#28a745',
+                                    'Unknown': '#6c757d'
+                                })
+            st.plotly_chart(fig_severity, use_container_width=True)
+        
+        with col2:
+            fig_pie = px.pie(severity_df, values='Count', names='Severity',
+                           title="Severity Distribution (Pie Chart)")
+            st.plotly_chart(fig_pie, use_container_width=True)
+        
+        # Usage over time
+        st.markdown("---")
+        st.markdown("### Symptom Checker Usage Over Time")
+        
+        # Grouped by day in SQL
+        date_counts = st.session_state.db_manager.get_analysis_counts_by_day()
+        
+        if date_counts:
+            dates = [day for day, _ in date_counts]
+            counts = [count for _, count in date_counts]
+            usage_df = pd.DataFrame({'Date': dates, 'Usage': counts})
+            fig_usage = px.line(usage_df, x='Date', y='Usage', 
+                              title="Daily Symptom Checker Usage",
+                              markers=True)
+            st.plotly_chart(fig_usage, use_container_width=True)
+        
+    else:
+        st.info("No analytics data available yet. Symptom checker usage will appear here once users start using the feature.")
+
+@instrument_page
+def show_admin_diagnostics():
+    st.markdown("#### 🩺 Diagnostics")
+    st.write("Server-side cost of each page over its recent renders in this process, slowest in total first")
+
+    page_metrics = get_page_metrics()
+    pages = page_metrics.summary()
+    if pages:
+        st.caption("Pages include the sections drawn inside them; DB columns are per render")
+        st.table(pages)
+    else:
+        st.info("No page renders recorded yet.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("⬇️ Download render log (JSON lines)", page_metrics.recent(),
+                           file_name="page_metrics.jsonl", mime="application/json",
+                           use_container_width=True)
+    with col2:
+        if st.button("Reset page timings", use_container_width=True):
+            page_metrics.reset()
+            st.rerun()
+
+    sql_recorder = get_sql_recorder()
+    st.markdown("##### SQL by query")
+    queries = sql_recorder.snapshot()
+    if queries:
+        st.table([
+            {'query': name, **{key: value for key, value in stats.items() if key != 'buckets'}}
+            for name, stats in list(queries.items())[:20]
+        ])
+    else:
+        st.info("SQL metrics are off (SQL_METRICS=0) or no queries have run yet.")
+
+    slow_queries = sql_recorder.slow_queries()
+    if slow_queries:
+        st.markdown(f"##### Slow queries (over {sql_recorder.slow_ms:g} ms)")
+        st.table(slow_queries[::-1][:20])
+
+    full_scans = sql_recorder.full_scans()
+    if full_scans:
+        st.warning(f"{len(full_scans)} hot query plan(s) scan a whole table")
+        st.table(full_scans)
+
+    auditor = get_session_auditor()
+    st.markdown("##### Session memory")
+    memory = auditor.summary()
+    st.write(f"{memory['sessions']} session(s) hold {memory['total_kb']:,.0f} KB of state "
+             f"(budgets: {memory['session_budget_kb']:,} KB per session, {memory['total_budget_kb']:,} KB in total); "
+             f"{memory['evictions']} entries ({memory['evicted_kb']:,.0f} KB) evicted so far")
+    consumers = auditor.top_consumers()
+    if consumers:
+        st.caption("Largest session state entries, as of each session's last audit; shared entries cost nothing extra")
+        st.table(consumers)
+
+    profiler = get_profiler()
+    st.markdown("##### Profiling")
+    st.write(f"Profile the next page runs of every session; output goes to `{profiler.output_dir}`")
+    with st.form("profiler_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            runs = st.number_input("Runs to profile", min_value=1, max_value=50, value=5)
+        with col2:
+            mode = st.selectbox("Profiler", MODES,
+                                help="sample: low overhead, flamegraph and speedscope output; "
+                                     "cprofile: every call, .prof output, slower")
+        if st.form_submit_button("Start profiling"):
+            profiler.arm(runs, mode)
+            st.success(f"The next {runs} run(s) will be profiled.")
+
+    armed = profiler.armed()
+    if armed:
+        st.info(' · '.join(f"{'any session' if session_id is None else session_id[:8]}: "
+                           f"{runs_left} {mode} run(s) left" for session_id, (runs_left, mode) in armed.items()))
+        if None in armed and st.button("Stop profiling"):
+            profiler.disarm()
+            st.rerun()
+
+    captures = profiler.captures()
+    if captures:
+        st.table([{**capture, 'files': ', '.join(os.path.basename(path) for path in capture['files'])}
+                  for capture in captures[:20]])
+        latest = captures[0]['files'][-1]
+        if os.path.exists(latest):
+            with open(latest, 'rb') as f:
+                st.download_button(f"⬇️ Download {os.path.basename(latest)}", f.read(),
+                                   file_name=os.path.basename(latest))
@@ -0,0 +1,299 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from metrics import SYMPTOM_ANALYSES, SYMPTOM_ANALYSIS_SECONDS
+
+# Free Symptom Analyzer - Rule-based medical assessment
+class AdvancedSymptomAnalyzer:
+    def __init__(self):
+        self.emergency_keywords = [
+            'chest pain', 'heart attack', 'stroke', 'difficulty breathing',
+            'severe bleeding', 'unconscious', 'severe headache', 'severe abdominal pain',
+            'can\'t breathe', 'emergency', 'urgent', 'severe chest pain'
+        ]
+
+        # Symptom-condition mapping (simplified for demonstration)
+        self.symptom_conditions = {
+            'fever': ['Viral infection (60%)', 'Bacterial infection (30%)', 'COVID-19 (10%)'],
+            'headache': ['Tension headache (50%)', 'Migraine (30%)', 'Dehydration (20%)'],
+            'cough': ['Common cold (40%)', 'Bronchitis (30%)', 'Allergies (20%)', 'COVID-19 (10%)'],
+            'nausea': ['Food poisoning (40%)', 'Gastroenteritis (30%)', 'Pregnancy (20%)', 'Migraine (10%)'],
+            'fatigue': ['Anemia (30%)', 'Depression (25%)', 'Sleep disorder (20%)', 'Thyroid issues (15%)', 'COVID-19 (10%)'],
+            'chest pain': ['Heart attack (40%)', 'Angina (30%)', 'GERD (20%)', 'Muscle strain (10%)'],
+            'shortness of breath': ['Asthma (35%)', 'Pneumonia (25%)', 'Heart failure (20%)', 'Anxiety (15%)', 'COVID-19 (5%)'],
+            'abdominal pain': ['Gastroenteritis (30%)', 'Appendicitis (20%)', 'IBS (20%)', 'Food poisoning (15%)', 'Gallstones (10%)', 'Kidney stones (5%)'],
+            'dizziness': ['Dehydration (30%)', 'Anemia (25%)', 'Inner ear infection (20%)', 'Low blood pressure (15%)', 'Migraine (10%)'],
+            'sore throat': ['Strep throat (40%)', 'Viral pharyngitis (35%)', 'Tonsillitis (15%)', 'Allergies (10%)'],
+            'rash': ['Allergic reaction (40%)', 'Eczema (25%)', 'Contact dermatitis (20%)', 'Insect bites (10%)', 'Chickenpox (5%)'],
+            'joint pain': ['Arthritis (40%)', 'Injury (30%)', 'Gout (15%)', 'Lupus (10%)', 'Fibromyalgia (5%)'],
+            'back pain': ['Muscle strain (50%)', 'Herniated disc (25%)', 'Arthritis (15%)', 'Kidney stones (10%)'],
+            'diarrhea': ['Food poisoning (40%)', 'Viral gastroenteritis (35%)', 'IBS (15%)', 'Lactose intolerance (10%)'],
+            'constipation': ['Dietary issues (50%)', 'IBS (25%)', 'Medication side effects (15%)', 'Hypothyroidism (10%)'],
+            'insomnia': ['Stress (40%)', 'Anxiety (30%)', 'Depression (15%)', 'Sleep apnea (10%)', 'Caffeine (5%)'],
+            'weight loss': ['Hyperthyroidism (25%)', 'Diabetes (20%)', 'Cancer (15%)', 'Depression (15%)', 'Malnutrition (10%)', 'Stress (10%)', 'Exercise (5%)'],
+            'weight gain': ['Hypothyroidism (30%)', 'Depression (25%)', 'Medication side effects (20%)', 'Polycystic ovary syndrome (15%)', 'Cushing syndrome (10%)'],
+            'frequent urination': ['Urinary tract infection (40%)', 'Diabetes (35%)', 'Prostate issues (15%)', 'Overactive bladder (10%)'],
+            'blood in urine': ['Urinary tract infection (50%)', 'Kidney stones (25%)', 'Bladder cancer (15%)', 'Prostate issues (10%)'],
+            'blood in stool': ['Hemorrhoids (40%)', 'Anal fissure (25%)', 'Colorectal cancer (15%)', 'Diverticulosis (10%)', 'Inflammatory bowel disease (10%)'],
+            'yellow skin': ['Hepatitis (40%)', 'Gallstones (30%)', 'Liver cirrhosis (20%)', 'Pancreatic cancer (10%)'],
+            'swollen legs': ['Heart failure (35%)', 'Kidney disease (25%)', 'Liver disease (20%)', 'Deep vein thrombosis (15%)', 'Lymphedema (5%)'],
+            'night sweats': ['Infection (30%)', 'Hormonal changes (25%)', 'Cancer (20%)', 'Tuberculosis (15%)', 'HIV (10%)'],
+            'hair loss': ['Androgenetic alopecia (50%)', 'Thyroid disease (20%)', 'Iron deficiency (15%)', 'Stress (10%)', 'Autoimmune disease (5%)'],
+            'memory problems': ['Alzheimer\'s disease (30%)', 'Vitamin B12 deficiency (20%)', 'Depression (15%)', 'Thyroid disease (15%)', 'Sleep apnea (10%)', 'Stress (10%)'],
+            'tremor': ['Essential tremor (40%)', 'Parkinson\'s disease (30%)', 'Thyroid disease (15%)', 'Anxiety (10%)', 'Multiple sclerosis (5%)'],
+            'numbness': ['Peripheral neuropathy (30%)', 'Multiple sclerosis (20%)', 'Stroke (15%)', 'Vitamin B12 deficiency (15%)', 'Diabetes (10%)', 'Carpal tunnel syndrome (10%)'],
+            'vision changes': ['Refractive errors (40%)', 'Cataracts (20%)', 'Glaucoma (15%)', 'Diabetic retinopathy (10%)', 'Macular degeneration (10%)', 'Migraine (5%)'],
+            'hearing loss': ['Age-related (40%)', 'Ear wax (20%)', 'Otitis media (15%)', 'Noise exposure (10%)', 'Meniere\'s disease (10%)', 'Acoustic neuroma (5%)'],
+            'difficulty swallowing': ['GERD (30%)', 'Esophageal stricture (20%)', 'Esophageal cancer (15%)', 'Achalasia (15%)', 'Stroke (10%)', 'Myasthenia gravis (10%)'],
+            'palpitations': ['Anxiety (40%)', 'Atrial fibrillation (25%)', 'Thyroid disease (15%)', 'Anemia (10%)', 'Caffeine (10%)'],
+            'bruising easily': ['Vitamin K deficiency (30%)', 'Liver disease (25%)', 'Thrombocytopenia (20%)', 'Hemophilia (15%)', 'Steroid use (10%)'],
+            'frequent infections': ['Immunodeficiency (40%)', 'Diabetes (30%)', 'HIV (20%)', 'Cancer (10%)'],
+            'excessive thirst': ['Diabetes (60%)', 'Diuretic use (20%)', 'Dehydration (10%)', 'Diabetes insipidus (10%)'],
+            'excessive hunger': ['Diabetes (60%)', 'Hyperthyroidism (20%)', 'Pregnancy (10%)', 'Stress (10%)'],
+            'mood changes': ['Depression (40%)', 'Bipolar disorder (20%)', 'Thyroid disease (15%)', 'Premenstrual syndrome (10%)', 'Menopause (10%)', 'Vitamin deficiency (5%)'],
+            'confusion': ['Dehydration (25%)', 'Infection (20%)', 'Electrolyte imbalance (15%)', 'Dementia (15%)', 'Hypoglycemia (10%)', 'Stroke (10%)', 'Delirium (5%)'],
+            'seizures': ['Epilepsy (50%)', 'Febrile seizures (20%)', 'Brain injury (10%)', 'Infection (10%)', 'Electrolyte imbalance (10%)'],
+            'fainting': ['Vasovagal syncope (40%)', 'Dehydration (20%)', 'Anemia (15%)', 'Heart rhythm problems (10%)', 'Hypoglycemia (10%)', 'Anxiety (5%)'],
+            'edema': ['Heart failure (30%)', 'Kidney disease (25%)', 'Liver disease (20%)', 'Pregnancy (15%)', 'Lymphedema (10%)'],
+            'hiccups': ['Gastric irritation (40%)', 'Nervousness (30%)', 'Alcohol consumption (15%)', 'Brainstem lesion (10%)', 'Electrolyte imbalance (5%)'],
+            'hives': ['Allergic reaction (60%)', 'Food allergy (20%)', 'Drug reaction (15%)', 'Stress (5%)'],
+            'itchy skin': ['Dry skin (40%)', 'Allergies (30%)', 'Eczema (15%)', 'Psoriasis (10%)', 'Liver disease (5%)'],
+            'dry mouth': ['Dehydration (40%)', 'Medication side effects (30%)', 'Diabetes (15%)', 'Sjogren syndrome (10%)', 'Anxiety (5%)'],
+            'bad breath': ['Poor oral hygiene (50%)', 'Gum disease (25%)', 'Sinus infection (10%)', 'Diabetes (10%)', 'GERD (5%)'],
+            'sweating': ['Hyperhidrosis (40%)', 'Anxiety (20%)', 'Infection (15%)', 'Thyroid disease (10%)', 'Menopause (10%)', 'Obesity (5%)'],
+            'cold hands/feet': ['Poor circulation (40%)', 'Anemia (20%)', 'Raynaud phenomenon (15%)', 'Hypothyroidism (10%)', 'Anxiety (10%)', 'Diabetes (5%)'],
+            'hot flashes': ['Menopause (60%)', 'Thyroid disease (20%)', 'Anxiety (10%)', 'Infection (5%)', 'Cancer treatment (5%)'],
+            'muscle cramps': ['Dehydration (40%)', 'Electrolyte imbalance (30%)', 'Poor circulation (15%)', 'Medication (10%)', 'Thyroid disease (5%)'],
+            'restless legs': ['Iron deficiency (40%)', 'Pregnancy (20%)', 'Diabetes (15%)', 'Parkinson\'s disease (10%)', 'Kidney disease (10%)', 'Thyroid disease (5%)'],
+            'snoring': ['Sleep apnea (60%)', 'Obesity (20%)', 'Nasal congestion (10%)', 'Alcohol (5%)', 'Smoking (5%)'],
+            'grinding teeth': ['Stress (50%)', 'Anxiety (25%)', 'Sleep disorders (15%)', 'Misaligned teeth (10%)'],
+            'eye pain': ['Eye strain (30%)', 'Conjunctivitis (20%)', 'Glaucoma (15%)', 'Corneal abrasion (15%)', 'Migraine (10%)', 'Sinusitis (10%)'],
+            'ear pain': ['Otitis media (50%)', 'Ear wax (20%)', 'Sinusitis (15%)', 'Temporomandibular joint disorder (10%)', 'Tooth infection (5%)'],
+            'nosebleed': ['Dry air (40%)', 'Nose picking (20%)', 'Sinusitis (15%)', 'High blood pressure (10%)', 'Blood thinners (10%)', 'Coagulopathy (5%)'],
+            'tooth pain': ['Tooth decay (50%)', 'Gum disease (20%)', 'Cracked tooth (15%)', 'Abscess (10%)', 'Sinusitis (5%)'],
+            'gum bleeding': ['Gingivitis (60%)', 'Vitamin C deficiency (15%)', 'Blood thinners (10%)', 'Diabetes (10%)', 'Pregnancy (5%)'],
+            'jaw pain': ['Temporomandibular joint disorder (50%)', 'Tooth infection (20%)', 'Sinusitis (15%)', 'Arthritis (10%)', 'Myocardial infarction (5%)'],
+            'neck pain': ['Muscle strain (50%)', 'Poor posture (25%)', 'Arthritis (15%)', 'Herniated disc (10%)'],
+            'shoulder pain': ['Rotator cuff injury (40%)', 'Bursitis (20%)', 'Frozen shoulder (15%)', 'Arthritis (10%)', 'Heart attack (5%)', 'Gallbladder disease (5%)', 'Lung cancer (5%)'],
+            'elbow pain': ['Tennis elbow (40%)', 'Golfer\'s elbow (20%)', 'Arthritis (15%)', 'Bursitis (10%)', 'Fracture (10%)', 'Ulnar nerve entrapment (5%)'],
+            'wrist pain': ['Carpal tunnel syndrome (40%)', 'Arthritis (20%)', 'Sprain (15%)', 'Ganglion cyst (10%)', 'Fracture (10%)', 'Tendonitis (5%)'],
+            'hand pain': ['Arthritis (40%)', 'Carpal tunnel syndrome (25%)', 'Dupuytren contracture (10%)', 'Trigger finger (10%)', 'Ganglion cyst (10%)', 'Fracture (5%)'],
+            'finger pain': ['Arthritis (50%)', 'Sprain (20%)', 'Trigger finger (15%)', 'Fracture (10%)', 'Infection (5%)'],
+            'hip pain': ['Arthritis (40%)', 'Bursitis (20%)', 'Tendinitis (15%)', 'Fracture (10%)', 'Sciatica (10%)', 'Avascular necrosis (5%)'],
+            'knee pain': ['Arthritis (40%)', 'Meniscus tear (20%)', 'Ligament sprain (15%)', 'Patellar tendinitis (10%)', 'Iliotibial band syndrome (10%)', 'Gout (5%)'],
+            'ankle pain': ['Sprain (50%)', 'Arthritis (20%)', 'Achilles tendinitis (15%)', 'Fracture (10%)', 'Gout (5%)'],
+            'foot pain': ['Plantar fasciitis (30%)', 'Arthritis (20%)', 'Bunions (15%)', 'Heel spurs (10%)', 'Neuroma (10%)', 'Stress fracture (10%)', 'Gout (5%)'],
+            'toe pain': ['Ingrown toenail (40%)', 'Arthritis (20%)', 'Gout (15%)', 'Hammer toe (10%)', 'Fracture (10%)', 'Corn/callous (5%)'],
+            'menstrual pain': ['Primary dysmenorrhea (60%)', 'Endometriosis (20%)', 'Fibroids (10%)', 'Pelvic inflammatory disease (10%)'],
+            'menstrual irregularities': ['Polycystic ovary syndrome (30%)', 'Thyroid disease (20%)', 'Stress (15%)', 'Weight changes (10%)', 'Perimenopause (10%)', 'Pregnancy (5%)', 'Eating disorders (5%)', 'Diabetes (5%)'],
+            'vaginal discharge': ['Bacterial vaginosis (40%)', 'Yeast infection (30%)', 'Trichomoniasis (15%)', 'Gonorrhea (10%)', 'Chlamydia (5%)'],
+            'vaginal itching': ['Yeast infection (50%)', 'Bacterial vaginosis (20%)', 'Trichomoniasis (15%)', 'Allergic reaction (10%)', 'Lichen sclerosus (5%)'],
+            'erectile dysfunction': ['Cardiovascular disease (30%)', 'Diabetes (20%)', 'Depression (15%)', 'Hormonal imbalance (10%)', 'Prostate issues (10%)', 'Medication side effects (10%)', 'Stress (5%)'],
+            'premature ejaculation': ['Performance anxiety (40%)', 'Hyperthyroidism (20%)', 'Prostate issues (15%)', 'Diabetes (10%)', 'Multiple sclerosis (10%)', 'Thyroid disease (5%)'],
+            'low libido': ['Stress (30%)', 'Depression (25%)', 'Hormonal imbalance (20%)', 'Medication side effects (15%)', 'Thyroid disease (10%)'],
+            'breast pain': ['Hormonal changes (50%)', 'Fibrocystic breasts (25%)', 'Mastitis (15%)', 'Breast cancer (5%)', 'Costochondritis (5%)'],
+            'breast lump': ['Fibroadenoma (40%)', 'Cyst (30%)', 'Breast cancer (20%)', 'Fibrocystic changes (10%)'],
+            'nipple discharge': ['Intraductal papilloma (30%)', 'Duct ectasia (25%)', 'Breast cancer (20%)', 'Hormonal changes (15%)', 'Medication (10%)'],
+            'testicle pain': ['Epididymitis (40%)', 'Orchitis (20%)', 'Testicular torsion (15%)', 'Hernia (10%)', 'Hydrocele (10%)', 'Varicocele (5%)'],
+            'prostate symptoms': ['Benign prostatic hyperplasia (60%)', 'Prostatitis (20%)', 'Prostate cancer (15%)', 'Urinary tract infection (5%)'],
+            'infertility': ['Ovulatory disorders (30%)', 'Tubal factors (25%)', 'Male factor (25%)', 'Endometriosis (10%)', 'Uterine factors (10%)'],
+            'pregnancy symptoms': ['Morning sickness (80%)', 'Fatigue (70%)', 'Breast tenderness (60%)', 'Frequent urination (50%)', 'Food cravings (40%)', 'Back pain (30%)', 'Headache (20%)', 'Dizziness (15%)', 'Constipation (15%)', 'Heartburn (15%)', 'Swelling (10%)', 'Insomnia (10%)', 'Mood changes (10%)'],
+            'postpartum symptoms': ['Baby blues (50%)', 'Postpartum depression (20%)', 'Fatigue (80%)', 'Pain (60%)', 'Bleeding (50%)', 'Breast engorgement (40%)', 'Constipation (30%)', 'Hemorrhoids (20%)', 'Urinary incontinence (15%)', 'Hair loss (10%)', 'Joint pain (5%)'],
+            'menopause symptoms': ['Hot flashes (80%)', 'Night sweats (60%)', 'Mood changes (50%)', 'Sleep disturbances (45%)', 'Vaginal dryness (40%)', 'Fatigue (35%)', 'Joint pain (30%)', 'Headache (25%)', 'Heart palpitations (20%)', 'Weight gain (20%)', 'Hair thinning (15%)', 'Memory problems (10%)', 'Urinary incontinence (10%)'],
+            'andropause symptoms': ['Fatigue (60%)', 'Erectile dysfunction (50%)', 'Mood changes (40%)', 'Sleep disturbances (35%)', 'Weight gain (30%)', 'Muscle loss (25%)', 'Hair loss (20%)', 'Memory problems (15%)', 'Joint pain (10%)', 'Hot flashes (5%)'],
+            'child symptoms': ['Fever (50%)', 'Cough (40%)', 'Vomiting (30%)', 'Diarrhea (25%)', 'Ear infection (20%)', 'Sore throat (15%)', 'Rash (10%)', 'Abdominal pain (10%)', 'Headache (5%)', 'Joint pain (5%)'],
+            'elderly symptoms': ['Falls (30%)', 'Confusion (25%)', 'Fatigue (20%)', 'Pain (15%)', 'Incontinence (10%)', 'Depression (10%)', 'Sleep disturbances (10%)', 'Weight loss (10%)', 'Dizziness (5%)', 'Vision changes (5%)', 'Hearing loss (5%)', 'Memory problems (5%)']
+        }
+
+        # Home care advice per symptom: (phrases, any of which triggers it, advice)
+        self.home_care_advice = [
+            (('fever',), ["💧 Stay hydrated with water or electrolyte drinks", "🛏️ Rest and get adequate sleep", "💊 Take acetaminophen (Tylenol) or ibuprofen if needed"]),
+            (('cough',), ["💧 Drink warm fluids like tea or broth", "🧴 Use honey (for adults) or cough syrup as directed", "💨 Use a humidifier to moisten air"]),
+            (('headache',), ["🛏️ Rest in a dark, quiet room", "❄️ Apply cold or warm compress", "💧 Stay hydrated"]),
+            (('nausea',), ["🍪 Eat small, frequent meals", "🥤 Sip ginger tea or clear fluids", "🛏️ Rest with head elevated"]),
+            (('fatigue',), ["😴 Get adequate sleep (7-9 hours)", "🏃‍♂️ Light exercise if possible", "🥗 Eat balanced meals"]),
+            (('sore throat',), ["💧 Gargle with warm salt water", "🍯 Honey and lemon tea", "🧊 Suck on throat lozenges"]),
+            (('congestion', 'runny nose'), ["💧 Stay hydrated", "🧴 Use saline nasal spray", "💨 Use a humidifier"]),
+            (('rash',), ["🧴 Keep area clean and dry", "❄️ Apply cool compress", "👕 Wear loose, breathable clothing"]),
+            (('joint pain', 'muscle pain'), ["❄️ Apply ice for acute pain, heat for chronic", "🛏️ Rest affected area", "💊 Over-the-counter pain relievers if appropriate"]),
+            (('back pain',), ["🧘‍♀️ Maintain good posture", "❄️ Ice/heat therapy", "🏃‍♂️ Gentle stretching if not contraindicated"]),
+            (('abdominal pain',), ["🥗 Eat bland foods", "💧 Sip clear fluids", "🛏️ Rest"]),
+            (('diarrhea',), ["💧 Oral rehydration solutions", "🥑 BRAT diet (bananas, rice, applesauce, toast)", "💊 Avoid antidiarrheal meds unless directed"]),
+            (('constipation',), ["💧 Increase fiber and water intake", "🏃‍♂️ Regular exercise", "🥝 Prunes or prune juice"]),
+            (('insomnia',), ["😴 Maintain consistent sleep schedule", "📱 Limit screen time before bed", "🛏️ Create comfortable sleep environment"]),
+            (('anxiety', 'stress'), ["🧘‍♀️ Deep breathing exercises", "🏃‍♂️ Regular exercise", "📖 Stress management techniques"]),
+        ]
+
+    # The analysis runs in three phases, timed separately by bench_analyzer.py:
+    # matching (match_symptoms scans the text), ranking (rank_conditions and
+    # triage pick the conditions and urgency) and rendering (render_report).
+
+    def match_symptoms(self, symptoms_lower):
+        """(emergency phrase found, matched symptom_conditions keys, home care advice) for lowercased text"""
+        emergency_found = any(keyword in symptoms_lower for keyword in self.emergency_keywords)
+        matched_symptoms = [symptom_key for symptom_key in self.symptom_conditions if symptom_key in symptoms_lower]
+        home_care = []
+        for phrases, advice in self.home_care_advice:
+            if any(phrase in symptoms_lower for phrase in phrases):
+                home_care.extend(advice)
+        return emergency_found, matched_symptoms, home_care
+
+    def rank_conditions(self, matched_symptoms):
+        """Top three conditions of each matched symptom, or general advice when nothing matched"""
+        potential_conditions = []
+        for symptom_key in matched_symptoms:
+            potential_conditions.extend(self.symptom_conditions[symptom_key][:3])  # Take top 3 conditions
+
+        # If no specific matches, provide general advice
+        if not potential_conditions:
+            potential_conditions = ["Common cold or viral infection (40%)", "Allergic reaction (20%)", "Stress or fatigue (20%)", "Gastrointestinal upset (10%)", "Musculoskeletal strain (10%)"]
+        return potential_conditions
+
+    def triage(self, emergency_found, duration, severity, age, medical_history=""):
+        """(urgency level, red flags, recommendations)"""
+        red_flags = []
+        recommendations = []
+
+        if emergency_found or severity == "Severe":
+            urgency_level = "Emergency"
+            red_flags.append("⚠️ IMMEDIATE MEDICAL ATTENTION REQUIRED")
+            recommendations.append("🚨 SEEK EMERGENCY CARE IMMEDIATELY - Call emergency services (911) or go to nearest emergency room")
+        elif severity == "Moderate":
+            urgency_level = "Medium"
+            recommendations.append("📞 Contact your healthcare provider within 24 hours")
+        else:
+            urgency_level = "Low"
+            recommendations.append("📅 Schedule an appointment with your healthcare provider if symptoms persist or worsen")
+
+        # Age-based considerations
+        if age < 12:
+            recommendations.append("👶 For children under 12, consult a pediatrician")
+        elif age > 65:
+            recommendations.append("👴 For seniors over 65, consult healthcare provider promptly due to increased risk factors")
+
+        # Duration-based considerations
+        if "More than 2 weeks" in duration:
+            urgency_level = "Medium" if urgency_level == "Low" else urgency_level
+            recommendations.append("📋 Persistent symptoms require professional evaluation")
+
+        # Medical history considerations
+        if medical_history and medical_history.lower() != "none provided":
+            recommendations.append("📋 Consider your medical history when evaluating symptoms")
+
+        return urgency_level, red_flags, recommendations
+
+    def render_report(self, potential_conditions, urgency_level, recommendations, red_flags, home_care):
+        analysis = f"""
+**POTENTIAL CONDITIONS:**
+{chr(10).join(f"• {condition}" for condition in potential_conditions[:5])}
+
+**URGENCY LEVEL: {urgency_level}**
+
+**RECOMMENDATIONS:**
+{chr(10).join(f"• {rec}" for rec in recommendations)}
+
+**RED FLAGS:**
+{chr(10).join(f"• {flag}" for flag in red_flags) if red_flags else "• No immediate red flags identified from provided information"}
+
+**HOME CARE:**
+{chr(10).join(f"• {care}" for care in home_care[:5]) if home_care else "• Rest and monitor symptoms"}
+
+**WHEN TO SEEK HELP:**
+• If symptoms worsen or don't improve within 48-72 hours
+• If you develop new symptoms
+• If you have concerns about your condition
+• For preventive care and proper diagnosis
+• If you have underlying medical conditions
+"""
+        return analysis.strip()
+
+    def analyze_with_chatgpt(self, symptoms, duration, severity, age, medical_history=""):
+        """Free rule-based symptom analysis"""
+        start = time.perf_counter()
+        try:
+            emergency_found, matched_symptoms, home_care = self.match_symptoms(symptoms.lower())
+            potential_conditions = self.rank_conditions(matched_symptoms)
+            urgency_level, red_flags, recommendations = self.triage(
+                emergency_found, duration, severity, age, medical_history)
+            analysis = self.render_report(potential_conditions, urgency_level, recommendations, red_flags, home_care)
+
+            SYMPTOM_ANALYSIS_SECONDS.observe(time.perf_counter() - start)
+            SYMPTOM_ANALYSES.inc(urgency=urgency_level)
+            return {
+                "analysis": analysis,
+                "timestamp": datetime.now().isoformat(),
+                "ai_model": "Rule-based Analysis",
+                "confidence": "Medium",
+                "error": None
+            }
+
+        except Exception as e:
+            SYMPTOM_ANALYSES.inc(urgency='error')
+            return {
+                "analysis": f"⚠️ Analysis service temporarily unavailable. Please try again later.\nError: {str(e)}",
+                "timestamp": datetime.now().isoformat(),
+                "error": str(e)
+            }
+
+# Patient Records and Analytics System
+class HealthcareAnalytics:
+    def __init__(self):
+        self.patients = []
+        self.consultations = []
+        self.symptom_analyses = []
+    
+    def add_patient(self, patient_data):
+        patient_data['id'] = f"P{len(self.patients) + 1000}"
+        patient_data['registration_date'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        patient_data['last_active'] = datetime.now().strftime("%Y-%m-%d")
+        self.patients.append(patient_data)
+        return patient_data['id']
+    
+    def add_consultation(self, patient_id, consultation_type, details):
+        consultation = {
+            'id': f"C{len(self.consultations) + 2000}",
+            'patient_id': patient_id,
+            'type': consultation_type,
+            'details': details,
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'status': 'Completed'
+        }
+        self.consultations.append(consultation)
+    
+    def add_symptom_analysis(self, patient_id, symptoms, analysis_result):
+        analysis_record = {
+            'id': f"SA{len(self.symptom_analyses) + 3000}",
+            'patient_id': patient_id,
+            'symptoms': symptoms,
+            'analysis': analysis_result,
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        self.symptom_analyses.append(analysis_record)
+    
+    def get_patient_stats(self):
+        total_patients = len(self.patients)
+        active_today = len([p for p in self.patients if p['last_active'] == datetime.now().strftime('%Y-%m-%d')])
+        total_consultations = len(self.consultations)
+        total_analyses = len(self.symptom_analyses)
+        
+        return {
+            'total_patients': total_patients,
+            'active_today': active_today,
+            'total_consultations': total_consultations,
+            'total_analyses': total_analyses
+        }
+    
+    def get_consultation_trends(self):
+        import pandas as pd
+
+        # Generate sample trend data
+        dates = [(datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(6, -1, -1)]
+        trends = []
+        for date in dates:
+            trends.append({
+                'date': date,
+                'consultations': random.randint(5, 20),
+                'ai_analyses': random.randint(10, 25)
+            })
+        return pd.DataFrame(trends)
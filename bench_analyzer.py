@@ -0,0 +1,252 @@
+import argparse
+import json
+import random
+import sys
+import time
+
+from analyzer import AdvancedSymptomAnalyzer
+from metrics import percentile
+
+# Options offered by the symptom checker form
+DURATIONS = ["Less than 24 hours", "1-3 days", "4-7 days", "1-2 weeks", "More than 2 weeks"]
+SEVERITIES = ["Mild", "Moderate", "Severe"]
+HISTORIES = ["", "", "None provided", "Asthma", "Type 2 diabetes", "Hypertension, on amlodipine", "Had COVID-19 last year"]
+
+# Number of symptoms mentioned in one complaint, 0 to 6
+SYMPTOM_COUNT_WEIGHTS = [5, 30, 30, 20, 10, 4, 1]
+
+OPENERS = [
+    "I've had {symptoms} for {days} days.",
+    "Since {weekday} I have {symptoms}.",
+    "{symptoms} since yesterday.",
+    "My {relative} has {symptoms} and I'm worried.",
+    "Started with {symptoms} about {days} days ago.",
+    "{symptoms}",
+    "Hi, for the past week I keep getting {symptoms}, it comes and goes.",
+]
+FILLERS = [
+    "It is worse in the morning.",
+    "I took paracetamol but it didn't help much.",
+    "Temperature around 38°C last night.",
+    "I haven't traveled recently.",
+    "I work night shifts at a call center.",
+    "No known allergies.",
+    "My children were sick last week too.",
+    "I have been drinking a lot of water.",
+    "It gets better when I lie down.",
+    "I'm not taking any maintenance medication.",
+    "I had the same thing last year and it went away on its own.",
+    "Should I go to the clinic or wait a few days?",
+]
+EMERGENCY_SENTENCES = [
+    "and now {phrase}",
+    "This morning there was {phrase}.",
+    "Please help, {phrase}!",
+]
+RELATIVES = ['son', 'daughter', 'mother', 'father', 'husband', 'wife', 'lola', 'lolo']
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Word parts of the synthetic symptoms added when growing the vocabulary
+ADJECTIVES = ['sharp', 'dull', 'burning', 'throbbing', 'stabbing', 'aching', 'tingling', 'swollen',
+              'stiff', 'itchy', 'sore', 'tender', 'cramping', 'numb', 'shooting', 'pulsing',
+              'recurring', 'sudden', 'chronic', 'mild']
+BODY_PARTS = ['elbow', 'wrist', 'ankle', 'heel', 'calf', 'thigh', 'groin', 'ribs', 'collarbone',
+              'temple', 'forehead', 'eyelid', 'cheek', 'tongue', 'lip', 'scalp', 'armpit', 'navel',
+              'spine', 'tailbone', 'shin', 'knuckle', 'thumb', 'pinky', 'sinus', 'tonsil', 'chin',
+              'bladder', 'kidney', 'pelvis']
+NOUNS = ['pain', 'ache', 'pressure', 'spasm', 'swelling', 'weakness', 'discomfort', 'irritation']
+
+KEYBOARD_NEIGHBORS = {
+    'a': 'qs', 'b': 'vn', 'c': 'xv', 'd': 'sf', 'e': 'wr', 'f': 'dg', 'g': 'fh', 'h': 'gj', 'i': 'uo',
+    'j': 'hk', 'k': 'jl', 'l': 'k', 'm': 'n', 'n': 'bm', 'o': 'ip', 'p': 'o', 'q': 'w', 'r': 'et',
+    's': 'ad', 't': 'ry', 'u': 'yi', 'v': 'cb', 'w': 'qe', 'x': 'zc', 'y': 'tu', 'z': 'x'
+}
+
+def misspell(word, rng):
+    """One typing mistake: a swapped, dropped, doubled or neighboring letter"""
+    letters = [i for i, char in enumerate(word) if char.isalpha()]
+    if len(letters) < 3:
+        return word
+    i = rng.choice(letters[1:-1])
+    kind = rng.randrange(4)
+    if kind == 0:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if kind == 1:
+        return word[:i] + word[i + 1:]
+    if kind == 2:
+        return word[:i] + word[i] + word[i:]
+    return word[:i] + rng.choice(KEYBOARD_NEIGHBORS.get(word[i], word[i])) + word[i + 1:]
+
+def grow_vocabulary(analyzer, size, seed):
+    """Add synthetic symptoms to analyzer.symptom_conditions until it has `size` entries"""
+    rng = random.Random(seed)
+    conditions = sorted({condition for entries in analyzer.symptom_conditions.values() for condition in entries})
+    candidates = [f"{adjective} {part} {noun}" for adjective in ADJECTIVES for part in BODY_PARTS for noun in NOUNS]
+    rng.shuffle(candidates)
+    if size > len(analyzer.symptom_conditions) + len(candidates):
+        raise ValueError(f"Vocabulary can grow to at most {len(analyzer.symptom_conditions) + len(candidates)} symptoms")
+    for key in candidates[:max(0, size - len(analyzer.symptom_conditions))]:
+        analyzer.symptom_conditions[key] = rng.sample(conditions, rng.randint(3, 6))
+    return analyzer
+
+def generate_complaints(vocabulary, emergency_phrases, count, seed, typo_rate=0.05, emergency_rate=0.05):
+    """Deterministic symptom checker submissions: dicts of analyze_with_chatgpt's arguments.
+
+    Symptoms are drawn from `vocabulary`; each mention is misspelled with
+    probability typo_rate and an emergency phrase is added to a complaint
+    with probability emergency_rate. Length varies with the number of
+    filler sentences, with the occasional long pasted history.
+    """
+    rng = random.Random(seed)
+    vocabulary = list(vocabulary)
+    complaints = []
+    for _ in range(count):
+        symptom_count = rng.choices(range(len(SYMPTOM_COUNT_WEIGHTS)), SYMPTOM_COUNT_WEIGHTS)[0]
+        mentions = []
+        for symptom in rng.sample(vocabulary, symptom_count):
+            if rng.random() < typo_rate:
+                symptom = ' '.join(misspell(word, rng) for word in symptom.split())
+            mentions.append(symptom)
+        if len(mentions) > 1:
+            listed = ', '.join(mentions[:-1]) + ' and ' + mentions[-1]
+        else:
+            listed = mentions[0] if mentions else 'not feeling well'
+
+        opener = rng.choice(OPENERS).format(
+            symptoms=listed, days=rng.randint(1, 14), weekday=rng.choice(WEEKDAYS), relative=rng.choice(RELATIVES))
+        filler_count = rng.randint(10, 25) if rng.random() < 0.05 else rng.randint(0, 4)
+        sentences = [rng.choice(FILLERS) for _ in range(filler_count)]
+        if rng.random() < emergency_rate:
+            sentences.append(rng.choice(EMERGENCY_SENTENCES).format(phrase=rng.choice(emergency_phrases)))
+        rng.shuffle(sentences)
+
+        text = ' '.join([opener] + sentences)
+        casing = rng.random()
+        if casing < 0.05:
+            text = text.upper()
+        elif casing < 0.15:
+            text = text.lower()
+
+        complaints.append({
+            'symptoms': text,
+            'duration': rng.choice(DURATIONS),
+            'severity': rng.choices(SEVERITIES, [6, 3, 1])[0],
+            'age': rng.randint(1, 95),
+            'medical_history': rng.choice(HISTORIES)
+        })
+    return complaints
+
+def time_phases(analyzer, complaints):
+    """Per-complaint nanoseconds of each phase, run the way analyze_with_chatgpt runs them"""
+    clock = time.perf_counter_ns
+    matching, ranking, rendering = [], [], []
+    matched = emergencies = 0
+    for complaint in complaints:
+        start = clock()
+        emergency_found, matched_symptoms, home_care = analyzer.match_symptoms(complaint['symptoms'].lower())
+        matched_at = clock()
+        potential_conditions = analyzer.rank_conditions(matched_symptoms)
+        urgency_level, red_flags, recommendations = analyzer.triage(
+            emergency_found, complaint['duration'], complaint['severity'], complaint['age'], complaint['medical_history'])
+        ranked_at = clock()
+        analyzer.render_report(potential_conditions, urgency_level, recommendations, red_flags, home_care)
+        rendered_at = clock()
+
+        matching.append(matched_at - start)
+        ranking.append(ranked_at - matched_at)
+        rendering.append(rendered_at - ranked_at)
+        matched += len(matched_symptoms)
+        emergencies += emergency_found
+    return {'matching': matching, 'ranking': ranking, 'rendering': rendering}, matched, emergencies
+
+def bench_vocabulary(size, args):
+    """Throughput and phase timings with `size` symptoms in the analyzer's vocabulary"""
+    analyzer = grow_vocabulary(AdvancedSymptomAnalyzer(), size, args.seed)
+    complaints = generate_complaints(analyzer.symptom_conditions, analyzer.emergency_keywords, args.count,
+                                     args.seed, args.typo_rate, args.emergency_rate)
+
+    # Whole analyses without per-phase clocks; the best repeat is the least disturbed one
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for complaint in complaints:
+            analyzer.analyze_with_chatgpt(**complaint)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    phases, matched, emergencies = time_phases(analyzer, complaints)
+    totals = sorted(sum(times) for times in zip(*phases.values()))
+    phase_ns = {name: sum(times) for name, times in phases.items()}
+    all_ns = sum(phase_ns.values())
+
+    return {
+        'vocabulary': len(analyzer.symptom_conditions),
+        'analyses_per_second': round(len(complaints) / best, 1),
+        'latency_us': {
+            'p50': round(percentile(totals, 0.50) / 1000, 1),
+            'p95': round(percentile(totals, 0.95) / 1000, 1),
+            'p99': round(percentile(totals, 0.99) / 1000, 1)
+        },
+        'phases': {
+            name: {
+                'mean_us': round(ns / len(complaints) / 1000, 2),
+                'share': round(ns / all_ns, 3)
+            }
+            for name, ns in phase_ns.items()
+        },
+        # Cost of one vocabulary entry in the substring scan
+        'matching_ns_per_symptom': round(phase_ns['matching'] / len(complaints) / len(analyzer.symptom_conditions), 1),
+        'corpus': {
+            'complaints': len(complaints),
+            'mean_chars': round(sum(len(c['symptoms']) for c in complaints) / len(complaints), 1),
+            'matched_symptoms_per_complaint': round(matched / len(complaints), 2),
+            'emergency_share': round(emergencies / len(complaints), 3)
+        }
+    }
+
+def main():
+    base_size = len(AdvancedSymptomAnalyzer().symptom_conditions)
+    parser = argparse.ArgumentParser(
+        description='Benchmark AdvancedSymptomAnalyzer on a synthetic corpus of symptom checker complaints.')
+    parser.add_argument('--count', type=int, default=2000, help='Complaints in the corpus')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for the corpus and the synthetic vocabulary')
+    parser.add_argument('--repeat', type=int, default=3, help='Throughput runs per vocabulary size; the best is kept')
+    parser.add_argument('--vocab-sizes', type=int, nargs='+', default=[base_size, 250, 500, 1000, 2000],
+                        help=f'Vocabulary sizes for the scaling curve (default: {base_size} 250 500 1000 2000)')
+    parser.add_argument('--typo-rate', type=float, default=0.05, help='Share of symptom mentions misspelled')
+    parser.add_argument('--emergency-rate', type=float, default=0.05, help='Share of complaints with an emergency phrase')
+    parser.add_argument('--show-corpus', type=int, metavar='N', help='Print N generated complaints and exit')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    if args.show_corpus:
+        analyzer = AdvancedSymptomAnalyzer()
+        for complaint in generate_complaints(analyzer.symptom_conditions, analyzer.emergency_keywords, args.show_corpus,
+                                             args.seed, args.typo_rate, args.emergency_rate):
+            print(json.dumps(complaint, ensure_ascii=False))
+        return
+
+    results = []
+    for size in args.vocab_sizes:
+        print(f"  vocabulary {size}", file=sys.stderr)
+        results.append(bench_vocabulary(size, args))
+
+    report = {
+        'count': args.count,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'typo_rate': args.typo_rate,
+        'emergency_rate': args.emergency_rate,
+        'python_version': sys.version.split()[0],
+        'vocabularies': results
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
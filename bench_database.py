@@ -0,0 +1,475 @@
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+from credentials import PasswordHasher, load_params
+from database import DatabaseManager
+from metrics import percentile
+
+SCALES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+
+# Shared password of every synthetic account
+BENCH_PASSWORD = 'bench-password'
+# Distinct stored hashes cycled over the synthetic accounts; hashing every row would dominate generation
+PASSWORD_POOL = 32
+
+FIRST_NAMES = ['Maria', 'Jose', 'Ana', 'Juan', 'Grace', 'Mark', 'Joy', 'Paolo', 'Liza', 'Carlo',
+               'Bea', 'Miguel', 'Ella', 'Rafael', 'Nina', 'Luis', 'Clara', 'Diego', 'Rosa', 'Tomas']
+LAST_NAMES = ['Santos', 'Reyes', 'Cruz', 'Bautista', 'Garcia', 'Mendoza', 'Torres', 'Flores',
+              'Ramos', 'Navarro', 'Aquino', 'Villanueva', 'Castillo', 'Domingo', 'Lim', 'Tan']
+LOCATIONS = ['Manila', 'Cebu', 'Davao', 'Quezon City', 'Makati', 'Baguio', 'Iloilo', 'Pasig']
+SPECIALTIES = ['General Medicine', 'Cardiology', 'Pediatrics', 'Dermatology', 'Neurology',
+               'Orthopedics', 'Psychiatry', 'Ophthalmology', 'Internal Medicine', 'Endocrinology']
+SYMPTOMS = ['fever', 'cough', 'headache', 'sore throat', 'fatigue', 'nausea', 'dizziness',
+            'chest pain', 'back pain', 'rash', 'shortness of breath', 'stomach ache', 'runny nose']
+STATUSES = ['scheduled'] * 5 + ['completed'] * 4 + ['cancelled']
+ANALYSIS_SENTENCES = [
+    'Symptoms are consistent with a mild viral infection.',
+    'Rest, fluids and over-the-counter fever medication are recommended.',
+    'Monitor temperature twice daily and seek care if it exceeds 39°C.',
+    'Consider a consultation if symptoms persist for more than three days.',
+    'No emergency warning signs were reported.',
+    'Avoid strenuous activity until symptoms improve.',
+    'A follow-up with a general practitioner is advised.',
+]
+
+def table_sizes(scale):
+    """Row counts per table for a scale, where scale is the size of the two largest tables"""
+    return {
+        'patients': max(100, scale // 10),
+        'doctors': max(20, scale // 1000),
+        'appointments': scale,
+        'symptom_analyses': scale
+    }
+
+def _chunks(rows, size=50_000):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def generate(db_path, scale, seed=42, hasher=None, log=print):
+    """Fill a fresh database with deterministic synthetic data; returns the row counts.
+
+    The same scale and seed always produce the same rows; timestamps are
+    spread over the year before the generation date.
+    """
+    rng = random.Random(seed)
+    sizes = table_sizes(scale)
+    hasher = hasher or PasswordHasher(**load_params())
+    db = DatabaseManager(db_path, password_hasher=hasher, write_behind=False)
+
+    now = int(time.time())
+    today = datetime.now().date()
+    password_hashes = [hasher.hash(BENCH_PASSWORD) for _ in range(PASSWORD_POOL)]
+
+    conn = db.get_connection()
+    conn.execute('PRAGMA synchronous=OFF')
+    cursor = conn.cursor()
+    cursor.execute('CREATE TABLE IF NOT EXISTS bench_meta (key TEXT PRIMARY KEY, value TEXT)')
+
+    def insert(label, sql, rows):
+        start = time.perf_counter()
+        count = 0
+        for chunk in _chunks(rows):
+            cursor.executemany(sql, chunk)
+            conn.commit()
+            count += len(chunk)
+        log(f"  {label}: {count} rows in {time.perf_counter() - start:.1f}s")
+
+    def patient_rows():
+        for i in range(sizes['patients']):
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            login = now - rng.randrange(0, 90 * 86400) if rng.random() < 0.8 else None
+            yield (
+                name, rng.randint(1, 95), rng.choice(['Male', 'Female']), f"patient{i}@bench.mediconnect",
+                f"+63 9{rng.randrange(10 ** 9):09d}", rng.choice(LOCATIONS), '',
+                ', '.join(rng.sample(SYMPTOMS, 2)) if rng.random() < 0.3 else '',
+                password_hashes[i % PASSWORD_POOL], 'patient',
+                datetime.fromtimestamp(login).strftime('%Y-%m-%d %H:%M:%S') if login else None, login
+            )
+
+    insert('patients', '''
+        INSERT INTO users (full_name, age, gender, email, phone, location, emergency_contact, medical_history,
+                           password, role, last_login, last_login_epoch)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', patient_rows())
+
+    def doctor_user_rows():
+        for i in range(sizes['doctors']):
+            yield (
+                f"Dr. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}", rng.randint(30, 65),
+                rng.choice(['Male', 'Female']), f"doctor{i}@bench.mediconnect", '', rng.choice(LOCATIONS),
+                '', '', password_hashes[i % PASSWORD_POOL], 'doctor'
+            )
+
+    insert('doctor users', '''
+        INSERT INTO users (full_name, age, gender, email, phone, location, emergency_contact, medical_history,
+                           password, role)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', doctor_user_rows())
+
+    insert('doctors', '''
+        INSERT INTO doctors (name, specialty, rating, status, experience, location, languages,
+                             consultation_fee, available, user_id)
+        SELECT full_name, ?, 4.5, 'available', '10 years', location, 'English', 500, 1, id
+        FROM users WHERE email = ?
+    ''', ((rng.choice(SPECIALTIES), f"doctor{i}@bench.mediconnect") for i in range(sizes['doctors'])))
+
+    cursor.execute("SELECT MIN(id), MAX(id) FROM users WHERE email LIKE 'patient%@bench.mediconnect'")
+    first_patient, last_patient = cursor.fetchone()
+    cursor.execute("SELECT id FROM doctors WHERE user_id IN (SELECT id FROM users WHERE email LIKE 'doctor%@bench.mediconnect')")
+    doctor_ids = [row[0] for row in cursor.fetchall()]
+
+    def appointment_rows():
+        # Appointment i takes the next free half-hour slot of doctor i % doctors, 16 slots a day,
+        # starting 30 days ago, so (doctor, date, time) never repeats
+        start_date = today - timedelta(days=30)
+        for i in range(sizes['appointments']):
+            slot = i // len(doctor_ids)
+            day, index = divmod(slot, 16)
+            minutes = 9 * 60 + index * 30
+            yield (
+                rng.randint(first_patient, last_patient), doctor_ids[i % len(doctor_ids)],
+                (start_date + timedelta(days=day)).isoformat(), f"{minutes // 60:02d}:{minutes % 60:02d}",
+                rng.choice(STATUSES), f"Consultation about {rng.choice(SYMPTOMS)}", ''
+            )
+
+    insert('appointments', '''
+        INSERT INTO appointments (patient_id, doctor_id, appointment_date, appointment_time, status, reason, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', appointment_rows())
+
+    def analysis_rows():
+        for _ in range(sizes['symptom_analyses']):
+            epoch = now - rng.randrange(0, 365 * 86400)
+            yield (
+                rng.randint(first_patient, last_patient), ', '.join(rng.sample(SYMPTOMS, rng.randint(1, 4))),
+                ' '.join(rng.sample(ANALYSIS_SENTENCES, rng.randint(3, 6))),
+                datetime.fromtimestamp(epoch).strftime('%Y-%m-%d %H:%M:%S'), epoch
+            )
+
+    insert('symptom analyses', '''
+        INSERT INTO symptom_analyses (patient_id, symptoms, analysis, timestamp, timestamp_epoch)
+        VALUES (?, ?, ?, ?, ?)
+    ''', analysis_rows())
+
+    cursor.executemany('INSERT OR REPLACE INTO bench_meta (key, value) VALUES (?, ?)',
+                       [('scale', str(scale)), ('seed', str(seed)), ('generated_at', datetime.now().isoformat())])
+    conn.commit()
+    cursor.execute('ANALYZE')
+    conn.close()
+    return sizes
+
+def read_meta(db_path):
+    if not os.path.exists(db_path):
+        return {}
+    conn = sqlite3.connect(db_path)
+    try:
+        return dict(conn.execute('SELECT key, value FROM bench_meta').fetchall())
+    except sqlite3.Error:
+        return {}
+    finally:
+        conn.close()
+
+def remove_database(db_path):
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+def copy_database(source_path, copy_path):
+    """A consistent copy of source_path (WAL included) at copy_path, replacing any earlier copy"""
+    remove_database(copy_path)
+    source, copy = sqlite3.connect(source_path), sqlite3.connect(copy_path)
+    try:
+        source.backup(copy)
+    finally:
+        source.close()
+        copy.close()
+
+def _row_count(result):
+    if isinstance(result, (list, tuple, dict)):
+        return len(result)
+    return 1
+
+class Workload:
+    """Calls to time against a generated database; every call picks its arguments from the seeded RNG"""
+
+    def __init__(self, db, seed):
+        self.db = db
+        self.rng = random.Random(seed + 1)
+
+        conn = db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, email FROM users WHERE role = 'patient'")
+        self.patients = cursor.fetchall()
+        cursor.execute('SELECT id, user_id, name FROM doctors WHERE user_id IS NOT NULL')
+        self.doctors = cursor.fetchall()
+        cursor.execute('SELECT MIN(id), MAX(id) FROM symptom_analyses')
+        self.analysis_range = cursor.fetchone()
+        cursor.execute('SELECT MIN(id), MAX(id) FROM appointments')
+        self.appointment_range = cursor.fetchone()
+        conn.close()
+
+        self.counter = 0
+        self.created_users = []
+        self.held_slots = []
+
+    def patient(self):
+        return self.rng.choice(self.patients)
+
+    def doctor(self):
+        return self.rng.choice(self.doctors)
+
+    def analysis_id(self):
+        return self.rng.randint(*self.analysis_range)
+
+    def appointment_id(self):
+        return self.rng.randint(*self.appointment_range)
+
+    def day(self, offset_range=(-30, 30)):
+        return (datetime.now().date() + timedelta(days=self.rng.randint(*offset_range))).isoformat()
+
+    def new_user(self):
+        self.counter += 1
+        return {
+            'full_name': f'Bench User {self.counter}', 'age': 30, 'gender': 'Female',
+            'email': f'bench-new-{os.getpid()}-{self.counter}@bench.mediconnect', 'phone': '',
+            'location': 'Manila', 'emergency_contact': '', 'medical_history': '',
+            'password': BENCH_PASSWORD, 'role': 'patient'
+        }
+
+    def update_user(self):
+        user_id, email = self.patient()
+        return self.db.update_user(user_id, {
+            'full_name': 'Updated Name', 'age': 40, 'gender': 'Male', 'email': email, 'phone': '',
+            'location': 'Cebu', 'emergency_contact': '', 'medical_history': ''
+        })
+
+    def doctor_data(self):
+        return {
+            'name': self.doctor()[2], 'specialty': 'General Medicine', 'status': 'available',
+            'experience': '5 years', 'location': 'Manila', 'languages': ['English'],
+            'consultation_fee': 500, 'available': 1
+        }
+
+    def create_user(self):
+        user_id = self.db.create_user(self.new_user())
+        self.created_users.append(user_id)
+        return user_id
+
+    def delete_user(self):
+        if not self.created_users:
+            self.create_user()
+        return self.db.delete_user(self.created_users.pop())
+
+    def reserve_slot(self):
+        doctor_id = self.doctor()[0]
+        day = self.day((1, 14))
+        self.db.materialize_slots(doctor_id, day, days=1)
+        slots = self.db.get_open_slots(doctor_id, day)
+        if not slots:
+            return None
+        slot_id = slots[0][0]
+        patient_id = self.patient()[0]
+        if self.db.reserve_slot(slot_id, patient_id):
+            self.held_slots.append((slot_id, patient_id))
+        return slot_id
+
+    def release_slot(self):
+        if not self.held_slots:
+            self.reserve_slot()
+        if not self.held_slots:
+            return None
+        return self.db.release_slot(*self.held_slots.pop())
+
+    def book_slot(self):
+        doctor_id = self.doctor()[0]
+        day = self.day((15, 60))
+        self.db.materialize_slots(doctor_id, day, days=1)
+        slots = self.db.get_open_slots(doctor_id, day)
+        return self.db.book_slot(slots[0][0], self.patient()[0]) if slots else None
+
+    def cases(self):
+        """(method name, zero-argument callable) for every public DatabaseManager method timed"""
+        db, rng = self.db, self.rng
+        return [
+            # Users
+            ('authenticate_user', lambda: db.authenticate_user(self.patient()[1], BENCH_PASSWORD)),
+            ('get_all_users', db.get_all_users),
+            ('list_users', lambda: db.list_users(role='patient', limit=25,
+                                                 offset=rng.randrange(0, max(1, len(self.patients) - 25)))),
+            ('count_users', lambda: db.count_users(role='patient', search=rng.choice(LAST_NAMES))),
+            ('get_user_medical_history', lambda: db.get_user_medical_history(self.patient()[0])),
+            ('create_user', self.create_user),
+            ('update_user', self.update_user),
+            ('update_last_login', lambda: db.update_last_login(self.patient()[0])),
+            ('update_password', lambda: db.update_password(self.patient()[0], BENCH_PASSWORD)),
+            ('delete_user', self.delete_user),
+            # Doctors
+            ('get_all_doctors', db.get_all_doctors),
+            ('get_doctor_by_user_id', lambda: db.get_doctor_by_user_id(self.doctor()[1])),
+            ('get_doctor_accounts', db.get_doctor_accounts),
+            ('find_doctor_user_id', lambda: db.find_doctor_user_id(self.doctor()[2])),
+            ('update_doctor_status', lambda: db.update_doctor_status(self.doctor()[0], 'online', 1)),
+            ('add_doctor', lambda: db.add_doctor(dict(self.doctor_data(), rating=4.5, user_id=self.doctor()[1]))),
+            ('update_doctor', lambda: db.update_doctor(self.doctor()[0], self.doctor_data())),
+            # Appointments and slots
+            ('get_user_appointments', lambda: db.get_user_appointments(self.patient()[0])),
+            ('get_all_appointments', db.get_all_appointments),
+            ('list_appointments', lambda: db.list_appointments(limit=25, offset=rng.randrange(0, 1000))),
+            ('count_appointments', db.count_appointments),
+            ('get_doctor_appointments', lambda: db.get_doctor_appointments(
+                self.doctor()[0], self.day((-30, 0)), self.day((0, 30)))),
+            ('create_appointment', lambda: db.create_appointment(
+                self.patient()[0], self.doctor()[0], self.day((100, 400)),
+                f"{rng.randint(0, 23):02d}:{rng.choice(['00', '30'])}", 'Benchmark')),
+            ('update_appointment_status', lambda: db.update_appointment_status(self.appointment_id(), 'completed')),
+            ('get_doctor_availability', lambda: db.get_doctor_availability(self.doctor()[0])),
+            ('materialize_slots', lambda: db.materialize_slots(self.doctor()[0], self.day((0, 14)), days=7)),
+            ('get_open_slots', lambda: db.get_open_slots(self.doctor()[0], self.day((0, 14)))),
+            ('has_slots', lambda: db.has_slots(self.doctor()[0], self.day((0, 14)))),
+            ('reserve_slot', self.reserve_slot),
+            ('release_slot', self.release_slot),
+            ('book_slot', self.book_slot),
+            # Symptom analyses and assessments
+            ('add_symptom_analysis', lambda: db.add_symptom_analysis(self.patient()[0], 'fever, cough', 'Benchmark analysis.')),
+            ('get_user_analyses', lambda: db.get_user_analyses(self.patient()[0])),
+            ('get_all_symptom_analyses_with_patients', db.get_all_symptom_analyses_with_patients),
+            ('list_symptom_analyses_with_patients', lambda: db.list_symptom_analyses_with_patients(
+                limit=25, offset=rng.randrange(0, 1000))),
+            ('count_symptom_analyses', lambda: db.count_symptom_analyses(search=rng.choice(SYMPTOMS))),
+            ('get_analysis_text', lambda: db.get_analysis_text(self.analysis_id())),
+            ('get_symptom_analytics_data', db.get_symptom_analytics_data),
+            ('save_assessment', lambda: db.save_assessment(self.analysis_id(), self.doctor()[0], 'Benchmark assessment.')),
+            ('get_assessment', lambda: db.get_assessment(self.analysis_id(), self.doctor()[0])),
+            ('get_latest_assessments', lambda: db.get_latest_assessments(
+                [self.analysis_id() for _ in range(25)])),
+            # Analytics
+            ('count_analyses_in_window', lambda: db.count_analyses_in_window('last_7_days')),
+            ('count_active_users', lambda: db.count_active_users('last_30_days')),
+            ('get_analysis_counts_by_day', db.get_analysis_counts_by_day),
+            ('get_analysis_demographics', db.get_analysis_demographics),
+            ('count_analyses_by_keywords', lambda: db.count_analyses_by_keywords(
+                {'Emergency': ['urgent', 'emergency'], 'Low': ['mild', 'monitor']})),
+            ('get_stats', db.get_stats),
+            # Notifications and maintenance
+            ('enqueue_notification', lambda: db.enqueue_notification(self.patient()[1], 'Benchmark', 'Body')),
+            ('claim_notifications', lambda: db.mark_notifications_sent(
+                message['id'] for message in db.claim_notifications(limit=50, max_attempts=5))),
+            ('get_notification_counts', db.get_notification_counts),
+            ('reconcile_orphaned_doctors', lambda: db.reconcile_orphaned_doctors(dry_run=True)),
+        ]
+
+def time_case(call, iterations, budget):
+    """Run call up to `iterations` times, stopping early (after at least 3 calls) once `budget` seconds are spent"""
+    latencies, rows = [], 0
+    started = time.perf_counter()
+    for i in range(iterations):
+        start = time.perf_counter()
+        result = call()
+        latencies.append(time.perf_counter() - start)
+        rows += _row_count(result)
+        if i >= 2 and time.perf_counter() - started > budget:
+            break
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        'calls': len(latencies),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'mean_ms': round(total / len(latencies) * 1000, 3),
+        'rows_per_call': round(rows / len(latencies), 1),
+        'rows_per_second': round(rows / total, 1) if total else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DatabaseManager against synthetic data.')
+    parser.add_argument('--scale', default='10k',
+                        help=f"Rows in the largest tables: {', '.join(SCALES)} or a number (default 10k)")
+    parser.add_argument('--db', help='Database file (default bench_<scale>.db); reused if it was generated '
+                                     'with the same scale and seed')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for data generation and call arguments')
+    parser.add_argument('--iterations', type=int, default=50, help='Calls per method')
+    parser.add_argument('--budget', type=float, default=10.0, help='Maximum seconds per method')
+    parser.add_argument('--only', nargs='*', help='Only time these methods')
+    parser.add_argument('--regenerate', action='store_true', help='Generate a fresh database even if one exists')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    scale = SCALES.get(args.scale.lower()) or int(args.scale)
+    db_path = args.db or f'bench_{args.scale.lower()}.db'
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    meta = read_meta(db_path)
+    # Verification cache off, so authenticate_user measures the KDF on every call
+    hasher = PasswordHasher(**load_params(), cache_size=0)
+    generate_seconds = None
+    if args.regenerate or meta.get('scale') != str(scale) or meta.get('seed') != str(args.seed):
+        remove_database(db_path)
+        log(f"Generating {db_path} at scale {scale}...")
+        start = time.perf_counter()
+        generate(db_path, scale, args.seed, hasher=hasher, log=log)
+        generate_seconds = round(time.perf_counter() - start, 1)
+
+    conn = sqlite3.connect(db_path)
+    row_counts = {
+        table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        for table in ('users', 'doctors', 'appointments', 'symptom_analyses')
+    }
+    conn.close()
+
+    # The workload inserts, updates and deletes rows, so every run times a fresh
+    # copy and the generated file stays as generated. Write-behind is off so
+    # update_last_login and update_doctor_status time the write, not the enqueue.
+    run_path = db_path + '.run'
+    copy_database(db_path, run_path)
+    try:
+        db = DatabaseManager(run_path, password_hasher=hasher, write_behind=False)
+        workload = Workload(db, args.seed)
+
+        results = {}
+        for name, call in workload.cases():
+            if args.only and name not in args.only:
+                continue
+            log(f"  timing {name}")
+            results[name] = time_case(call, args.iterations, args.budget)
+        db.close()
+    finally:
+        remove_database(run_path)
+
+    report = {
+        'scale': scale,
+        'seed': args.seed,
+        'database': db_path,
+        'database_bytes': os.path.getsize(db_path),
+        'generate_seconds': generate_seconds,
+        'row_counts': row_counts,
+        'iterations': args.iterations,
+        'sqlite_version': sqlite3.sqlite_version,
+        'python_version': sys.version.split()[0],
+        'methods': results
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+import argparse
+import functools
+import json
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_database import BENCH_PASSWORD, SCALES, generate, read_meta
+from database import DatabaseManager
+from metrics import percentile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APP_SCRIPT = os.path.join(ROOT, 'mediconnect_app.py')
+
+# Session state key the DB timer adds each call's seconds to, so a step knows its own DB time
+DB_SECONDS_KEY = '_bench_db_seconds'
+# Called by the instrumented methods, not by the app; timing them would count time twice
+UNTIMED_METHODS = {'get_connection', 'ensure_schema', 'init_database'}
+
+ADMIN_EMAIL = 'admin@mediconnect.com'
+ADMIN_PASSWORD = 'admin123'
+# How often a login step reruns the app while the password check is still running
+LOGIN_POLL_SECONDS = 0.01
+
+class DbTimer:
+    """Wraps the public DatabaseManager methods to add up the time spent in them.
+
+    Totals are kept for the whole process and, when the call comes from a
+    script run, in that session's state under DB_SECONDS_KEY. Only the
+    outermost call on a thread is counted, since some methods call others.
+    """
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._originals = {}
+
+    def install(self):
+        import streamlit as st
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        def timed(method):
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                depth = getattr(self._local, 'depth', 0)
+                self._local.depth = depth + 1
+                start = time.perf_counter()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    self._local.depth = depth
+                    if depth == 0:
+                        elapsed = time.perf_counter() - start
+                        with self._lock:
+                            self.seconds += elapsed
+                            self.calls += 1
+                        if get_script_run_ctx() is not None and DB_SECONDS_KEY in st.session_state:
+                            st.session_state[DB_SECONDS_KEY] += elapsed
+            return wrapper
+
+        for name, attribute in vars(DatabaseManager).items():
+            if name.startswith('_') or name in UNTIMED_METHODS or not callable(attribute):
+                continue
+            self._originals[name] = attribute
+            setattr(DatabaseManager, name, timed(attribute))
+
+    def uninstall(self):
+        for name, attribute in self._originals.items():
+            setattr(DatabaseManager, name, attribute)
+        self._originals.clear()
+
+def find(elements, label, form=None):
+    """The widget with this label (inside `form`, if given); the login tabs repeat labels"""
+    for element in elements:
+        if element.label == label and (form is None or element.form_id == form):
+            return element
+    raise LookupError(f"No widget labelled {label!r}" + (f" in form {form!r}" if form else ''))
+
+def login(form, button, email, password):
+    def action(at):
+        find(at.text_input, "Email Address*", form).input(email)
+        find(at.text_input, "Password*", form).input(password)
+        find(at.button, button, form).click()
+    return action
+
+def click(label=None, key=None):
+    def action(at):
+        if key:
+            at.button(key=key).click()
+        else:
+            find(at.button, label).click()
+    return action
+
+def submit_symptoms(symptoms):
+    def action(at):
+        find(at.text_area, "Describe your symptoms in detail:").input(symptoms)
+        find(at.selectbox, "Duration of symptoms:").select("1-3 days")
+        find(at.selectbox, "Severity:").select("Moderate")
+        find(at.button, "🔍 Analyze").click()
+    return action
+
+class Accounts:
+    """Login credentials drawn from the generated database"""
+
+    def __init__(self, db_path, seed):
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        conn = sqlite3.connect(db_path)
+        self.patients = [row[0] for row in conn.execute("SELECT email FROM users WHERE role = 'patient'")]
+        self.doctors = [row[0] for row in conn.execute("SELECT email FROM users WHERE role = 'doctor'")]
+        conn.close()
+        if not self.patients or not self.doctors:
+            raise RuntimeError(f"{db_path} has no patient or doctor accounts; generate it with bench_database.py")
+
+    def pick(self, emails):
+        with self._lock:
+            return self.rng.choice(emails)
+
+def journey_steps(role, accounts):
+    """[(page, action, screen expected afterwards)] for one session of `role`"""
+    if role == 'patient':
+        return [
+            ('patient_login', login("login_form", "Sign In", accounts.pick(accounts.patients), BENCH_PASSWORD), 'home'),
+            ('symptom_checker', click(key="consult_main_btn"), 'symptom_checker'),
+            ('symptom_checker_submit', submit_symptoms("Fever and headache for two days with a dry cough"),
+             'symptom_checker'),
+        ]
+    if role == 'doctor':
+        return [
+            ('doctor_login', login("doctor_login_form", "Sign In as Doctor",
+                                   accounts.pick(accounts.doctors), BENCH_PASSWORD), 'doctor_dashboard'),
+            ('doctor_symptoms', click("📊 Patient Symptoms"), 'doctor_dashboard'),
+            ('doctor_records', click("👥 Patient Records"), 'doctor_dashboard'),
+        ]
+    if role == 'admin':
+        return [
+            ('admin_login', login("login_form", "Sign In", ADMIN_EMAIL, ADMIN_PASSWORD), 'admin'),
+            ('admin_analytics', click("📈 System Analytics"), 'admin'),
+        ]
+    raise ValueError(f"Unknown role {role!r}")
+
+def run_journey(role, accounts, timeout):
+    """Play one session from a fresh AppTest; returns a sample dict per rendered page"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_SCRIPT, default_timeout=timeout)
+    samples = []
+    steps = [('login_page', None, 'login_signup')] + journey_steps(role, accounts)
+    for page, action, expected_screen in steps:
+        sample = {'role': role, 'page': page, 'error': None}
+        try:
+            if action:
+                action(at)
+            at.session_state[DB_SECONDS_KEY] = 0.0
+            start = time.perf_counter()
+            at.run()
+            # A login is checked on the password pool; rerun until the app has picked up the result
+            while not at.exception and 'pending_login' in at.session_state:
+                time.sleep(LOGIN_POLL_SECONDS)
+                at.run()
+            sample['seconds'] = time.perf_counter() - start
+            sample['db_seconds'] = at.session_state[DB_SECONDS_KEY]
+            if at.exception:
+                sample['error'] = at.exception[0].message
+            elif at.session_state['current_screen'] != expected_screen:
+                sample['error'] = f"expected screen {expected_screen!r}, got {at.session_state['current_screen']!r}"
+        except Exception as e:
+            sample.setdefault('seconds', None)
+            sample['error'] = f"{type(e).__name__}: {e}"
+        samples.append(sample)
+        if sample['error']:
+            break
+    return samples
+
+def parse_mix(mix):
+    """'patient:6,doctor:3,admin:1' -> ['patient'] * 6 + ['doctor'] * 3 + ['admin']"""
+    roles = []
+    for part in mix.split(','):
+        role, _, weight = part.partition(':')
+        roles += [role.strip()] * int(weight or 1)
+    return roles
+
+def summarize(samples):
+    timed = [s for s in samples if s['seconds'] is not None and not s['error']]
+    latencies = sorted(s['seconds'] for s in timed)
+    render_seconds = sum(latencies)
+    db_seconds = sum(s['db_seconds'] for s in timed)
+    summary = {'renders': len(timed), 'errors': len(samples) - len(timed)}
+    if latencies:
+        summary.update({
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+            'mean_ms': round(render_seconds / len(latencies) * 1000, 1),
+            'db_mean_ms': round(db_seconds / len(latencies) * 1000, 1),
+            'db_share': round(db_seconds / render_seconds, 3) if render_seconds else None
+        })
+    return summary
+
+def run_level(sessions, iterations, roles, accounts, timeout, db_timer):
+    """`sessions` concurrent workers, each playing `iterations` journeys; returns the level's report"""
+    samples, errors = [], []
+    lock = threading.Lock()
+
+    def worker(index):
+        for iteration in range(iterations):
+            role = roles[(index + iteration * sessions) % len(roles)]
+            journey = run_journey(role, accounts, timeout)
+            with lock:
+                samples.extend(journey)
+                errors.extend(s for s in journey if s['error'])
+
+    db_before = db_timer.seconds
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix='bench-session') as pool:
+        for future in [pool.submit(worker, index) for index in range(sessions)]:
+            future.result()
+    wall = time.perf_counter() - start
+
+    pages = {}
+    for sample in samples:
+        pages.setdefault(sample['page'], []).append(sample)
+
+    overall = summarize(samples)
+    return {
+        'sessions': sessions,
+        'journeys': sessions * iterations,
+        'wall_seconds': round(wall, 2),
+        'renders_per_second': round(overall['renders'] / wall, 2),
+        'journeys_per_second': round(sessions * iterations / wall, 2),
+        # DB time over wall time; near or above 1.0 means sessions are queuing on SQLite
+        'db_busy': round((db_timer.seconds - db_before) / wall, 3),
+        'overall': overall,
+        'pages': {page: summarize(page_samples) for page, page_samples in pages.items()},
+        'first_errors': [{'role': s['role'], 'page': s['page'], 'error': s['error']} for s in errors[:5]]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Load-test the app with concurrent headless sessions (streamlit.testing AppTest).')
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 4, 16],
+                        help='Concurrent sessions; several values run one level each (default: 1 4 16)')
+    parser.add_argument('--iterations', type=int, default=5, help='Journeys per session at each level')
+    parser.add_argument('--mix', default='patient:6,doctor:3,admin:1',
+                        help='Role weights of the simulated sessions (default: patient:6,doctor:3,admin:1)')
+    parser.add_argument('--scale', default='10k',
+                        help=f"Size of the generated database: {', '.join(SCALES)} or a number (default 10k)")
+    parser.add_argument('--db', help='Database file (default bench_<scale>.db); reused if it was generated '
+                                     'with the same scale and seed')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for data generation and account choice')
+    parser.add_argument('--timeout', type=float, default=60, help='Seconds one page render may take')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    scale = SCALES.get(args.scale.lower()) or int(args.scale)
+    db_path = os.path.abspath(args.db or f'bench_{args.scale.lower()}.db')
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    meta = read_meta(db_path)
+    if meta.get('scale') != str(scale) or meta.get('seed') != str(args.seed):
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+        log(f"Generating {db_path} at scale {scale}...")
+        generate(db_path, scale, args.seed, log=log)
+
+    # Read by resources.get_shared_db_manager when the first session starts
+    os.environ['MEDICONNECT_DB'] = db_path
+    accounts = Accounts(db_path, args.seed)
+    roles = parse_mix(args.mix)
+    db_timer = DbTimer()
+    db_timer.install()
+
+    try:
+        # One untimed journey per role first, so imports and cache warm-up don't count
+        log("Warming up...")
+        for role in dict.fromkeys(roles):
+            for sample in run_journey(role, accounts, args.timeout):
+                if sample['error']:
+                    raise RuntimeError(f"Warm-up {role} journey failed at {sample['page']}: {sample['error']}")
+
+        levels = []
+        for sessions in args.sessions:
+            log(f"  {sessions} concurrent sessions")
+            levels.append(run_level(sessions, args.iterations, roles, accounts, args.timeout, db_timer))
+    finally:
+        db_timer.uninstall()
+
+    report = {
+        'database': db_path,
+        'database_bytes': os.path.getsize(db_path),
+        'scale': scale,
+        'seed': args.seed,
+        'mix': args.mix,
+        'iterations': args.iterations,
+        'cpu_count': os.cpu_count(),
+        'python_version': sys.version.split()[0],
+        'sqlite_version': sqlite3.sqlite_version,
+        'levels': levels
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
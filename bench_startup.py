@@ -0,0 +1,88 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def run_import(module, importtime=False):
+    """Import `module` in a fresh interpreter; returns (wall seconds, stderr)"""
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', f'import {module}']
+
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{result.stderr}')
+    return elapsed, result.stderr
+
+def parse_importtime(stderr):
+    """[(cumulative microseconds, self microseconds, module)] from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        # Keep the indentation after the separator space; it encodes the nesting depth
+        rows.append((int(cumulative_us), int(self_us), name[1:].rstrip()))
+    return rows
+
+def direct_import_breakdown(rows, limit):
+    """Heaviest modules imported directly by the benchmarked module, by cumulative time"""
+    # -X importtime indents nested imports by two spaces per level
+    direct = [(cumulative_us, name.strip()) for cumulative_us, _, name in rows
+              if len(name) - len(name.lstrip()) == 2]
+    return sorted(direct, reverse=True)[:limit]
+
+def bench(module, runs, top):
+    timings = [run_import(module)[0] for _ in range(runs)]
+    _, stderr = run_import(module, importtime=True)
+    rows = parse_importtime(stderr)
+    return {
+        'module': module,
+        'runs': runs,
+        'wall_ms': {
+            'min': round(min(timings) * 1000, 1),
+            'median': round(statistics.median(timings) * 1000, 1),
+            'max': round(max(timings) * 1000, 1)
+        },
+        'imports': len(rows),
+        'total_import_ms': round(max(cumulative for cumulative, _, _ in rows) / 1000, 1),
+        'top_imports_ms': [
+            {'module': name, 'cumulative_ms': round(us / 1000, 1)}
+            for us, name in direct_import_breakdown(rows, top)
+        ]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure cold import time of the app modules with a -X importtime breakdown.')
+    parser.add_argument('modules', nargs='*', default=['mediconnect_app'],
+                        help='Modules to import (default: mediconnect_app)')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per module')
+    parser.add_argument('--top', type=int, default=15, help='Direct imports to list in the breakdown')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    results = [bench(module, args.runs, args.top) for module in args.modules]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for result in results:
+        wall = result['wall_ms']
+        print(f"{result['module']}: median {wall['median']} ms "
+              f"(min {wall['min']}, max {wall['max']}, {result['runs']} runs, {result['imports']} modules)")
+        print(f"  import time {result['total_import_ms']} ms, direct imports:")
+        for entry in result['top_imports_ms']:
+            print(f"  {entry['cumulative_ms']:>9.1f} ms  {entry['module']}")
+
+if __name__ == "__main__":
+    main()
@@ -1,56 +1,71 @@
-import sqlite3
+import argparse
+import json
 import os
+import time
 
-def cleanup_orphaned_doctors():
-    """Remove doctors from doctors table that don't have corresponding user accounts"""
+from database import DatabaseManager
 
-    db_path = 'mediconnect.db'
-    if not os.path.exists(db_path):
-        print('Database not found')
-        return
+def print_report(report):
+    """Print a reconciliation report in human readable form"""
+    print(f'Total doctors in doctors table: {report["total_doctors"]}')
+    print(f'Total doctor users: {report["doctor_users"]}')
+    print()
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    print(f'Orphaned doctors (no user account): {len(report["orphaned"])}')
+    for doc in report['orphaned']:
+        print(f'  - ID: {doc["id"]}, Name: {doc["name"]}')
 
-    # Get all doctors
-    cursor.execute('SELECT id, name FROM doctors')
-    all_doctors = cursor.fetchall()
+    if report['orphaned']:
+        affected = report['affected']
+        verb = 'would be' if report['dry_run'] else 'were'
+        print(f'\nTheir appointments: {affected["appointments_kept"]} kept for the patients, '
+              f'{affected["appointments_cancelled"]} of them still scheduled and {verb} cancelled')
+        print(f'Their assessments: {affected["assessments_kept"]} kept')
+        print(f'Their slots and availability rows {verb} deleted: '
+              f'{affected["slots_deleted"]} slots, {affected["availability_deleted"]} availability rows')
 
-    # Get all doctor users
-    cursor.execute('SELECT id, full_name FROM users WHERE role = "doctor"')
-    doctor_users = cursor.fetchall()
+    if report['dry_run']:
+        print('\nDry run - nothing was deleted.')
+    elif report['deleted']:
+        print(f'\nDeleted {report["deleted"]} orphaned doctors.')
+        print('Cleanup completed!')
 
-    doctor_user_names = {user[1] for user in doctor_users}
+    print(f'\nRemaining doctors: {report["remaining"]}')
 
-    print(f'Total doctors in doctors table: {len(all_doctors)}')
-    print(f'Total doctor users: {len(doctor_users)}')
-    print()
+def cleanup_orphaned_doctors(db_path='mediconnect.db', dry_run=False, as_json=False):
+    """Remove doctors from doctors table that don't have corresponding user accounts"""
 
-    orphaned_doctors = []
-    for doc_id, doc_name in all_doctors:
-        if doc_name not in doctor_user_names:
-            orphaned_doctors.append((doc_id, doc_name))
+    if not os.path.exists(db_path):
+        print('Database not found')
+        return None
 
-    print(f'Orphaned doctors (no user account): {len(orphaned_doctors)}')
-    for doc_id, doc_name in orphaned_doctors:
-        print(f'  - ID: {doc_id}, Name: {doc_name}')
+    db = DatabaseManager(db_path)
+    try:
+        report = db.reconcile_orphaned_doctors(dry_run=dry_run)
+    finally:
+        db.close()
 
-    # Delete orphaned doctors
-    if orphaned_doctors:
-        print(f'\nDeleting {len(orphaned_doctors)} orphaned doctors...')
-        for doc_id, doc_name in orphaned_doctors:
-            cursor.execute('DELETE FROM doctors WHERE id = ?', (doc_id,))
-            print(f'  Deleted: {doc_name}')
+    if as_json:
+        print(json.dumps(report))
+    else:
+        print_report(report)
 
-        conn.commit()
-        print('Cleanup completed!')
+    return report
 
-    # Verify remaining doctors
-    cursor.execute('SELECT COUNT(*) FROM doctors')
-    remaining = cursor.fetchone()[0]
-    print(f'\nRemaining doctors: {remaining}')
+def main():
+    parser = argparse.ArgumentParser(description='Reconcile the doctors table against doctor user accounts.')
+    parser.add_argument('--db', default='mediconnect.db', help='Path to the SQLite database')
+    parser.add_argument('--dry-run', action='store_true', help='Report orphaned doctors without deleting them')
+    parser.add_argument('--json', action='store_true', help='Print the report as a single JSON line')
+    parser.add_argument('--every', type=float, default=0,
+                        help='Run repeatedly every N seconds (for use without cron); 0 runs once')
+    args = parser.parse_args()
 
-    conn.close()
+    while True:
+        cleanup_orphaned_doctors(args.db, dry_run=args.dry_run, as_json=args.json)
+        if args.every <= 0:
+            break
+        time.sleep(args.every)
 
 if __name__ == "__main__":
-    cleanup_orphaned_doctors()
+    main()
@@ -0,0 +1,37 @@
+import streamlit as st
+
+def record_list(key, total, fetch_page, summarize, label, page_size=25):
+    """Paged table of summary rows with a picker; returns the selected row or None.
+
+    Only the current page is fetched (fetch_page(limit, offset)) and drawn, and
+    the caller renders the detail panel for the one selected row, so a rerun
+    costs the same whether there are fifty records or fifty thousand.
+    summarize(row) gives the table columns as a dict; label(row) names the row
+    in the picker.
+    """
+    if total == 0:
+        return None
+
+    pages = (total + page_size - 1) // page_size
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1,
+                               step=1, key=f"{key}_page")
+    else:
+        page = 1
+    offset = (page - 1) * page_size
+
+    rows = fetch_page(page_size, offset)
+    if not rows:
+        return None
+
+    st.caption(f"Showing {offset + 1}–{offset + len(rows)} of {total}")
+    st.table([summarize(row) for row in rows])
+
+    rows_by_id = {row.id: row for row in rows}
+    selected_id = st.selectbox(
+        "Open record",
+        [None] + list(rows_by_id),
+        format_func=lambda row_id: "Select a record..." if row_id is None else label(rows_by_id[row_id]),
+        key=f"{key}_selected_{page}"
+    )
+    return rows_by_id.get(selected_id)
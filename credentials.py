@@ -0,0 +1,226 @@
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import REGISTRY
+from singleton import process_singleton
+
+# Written by `python credentials.py --calibrate` at install time
+SETTINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'credentials_settings.json')
+
+SCHEME = 'scrypt'
+DEFAULT_PARAMS = {'n': 2 ** 14, 'r': 8, 'p': 1}
+
+# Set on the verification pool's threads, where verify() runs the KDF inline
+_pool_thread = threading.local()
+
+def _mark_pool_thread():
+    _pool_thread.active = True
+
+def _b64encode(data):
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+def _b64decode(text):
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+class PasswordHasher:
+    """scrypt password hashing with a bounded verification pool and a short-lived verify cache.
+
+    Hashes are stored as ``scrypt$n$r$p$salt$hash`` so the cost parameters
+    travel with each hash; when the configured parameters change, hashes made
+    with the old ones are reported by needs_rehash() and upgraded on login.
+    Plaintext passwords left from before hashing are hashed once by
+    DatabaseManager.init_database; verify() still accepts one meanwhile.
+    """
+
+    def __init__(self, n=DEFAULT_PARAMS['n'], r=DEFAULT_PARAMS['r'], p=DEFAULT_PARAMS['p'],
+                 workers=None, cache_size=1024, cache_ttl=300):
+        self.n = n
+        self.r = r
+        self.p = p
+
+        # The KDF runs in OpenSSL without the GIL; the pool caps how many run at once
+        # so a login burst can't exhaust memory (each verification needs 128*n*r bytes)
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-verify',
+                                            initializer=_mark_pool_thread)
+
+        # Checked when an email is unknown, so the answer takes as long as for a real account
+        self._dummy_hash = self._executor.submit(self.hash, secrets.token_urlsafe(16))
+
+        # Recently verified (hash, password) pairs, keyed by an HMAC with a per-process key
+        # so that Streamlit reruns and repeated logins skip the KDF. Only successes are cached.
+        self._cache_key = secrets.token_bytes(32)
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def params(self):
+        return {'n': self.n, 'r': self.r, 'p': self.p}
+
+    @property
+    def dummy_hash(self):
+        """A hash of a random password with the current parameters"""
+        return self._dummy_hash.result()
+
+    def _derive(self, password, salt, n, r, p):
+        return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * n * r + 1024 * 1024, dklen=32)
+
+    def hash(self, password):
+        salt = secrets.token_bytes(16)
+        digest = self._derive(password, salt, self.n, self.r, self.p)
+        return f"{SCHEME}${self.n}${self.r}${self.p}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def hash_many(self, passwords):
+        """Hashes of several passwords, computed in parallel on the pool"""
+        return list(self._executor.map(self.hash, passwords))
+
+    def submit(self, fn, *args):
+        """Run fn on the verification pool and return its Future.
+
+        For work that checks a password (a whole login, say): verify() called
+        from the pool runs the KDF inline instead of queueing behind itself.
+        """
+        return self._executor.submit(fn, *args)
+
+    def is_hashed(self, stored):
+        return bool(stored) and stored.startswith(SCHEME + '$')
+
+    def needs_rehash(self, stored):
+        if not self.is_hashed(stored):
+            return True
+        try:
+            _, n, r, p, _, _ = stored.split('$')
+            return (int(n), int(r), int(p)) != (self.n, self.r, self.p)
+        except ValueError:
+            return True
+
+    def _cache_token(self, stored, password):
+        return hmac.new(self._cache_key, f"{stored}\0{password}".encode('utf-8'), hashlib.sha256).digest()
+
+    def _check_cache(self, token):
+        with self._cache_lock:
+            expires = self._cache.get(token)
+            if expires is not None and expires > time.monotonic():
+                self._cache.move_to_end(token)
+                self.cache_hits += 1
+                return True
+            if expires is not None:
+                del self._cache[token]
+            self.cache_misses += 1
+            return False
+
+    def _remember(self, token):
+        with self._cache_lock:
+            self._cache[token] = time.monotonic() + self.cache_ttl
+            self._cache.move_to_end(token)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _verify_uncached(self, stored, password):
+        if not self.is_hashed(stored):
+            # Legacy plaintext row
+            return hmac.compare_digest((stored or '').encode('utf-8'), password.encode('utf-8'))
+        try:
+            _, n, r, p, salt, digest = stored.split('$')
+            expected = _b64decode(digest)
+            actual = self._derive(password, _b64decode(salt), int(n), int(r), int(p))
+        except (ValueError, TypeError):
+            return False
+        return hmac.compare_digest(expected, actual)
+
+    def verify(self, stored, password):
+        """Check a password against a stored hash.
+
+        Called from another thread, the KDF runs on the verification pool and
+        the caller waits for it; to keep a thread free, submit() the work that
+        needs the answer instead. Called from the pool it runs inline. Cache
+        hits skip the KDF entirely.
+        """
+        if stored is None or password is None:
+            return False
+
+        token = self._cache_token(stored, password)
+        if self._check_cache(token):
+            return True
+
+        if getattr(_pool_thread, 'active', False):
+            verified = self._verify_uncached(stored, password)
+        else:
+            verified = self._executor.submit(self._verify_uncached, stored, password).result()
+        if verified:
+            self._remember(token)
+        return verified
+
+    def cache_stats(self):
+        with self._cache_lock:
+            return {'size': len(self._cache), 'hits': self.cache_hits, 'misses': self.cache_misses}
+
+def calibrate(target_ms=250, max_memory_mb=64, r=8, p=1):
+    """Pick the largest scrypt n whose hash time stays under target_ms on this machine"""
+    n = 2 ** 14
+    hasher = PasswordHasher(n=n, r=r, p=p, workers=1)
+    while True:
+        next_n = n * 2
+        if 128 * next_n * r > max_memory_mb * 1024 * 1024:
+            break
+        start = time.perf_counter()
+        hasher._derive('calibration', b'0' * 16, n, r, p)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        # Doubling n roughly doubles the time
+        if elapsed_ms * 2 > target_ms:
+            break
+        n = next_n
+    return {'n': n, 'r': r, 'p': p}
+
+def load_params():
+    """Cost parameters from the calibration file, falling back to the defaults"""
+    try:
+        with open(SETTINGS_FILE) as f:
+            settings = json.load(f)
+        return {key: int(settings[key]) for key in ('n', 'r', 'p')}
+    except (OSError, ValueError, KeyError):
+        return dict(DEFAULT_PARAMS)
+
+@process_singleton
+def get_password_hasher():
+    """Process-wide PasswordHasher, so the pool and cache are shared by every session"""
+    hasher = PasswordHasher(**load_params())
+    REGISTRY.callback_counter('mediconnect_password_cache_hits_total',
+                              'Logins verified from the password cache, without the KDF',
+                              lambda: hasher.cache_stats()['hits'])
+    REGISTRY.callback_counter('mediconnect_password_cache_misses_total',
+                              'Logins that ran the KDF',
+                              lambda: hasher.cache_stats()['misses'])
+    return hasher
+
+def main():
+    parser = argparse.ArgumentParser(description='Calibrate password hashing cost for this machine.')
+    parser.add_argument('--calibrate', action='store_true', help='Benchmark scrypt and write the chosen parameters')
+    parser.add_argument('--target-ms', type=float, default=250, help='Target time for one hash in milliseconds')
+    parser.add_argument('--max-memory-mb', type=int, default=64, help='Upper bound on memory per hash')
+    args = parser.parse_args()
+
+    if args.calibrate:
+        params = calibrate(args.target_ms, args.max_memory_mb)
+        with open(SETTINGS_FILE, 'w') as f:
+            json.dump(params, f)
+        print(f"Wrote {SETTINGS_FILE}: {params}")
+    else:
+        print(f"Current parameters: {load_params()}")
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,74 @@
+import logging
 import sqlite3
 import os
-from datetime import datetime
-
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from credentials import get_password_hasher
+from metrics import APPOINTMENTS_CREATED, LOGINS
+from rows import (
+    UserRow, AppointmentRow, PatientAppointmentRow, AnalysisRow,
+    PatientAnalysisRow, PatientAnalysisSummaryRow, AnalyticsRow, AssessmentRow,
+    USER_LIST_FIELDS, user_projection, row_factory
+)
+from sql_metrics import get_sql_recorder, named_queries
+from write_behind import WriteBehindBuffer
+
+logger = logging.getLogger(__name__)
+
+# Database files whose schema has been created/migrated by this process
+_initialized_databases = set()
+_schema_lock = threading.Lock()
+
+@named_queries
 class DatabaseManager:
-    def __init__(self, db_name='mediconnect.db'):
+    # Columns selected when a doctor is fetched together with their user account
+    _DOCTOR_ACCOUNT_COLUMNS = '''
+        u.id, u.full_name, u.age, u.gender, u.email, u.phone, u.location, u.last_login,
+        d.id, d.name, d.specialty, d.rating, d.status, d.experience, d.languages,
+        d.consultation_fee, d.available
+    '''
+
+    def __init__(self, db_name='mediconnect.db', password_hasher=None, write_behind=True, sql_recorder=None):
         self.db_name = db_name
-        self.init_database()
+        self.password_hasher = password_hasher or get_password_hasher()
+        self.sql_recorder = sql_recorder or get_sql_recorder()
+        self.ensure_schema()
+
+        # last_login and doctor status updates are coalesced and written in batches
+        self.write_buffer = WriteBehindBuffer(self.get_connection) if write_behind else None
+
+    # Weekly template used for doctors that haven't set their own availability:
+    # (weekday with 0 = Monday, start time, end time, slot length in minutes)
+    DEFAULT_AVAILABILITY = [(weekday, '09:00', '17:00', 30) for weekday in range(5)]
+    # Days of slots created ahead of time; covers the booking picker's 30 days
+    SLOT_HORIZON_DAYS = 31
 
     def get_connection(self):
-        return sqlite3.connect(self.db_name)
+        # Wait for a concurrent writer instead of failing immediately with "database is locked"
+        if self.sql_recorder.enabled:
+            return self.sql_recorder.connect(self.db_name, timeout=10)
+        return sqlite3.connect(self.db_name, timeout=10)
+
+    def ensure_schema(self):
+        """Run init_database once per database file per process"""
+        key = os.path.abspath(self.db_name)
+        if key in _initialized_databases:
+            return
+        with _schema_lock:
+            if key not in _initialized_databases:
+                self.init_database()
+                _initialized_databases.add(key)
 
     def init_database(self):
         """Initialize database tables"""
         conn = self.get_connection()
         cursor = conn.cursor()
 
+        # WAL lets readers carry on while a booking or login is being written
+        cursor.execute('PRAGMA journal_mode=WAL')
+
         # Users table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -30,7 +84,8 @@ class DatabaseManager:
                 password TEXT NOT NULL,
                 role TEXT DEFAULT 'patient',
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_login TIMESTAMP
+                last_login TIMESTAMP,
+                last_login_epoch INTEGER
             )
         ''')
 
@@ -47,10 +102,15 @@ class DatabaseManager:
                 languages TEXT,
                 consultation_fee REAL DEFAULT 0,
                 available BOOLEAN DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                user_id INTEGER REFERENCES users (id)
             )
         ''')
 
+        # Link doctors to their user account (databases created before user_id existed)
+        self._add_column_if_missing(cursor, 'doctors', 'user_id', 'INTEGER REFERENCES users (id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_doctors_user_id ON doctors (user_id)')
+
         # Appointments table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS appointments (
@@ -76,10 +136,168 @@ class DatabaseManager:
                 symptoms TEXT,
                 analysis TEXT,
                 timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                timestamp_epoch INTEGER,
                 FOREIGN KEY (patient_id) REFERENCES users (id)
             )
         ''')
 
+        # Sortable integer (unix epoch) copies of the text timestamps, for indexed time windows
+        self._add_column_if_missing(cursor, 'users', 'last_login_epoch', 'INTEGER')
+        self._add_column_if_missing(cursor, 'symptom_analyses', 'timestamp_epoch', 'INTEGER')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_last_login_epoch ON users (last_login_epoch)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_symptom_analyses_timestamp_epoch ON symptom_analyses (timestamp_epoch)')
+        cursor.execute('''
+            UPDATE users SET last_login_epoch = CAST(strftime('%s', last_login) AS INTEGER)
+            WHERE last_login_epoch IS NULL AND last_login IS NOT NULL
+        ''')
+        cursor.execute('''
+            UPDATE symptom_analyses SET timestamp_epoch = CAST(strftime('%s', timestamp) AS INTEGER)
+            WHERE timestamp_epoch IS NULL AND timestamp IS NOT NULL
+        ''')
+
+        # Normalize appointment dates and times to sortable ISO text (YYYY-MM-DD, HH:MM)
+        cursor.execute('''
+            UPDATE appointments SET appointment_date = date(appointment_date)
+            WHERE date(appointment_date) IS NOT NULL AND appointment_date != date(appointment_date)
+        ''')
+        cursor.execute('''
+            UPDATE appointments SET appointment_time = strftime('%H:%M', appointment_time)
+            WHERE strftime('%H:%M', appointment_time) IS NOT NULL AND appointment_time != strftime('%H:%M', appointment_time)
+        ''')
+
+        # Weekly availability templates per doctor
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS doctor_availability (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                doctor_id INTEGER NOT NULL,
+                weekday INTEGER NOT NULL,
+                start_time TIME NOT NULL,
+                end_time TIME NOT NULL,
+                slot_minutes INTEGER DEFAULT 30,
+                FOREIGN KEY (doctor_id) REFERENCES doctors (id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_doctor_availability_doctor ON doctor_availability (doctor_id)')
+
+        # Materialized bookable slots; status is 'open', 'held' or 'booked'
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS appointment_slots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                doctor_id INTEGER NOT NULL,
+                slot_date DATE NOT NULL,
+                slot_time TIME NOT NULL,
+                status TEXT DEFAULT 'open',
+                patient_id INTEGER,
+                held_until INTEGER,
+                appointment_id INTEGER,
+                UNIQUE (doctor_id, slot_date, slot_time),
+                FOREIGN KEY (doctor_id) REFERENCES doctors (id),
+                FOREIGN KEY (appointment_id) REFERENCES appointments (id)
+            )
+        ''')
+
+        # Calendar range index for per-doctor day/week views
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_appointments_doctor_date_time
+            ON appointments (doctor_id, appointment_date, appointment_time)
+        ''')
+
+        # A doctor can only have one live appointment at a given date and time. Double bookings
+        # made before this index existed keep their earliest appointment; the later ones are
+        # cancelled with a note, and a slot pointing at one of them moves to the one kept
+        cursor.execute('''
+            SELECT DISTINCT later.id FROM appointments later
+            JOIN appointments earlier
+              ON earlier.doctor_id = later.doctor_id AND earlier.appointment_date = later.appointment_date
+             AND earlier.appointment_time = later.appointment_time AND earlier.id < later.id
+            WHERE later.status != 'cancelled' AND earlier.status != 'cancelled'
+        ''')
+        double_booked = [(row[0],) for row in cursor.fetchall()]
+        if double_booked:
+            cursor.executemany('''
+                UPDATE appointments
+                SET status = 'cancelled',
+                    notes = TRIM(COALESCE(notes, '') || ' [Cancelled: the doctor was already booked at this time]')
+                WHERE id = ?
+            ''', double_booked)
+            cursor.executemany('''
+                UPDATE appointment_slots
+                SET (appointment_id, patient_id) = (
+                    SELECT a.id, a.patient_id FROM appointments a
+                    WHERE a.doctor_id = appointment_slots.doctor_id AND a.appointment_date = appointment_slots.slot_date
+                      AND a.appointment_time = appointment_slots.slot_time AND a.status != 'cancelled'
+                )
+                WHERE appointment_id = ?
+            ''', double_booked)
+            logger.warning("Cancelled %d double-booked appointments in %s: %s", len(double_booked), self.db_name,
+                           ', '.join(str(appointment_id) for appointment_id, in double_booked))
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_appointments_doctor_slot
+            ON appointments (doctor_id, appointment_date, appointment_time)
+            WHERE status != 'cancelled'
+        ''')
+
+        # Latest appointments across all doctors, read newest first with a LIMIT
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_appointments_date_time
+            ON appointments (appointment_date, appointment_time)
+        ''')
+
+        # Per-patient history lists (and deleting a patient's rows)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_appointments_patient_date_time
+            ON appointments (patient_id, appointment_date, appointment_time)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_symptom_analyses_patient_epoch
+            ON symptom_analyses (patient_id, timestamp_epoch)
+        ''')
+
+        # Lookup index for matching doctor rows to their user accounts
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_role_full_name ON users (role, full_name)')
+
+        # Doctor assessments of symptom analyses; one current assessment per doctor and analysis
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS doctor_assessments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                analysis_id INTEGER NOT NULL,
+                doctor_id INTEGER NOT NULL,
+                assessment TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_epoch INTEGER,
+                UNIQUE (analysis_id, doctor_id),
+                FOREIGN KEY (analysis_id) REFERENCES symptom_analyses (id),
+                FOREIGN KEY (doctor_id) REFERENCES doctors (id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_doctor_assessments_analysis_updated
+            ON doctor_assessments (analysis_id, updated_epoch)
+        ''')
+
+        # Outbound notifications, written by the UI and delivered by notifications.NotificationDispatcher.
+        # status is 'pending', 'sending' (claimed until next_attempt_epoch), 'sent' or 'failed'
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS notification_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                transport TEXT NOT NULL DEFAULT 'email',
+                recipient TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                body TEXT NOT NULL,
+                status TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                next_attempt_epoch INTEGER NOT NULL,
+                last_error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                sent_at TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_notification_outbox_due
+            ON notification_outbox (status, next_attempt_epoch)
+        ''')
+
         # Insert default doctors if not exists
         cursor.execute("SELECT COUNT(*) FROM doctors")
         if cursor.fetchone()[0] == 0:
@@ -113,27 +331,108 @@ class DatabaseManager:
         # Insert default doctor users if not exists
         cursor.execute("SELECT COUNT(*) FROM users WHERE role = 'doctor'")
         if cursor.fetchone()[0] == 0:
+            default_password = 'doctor123'
             doctor_users_data = [
-                ('Dr. Sarah Johnson', 45, 'Female', 'sarah.johnson@mediconnect.com', '+63 912 345 6789', 'Manila', '', '', 'doctor123', 'doctor'),
-                ('Dr. Michael Chen', 42, 'Male', 'michael.chen@mediconnect.com', '+63 923 456 7890', 'Cebu', '', '', 'doctor123', 'doctor'),
-                ('Dr. Maria Santos', 38, 'Female', 'maria.santos@mediconnect.com', '+63 934 567 8901', 'Davao', '', '', 'doctor123', 'doctor'),
-                ('Dr. James Rodriguez', 40, 'Male', 'james.rodriguez@mediconnect.com', '+63 945 678 9012', 'Manila', '', '', 'doctor123', 'doctor'),
-                ('Dr. Robert Kim', 48, 'Male', 'robert.kim@mediconnect.com', '+63 956 789 0123', 'Quezon City', '', '', 'doctor123', 'doctor'),
-                ('Dr. Elena Cruz', 41, 'Female', 'elena.cruz@mediconnect.com', '+63 967 890 1234', 'Makati', '', '', 'doctor123', 'doctor'),
-                ('Dr. David Wong', 50, 'Male', 'david.wong@mediconnect.com', '+63 978 901 2345', 'Manila', '', '', 'doctor123', 'doctor'),
-                ('Dr. Anna Reyes', 37, 'Female', 'anna.reyes@mediconnect.com', '+63 989 012 3456', 'Cebu', '', '', 'doctor123', 'doctor'),
-                ('Dr. Carlos Mendoza', 44, 'Male', 'carlos.mendoza@mediconnect.com', '+63 990 123 4567', 'Davao', '', '', 'doctor123', 'doctor'),
-                ('Dr. Fatima Al-Sayed', 52, 'Female', 'fatima.alsayed@mediconnect.com', '+63 901 234 5678', 'Quezon City', '', '', 'doctor123', 'doctor')
+                ('Dr. Sarah Johnson', 45, 'Female', 'sarah.johnson@mediconnect.com', '+63 912 345 6789', 'Manila', '', '', default_password, 'doctor'),
+                ('Dr. Michael Chen', 42, 'Male', 'michael.chen@mediconnect.com', '+63 923 456 7890', 'Cebu', '', '', default_password, 'doctor'),
+                ('Dr. Maria Santos', 38, 'Female', 'maria.santos@mediconnect.com', '+63 934 567 8901', 'Davao', '', '', default_password, 'doctor'),
+                ('Dr. James Rodriguez', 40, 'Male', 'james.rodriguez@mediconnect.com', '+63 945 678 9012', 'Manila', '', '', default_password, 'doctor'),
+                ('Dr. Robert Kim', 48, 'Male', 'robert.kim@mediconnect.com', '+63 956 789 0123', 'Quezon City', '', '', default_password, 'doctor'),
+                ('Dr. Elena Cruz', 41, 'Female', 'elena.cruz@mediconnect.com', '+63 967 890 1234', 'Makati', '', '', default_password, 'doctor'),
+                ('Dr. David Wong', 50, 'Male', 'david.wong@mediconnect.com', '+63 978 901 2345', 'Manila', '', '', default_password, 'doctor'),
+                ('Dr. Anna Reyes', 37, 'Female', 'anna.reyes@mediconnect.com', '+63 989 012 3456', 'Cebu', '', '', default_password, 'doctor'),
+                ('Dr. Carlos Mendoza', 44, 'Male', 'carlos.mendoza@mediconnect.com', '+63 990 123 4567', 'Davao', '', '', default_password, 'doctor'),
+                ('Dr. Fatima Al-Sayed', 52, 'Female', 'fatima.alsayed@mediconnect.com', '+63 901 234 5678', 'Quezon City', '', '', default_password, 'doctor')
             ]
 
+            # Each account gets its own salted hash
+            doctor_users_data = [row[:8] + (self.password_hasher.hash(row[8]),) + row[9:] for row in doctor_users_data]
+
             cursor.executemany('''
                 INSERT INTO users (full_name, age, gender, email, phone, location, emergency_contact, medical_history, password, role)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', doctor_users_data)
 
+        # One-time migration: hash passwords still stored as plaintext
+        cursor.execute("SELECT id, password FROM users WHERE password NOT LIKE 'scrypt$%'")
+        plaintext = [(user_id, stored) for user_id, stored in cursor.fetchall()
+                     if not self.password_hasher.is_hashed(stored)]
+        if plaintext:
+            hashes = self.password_hasher.hash_many(stored for _, stored in plaintext)
+            cursor.executemany('UPDATE users SET password = ? WHERE id = ?',
+                               [(hashed, user_id) for hashed, (user_id, _) in zip(hashes, plaintext)])
+
+        # Backfill doctors.user_id for rows that were linked by name only
+        cursor.execute('''
+            UPDATE doctors SET user_id = (
+                SELECT u.id FROM users u
+                WHERE u.role = 'doctor' AND u.full_name = doctors.name
+                ORDER BY u.id LIMIT 1
+            )
+            WHERE user_id IS NULL
+        ''')
+
         conn.commit()
         conn.close()
 
+    def _sync_pending_writes(self, *tables):
+        """Flush buffered updates to these tables so the next read sees them"""
+        if self.write_buffer and self.write_buffer.has_pending(*tables):
+            self.write_buffer.flush()
+
+    def flush_pending_writes(self):
+        if self.write_buffer:
+            self.write_buffer.flush()
+
+    def close(self):
+        """Write pending updates and stop the write-behind thread; later updates are written directly"""
+        if self.write_buffer:
+            self.write_buffer.close()
+            self.write_buffer = None
+
+    @staticmethod
+    def _normalize_date(value):
+        """Dates are stored as YYYY-MM-DD so they sort and range-scan as text"""
+        if isinstance(value, str):
+            return datetime.strptime(value.strip()[:10], '%Y-%m-%d').date().isoformat()
+        if isinstance(value, datetime):
+            return value.date().isoformat()
+        return value.isoformat()
+
+    @staticmethod
+    def _normalize_time(value):
+        """Times are stored as HH:MM"""
+        if isinstance(value, str):
+            parts = value.strip().split(':')
+            return f"{int(parts[0]):02d}:{int(parts[1]) if len(parts) > 1 else 0:02d}"
+        return value.strftime('%H:%M')
+
+    @staticmethod
+    def time_window(name):
+        """(start, end) unix epoch bounds for a named window in server local time.
+
+        Supported names: 'today', 'yesterday', 'last_7_days', 'last_30_days'.
+        The end bound is exclusive.
+        """
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        tomorrow = midnight + timedelta(days=1)
+        windows = {
+            'today': (midnight, tomorrow),
+            'yesterday': (midnight - timedelta(days=1), midnight),
+            'last_7_days': (midnight - timedelta(days=6), tomorrow),
+            'last_30_days': (midnight - timedelta(days=29), tomorrow),
+        }
+        if name not in windows:
+            raise ValueError(f"Unknown time window: {name}")
+        start, end = windows[name]
+        return int(start.timestamp()), int(end.timestamp())
+
+    def _add_column_if_missing(self, cursor, table, column, definition):
+        """Add a column to an existing table (simple in-place migration)"""
+        cursor.execute(f'PRAGMA table_info({table})')
+        if column not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
     # User management methods
     def create_user(self, user_data):
         conn = self.get_connection()
@@ -152,7 +451,7 @@ class DatabaseManager:
                 user_data['location'],
                 user_data.get('emergency_contact'),
                 user_data.get('medical_history'),
-                user_data['password'],
+                self.password_hasher.hash(user_data['password']),
                 user_data.get('role', 'patient')
             ))
 
@@ -164,21 +463,61 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    def authenticate_user_async(self, email, password):
+        """authenticate_user on the password verification pool; returns a Future of its result.
+
+        The Streamlit thread hands the login off and polls the Future, so it
+        is not held for the KDF.
+        """
+        return self.password_hasher.submit(self.authenticate_user, email, password)
+
     def authenticate_user(self, email, password):
+        """Verify credentials and record the login on a single connection.
+
+        The password check runs between the read and the write so no lock is
+        held during the KDF. An unknown email is checked against a dummy hash,
+        so it takes as long to reject as a wrong password. With the
+        write-behind buffer the last_login update is queued and the login
+        itself is read-only; otherwise it is one UPDATE ... RETURNING
+        statement that also yields the profile. A hash made with old
+        parameters is upgraded afterwards on the verification pool.
+        """
+        profile_columns = 'id, full_name, age, gender, email, phone, location, emergency_contact, medical_history, role'
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT id, full_name, age, gender, email, phone, location, emergency_contact, medical_history, role
-            FROM users WHERE email = ? AND password = ?
-        ''', (email, password))
-
-        user = cursor.fetchone()
-        conn.close()
+        try:
+            cursor.execute(f'SELECT {profile_columns}, password FROM users WHERE email = ?', (email,))
+            user = cursor.fetchone()
+
+            stored_password = user[10] if user else self.password_hasher.dummy_hash
+            if not self.password_hasher.verify(stored_password, password) or not user:
+                LOGINS.inc(result='failure')
+                return None
+            LOGINS.inc(result='success')
+
+            user_id = user[0]
+            if self.password_hasher.needs_rehash(stored_password):
+                self.password_hasher.submit(self._rehash_password, user_id, stored_password, password)
+
+            if self.write_buffer:
+                self.update_last_login(user_id)
+            else:
+                assignments = 'last_login = CURRENT_TIMESTAMP, last_login_epoch = ?'
+                params = [int(time.time()), user_id]
+
+                if sqlite3.sqlite_version_info >= (3, 35, 0):
+                    cursor.execute(f'UPDATE users SET {assignments} WHERE id = ? RETURNING {profile_columns}', params)
+                    user = cursor.fetchone()
+                else:
+                    cursor.execute(f'UPDATE users SET {assignments} WHERE id = ?', params)
+                    cursor.execute(f'SELECT {profile_columns} FROM users WHERE id = ?', (user_id,))
+                    user = cursor.fetchone()
+                conn.commit()
+        finally:
+            conn.close()
 
         if user:
-            # Update last login
-            self.update_last_login(user[0])
             return {
                 'id': user[0],
                 'full_name': user[1],
@@ -193,10 +532,37 @@ class DatabaseManager:
             }
         return None
 
+    def _rehash_password(self, user_id, stored_password, password):
+        """Replace an outdated hash, unless the password changed in the meantime"""
+        conn = self.get_connection()
+        try:
+            conn.execute('UPDATE users SET password = ? WHERE id = ? AND password = ?',
+                         (self.password_hasher.hash(password), user_id, stored_password))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def update_password(self, user_id, password):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('UPDATE users SET password = ? WHERE id = ?', (self.password_hasher.hash(password), user_id))
+        conn.commit()
+        conn.close()
+
     def update_last_login(self, user_id):
+        if self.write_buffer:
+            # Same format as CURRENT_TIMESTAMP (UTC)
+            now = datetime.now(timezone.utc)
+            self.write_buffer.put('users', user_id, {
+                'last_login': now.strftime('%Y-%m-%d %H:%M:%S'),
+                'last_login_epoch': int(now.timestamp())
+            })
+            return
+
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute('UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = ?', (user_id,))
+        cursor.execute('UPDATE users SET last_login = CURRENT_TIMESTAMP, last_login_epoch = ? WHERE id = ?',
+                       (int(time.time()), user_id))
         conn.commit()
         conn.close()
 
@@ -225,15 +591,86 @@ class DatabaseManager:
         conn.close()
 
     def get_all_users(self):
+        self._sync_pending_writes('users')
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        cursor.execute('SELECT * FROM users ORDER BY created_at DESC')
+        cursor.row_factory = row_factory(UserRow)
+        cursor.execute('''
+            SELECT id, full_name, age, gender, email, phone, location, emergency_contact,
+                   medical_history, role, created_at, last_login
+            FROM users ORDER BY created_at DESC
+        ''')
         users = cursor.fetchall()
         conn.close()
 
         return users
 
+    @staticmethod
+    def _user_filter(role=None, search=None):
+        """WHERE clause and parameters shared by list_users and count_users"""
+        conditions, params = [], []
+        if role:
+            conditions.append('role = ?')
+            params.append(role)
+        if search:
+            conditions.append('(full_name LIKE ? OR email LIKE ?)')
+            params.extend([f'%{search}%'] * 2)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        return where, params
+
+    def list_users(self, role=None, fields=USER_LIST_FIELDS, search=None, limit=None, offset=0):
+        """Users for list views, selecting only `fields` and filtering by role in SQL.
+
+        Rows are namedtuples with exactly the requested fields. medical_history
+        is not selectable here; fetch it with get_user_medical_history when a
+        user's details are opened. `search` matches name or email; `limit` and
+        `offset` select one page.
+        """
+        fields = tuple(fields)
+        unknown = set(fields) - set(USER_LIST_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown user fields: {', '.join(sorted(unknown))}")
+
+        self._sync_pending_writes('users')
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        where, params = self._user_filter(role, search)
+        query = f'SELECT {", ".join(fields)} FROM users{where} ORDER BY created_at DESC, id DESC'
+        if limit is not None:
+            query += ' LIMIT ? OFFSET ?'
+            params += [limit, offset]
+
+        cursor.row_factory = row_factory(user_projection(fields))
+        cursor.execute(query, params)
+        users = cursor.fetchall()
+        conn.close()
+
+        return users
+
+    def count_users(self, role=None, search=None):
+        self._sync_pending_writes('users')
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        where, params = self._user_filter(role, search)
+        cursor.execute(f'SELECT COUNT(*) FROM users{where}', params)
+        count = cursor.fetchone()[0]
+        conn.close()
+
+        return count
+
+    def get_user_medical_history(self, user_id):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT medical_history FROM users WHERE id = ?', (user_id,))
+        row = cursor.fetchone()
+        conn.close()
+
+        return row[0] if row else None
+
     def delete_user(self, user_id):
         """Delete a user and all related records"""
         conn = self.get_connection()
@@ -241,11 +678,23 @@ class DatabaseManager:
 
         try:
             # Delete related records first (cascade delete)
-            # Delete symptom analyses
+            # Delete symptom analyses and the assessments made on them
+            cursor.execute('''
+                DELETE FROM doctor_assessments
+                WHERE analysis_id IN (SELECT id FROM symptom_analyses WHERE patient_id = ?)
+            ''', (user_id,))
             cursor.execute('DELETE FROM symptom_analyses WHERE patient_id = ?', (user_id,))
             
-            # Delete appointments
+            # Delete appointments and give their slots back
+            cursor.execute('''
+                UPDATE appointment_slots
+                SET status = 'open', patient_id = NULL, held_until = NULL, appointment_id = NULL
+                WHERE patient_id = ?
+            ''', (user_id,))
             cursor.execute('DELETE FROM appointments WHERE patient_id = ?', (user_id,))
+
+            # A doctor's profile goes too; their patients' appointments and assessments stay
+            self._delete_doctors(cursor, 'SELECT id FROM doctors WHERE user_id = ?', (user_id,))
             
             # Delete the user
             cursor.execute('DELETE FROM users WHERE id = ?', (user_id,))
@@ -258,12 +707,53 @@ class DatabaseManager:
             conn.close()
             return False
 
+    @staticmethod
+    def _doctor_dependents(cursor, doctor_ids, params=()):
+        """Rows tied to the doctors selected by the `doctor_ids` subquery, as counts per kind"""
+        cursor.execute(f'''
+            SELECT (SELECT COUNT(*) FROM appointments WHERE doctor_id IN ({doctor_ids})),
+                   (SELECT COUNT(*) FROM appointments WHERE doctor_id IN ({doctor_ids}) AND status = 'scheduled'),
+                   (SELECT COUNT(*) FROM appointment_slots WHERE doctor_id IN ({doctor_ids})),
+                   (SELECT COUNT(*) FROM doctor_availability WHERE doctor_id IN ({doctor_ids})),
+                   (SELECT COUNT(*) FROM doctor_assessments WHERE doctor_id IN ({doctor_ids}))
+        ''', tuple(params) * 5)
+        appointments, cancelled, slots, availability, assessments = cursor.fetchone()
+        return {
+            'appointments_kept': appointments,
+            'appointments_cancelled': cancelled,
+            'slots_deleted': slots,
+            'availability_deleted': availability,
+            'assessments_kept': assessments
+        }
+
+    @staticmethod
+    def _delete_doctors(cursor, doctor_ids, params=()):
+        """Delete the doctors selected by the `doctor_ids` subquery with their slots and availability.
+
+        Appointments and assessments are patient history and are kept;
+        appointments still scheduled with these doctors are cancelled. Runs in
+        the caller's transaction and returns the number of doctors deleted.
+        """
+        cursor.execute(f'''
+            UPDATE appointments SET status = 'cancelled'
+            WHERE doctor_id IN ({doctor_ids}) AND status = 'scheduled'
+        ''', params)
+        for table in ('appointment_slots', 'doctor_availability'):
+            cursor.execute(f'DELETE FROM {table} WHERE doctor_id IN ({doctor_ids})', params)
+        cursor.execute(f'DELETE FROM doctors WHERE id IN ({doctor_ids})', params)
+        return cursor.rowcount
+
     # Doctor management methods
     def get_all_doctors(self):
+        self._sync_pending_writes('doctors')
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        cursor.execute('SELECT * FROM doctors ORDER BY name')
+        cursor.execute('''
+            SELECT id, name, specialty, rating, status, experience, location,
+                   languages, consultation_fee, available, user_id
+            FROM doctors ORDER BY name
+        ''')
         doctors = cursor.fetchall()
         conn.close()
 
@@ -280,12 +770,93 @@ class DatabaseManager:
                 'location': doc[6],
                 'languages': doc[7].split(',') if doc[7] else [],
                 'consultation_fee': doc[8],
-                'available': bool(doc[9])
+                'available': bool(doc[9]),
+                'user_id': doc[10]
             })
 
         return doctor_list
 
+    def _doctor_account_from_row(self, row):
+        return {
+            'user_id': row[0],
+            'full_name': row[1],
+            'age': row[2],
+            'gender': row[3],
+            'email': row[4],
+            'phone': row[5],
+            'location': row[6],
+            'last_login': row[7],
+            'id': row[8],
+            'name': row[9],
+            'specialty': row[10],
+            'rating': row[11],
+            'status': row[12],
+            'experience': row[13],
+            'languages': row[14].split(',') if row[14] else [],
+            'consultation_fee': row[15],
+            'available': bool(row[16])
+        }
+
+    def get_doctor_by_user_id(self, user_id):
+        """Get a doctor's record joined with their user account, or None"""
+        self._sync_pending_writes('users', 'doctors')
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f'''
+            SELECT {self._DOCTOR_ACCOUNT_COLUMNS}
+            FROM doctors d
+            JOIN users u ON u.id = d.user_id
+            WHERE d.user_id = ?
+            ORDER BY d.id LIMIT 1
+        ''', (user_id,))
+
+        row = cursor.fetchone()
+        conn.close()
+
+        return self._doctor_account_from_row(row) if row else None
+
+    def get_doctor_accounts(self, search=None):
+        """Get all doctor user accounts that have a doctors record, in one joined query"""
+        self._sync_pending_writes('users', 'doctors')
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        query = f'''
+            SELECT {self._DOCTOR_ACCOUNT_COLUMNS}
+            FROM doctors d
+            JOIN users u ON u.id = d.user_id
+            WHERE u.role = 'doctor'
+        '''
+        params = ()
+        if search:
+            query += ' AND (u.full_name LIKE ? OR u.email LIKE ?)'
+            params = (f'%{search}%', f'%{search}%')
+        query += ' ORDER BY u.full_name'
+
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [self._doctor_account_from_row(row) for row in rows]
+
+    def find_doctor_user_id(self, full_name):
+        """Get the id of the doctor user account with this name, or None"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT id FROM users WHERE role = 'doctor' AND full_name = ? ORDER BY id LIMIT 1",
+                       (full_name,))
+        row = cursor.fetchone()
+        conn.close()
+
+        return row[0] if row else None
+
     def update_doctor_status(self, doctor_id, status, available):
+        if self.write_buffer:
+            self.write_buffer.put('doctors', doctor_id, {'status': status, 'available': available})
+            return
+
         conn = self.get_connection()
         cursor = conn.cursor()
 
@@ -300,8 +871,8 @@ class DatabaseManager:
         cursor = conn.cursor()
 
         cursor.execute('''
-            INSERT INTO doctors (name, specialty, rating, status, experience, location, languages, consultation_fee, available)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO doctors (name, specialty, rating, status, experience, location, languages, consultation_fee, available, user_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             doctor_data['name'],
             doctor_data['specialty'],
@@ -311,7 +882,8 @@ class DatabaseManager:
             doctor_data['location'],
             ','.join(doctor_data['languages']),
             doctor_data['consultation_fee'],
-            doctor_data['available']
+            doctor_data['available'],
+            doctor_data.get('user_id')
         ))
 
         doctor_id = cursor.lastrowid
@@ -320,6 +892,7 @@ class DatabaseManager:
         return doctor_id
 
     def update_doctor(self, doctor_id, doctor_data):
+        self._sync_pending_writes('doctors')
         conn = self.get_connection()
         cursor = conn.cursor()
 
@@ -348,24 +921,41 @@ class DatabaseManager:
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        cursor.execute('''
-            INSERT INTO appointments (patient_id, doctor_id, appointment_date, appointment_time, reason, notes)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (patient_id, doctor_id, appointment_date, appointment_time, reason, notes))
+        try:
+            cursor.execute('''
+                INSERT INTO appointments (patient_id, doctor_id, appointment_date, appointment_time, reason, notes)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (patient_id, doctor_id, self._normalize_date(appointment_date),
+                  self._normalize_time(appointment_time), reason, notes))
 
-        appointment_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return appointment_id
+            appointment_id = cursor.lastrowid
+
+            # Take the matching slot too, so it stops showing as open; a patient
+            # holding it will find confirm_slot fails
+            cursor.execute('''
+                UPDATE appointment_slots
+                SET status = 'booked', patient_id = ?, held_until = NULL, appointment_id = ?
+                WHERE doctor_id = ? AND slot_date = ? AND slot_time = ? AND status != 'booked'
+            ''', (patient_id, appointment_id, doctor_id, self._normalize_date(appointment_date),
+                  self._normalize_time(appointment_time)))
+            conn.commit()
+            APPOINTMENTS_CREATED.inc(source='direct')
+            return appointment_id
+        except sqlite3.IntegrityError:
+            return None  # Doctor already booked at that date and time
+        finally:
+            conn.close()
 
     def get_user_appointments(self, user_id):
         conn = self.get_connection()
         cursor = conn.cursor()
 
+        cursor.row_factory = row_factory(PatientAppointmentRow)
         cursor.execute('''
-            SELECT a.*, d.name as doctor_name, d.specialty
+            SELECT a.id, a.doctor_id, a.appointment_date, a.appointment_time, a.status, a.reason,
+                   COALESCE(d.name, 'Former doctor') as doctor_name, COALESCE(d.specialty, '-') as specialty
             FROM appointments a
-            JOIN doctors d ON a.doctor_id = d.id
+            LEFT JOIN doctors d ON a.doctor_id = d.id
             WHERE a.patient_id = ?
             ORDER BY a.appointment_date DESC, a.appointment_time DESC
         ''', (user_id,))
@@ -375,31 +965,316 @@ class DatabaseManager:
 
         return appointments
 
-    def get_all_appointments(self):
+    def get_all_appointments(self, limit=None):
+        """Every appointment, latest date first; `limit` keeps only the first rows"""
+        return self.list_appointments(limit=limit)
+
+    def list_appointments(self, limit=None, offset=0):
+        """Appointments latest date first; `limit` and `offset` select one page"""
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT a.*, u.full_name as patient_name, d.name as doctor_name, d.specialty
+        query = '''
+            SELECT a.id, a.patient_id, a.doctor_id, a.appointment_date, a.appointment_time,
+                   a.status, a.reason, a.notes, a.created_at,
+                   u.full_name as patient_name, COALESCE(d.name, 'Former doctor') as doctor_name,
+                   COALESCE(d.specialty, '-') as specialty
             FROM appointments a
             JOIN users u ON a.patient_id = u.id
-            JOIN doctors d ON a.doctor_id = d.id
+            LEFT JOIN doctors d ON a.doctor_id = d.id
             ORDER BY a.appointment_date DESC, a.appointment_time DESC
+        '''
+        params = []
+        if limit is not None:
+            query += ' LIMIT ? OFFSET ?'
+            params += [limit, offset]
+
+        cursor.row_factory = row_factory(AppointmentRow)
+        cursor.execute(query, params)
+        appointments = cursor.fetchall()
+        conn.close()
+
+        return appointments
+
+    def count_appointments(self):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT COUNT(*)
+            FROM appointments a
+            JOIN users u ON a.patient_id = u.id
         ''')
+        count = cursor.fetchone()[0]
+        conn.close()
 
+        return count
+
+    def get_doctor_appointments(self, doctor_id, start_date, end_date, status=None):
+        """Get one doctor's appointments between two dates (inclusive), oldest first.
+
+        Rows are AppointmentRow, like get_all_appointments. The range is
+        served by idx_appointments_doctor_date_time, so the cost depends on
+        the appointments in range rather than on the whole table.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        query = '''
+            SELECT a.id, a.patient_id, a.doctor_id, a.appointment_date, a.appointment_time,
+                   a.status, a.reason, a.notes, a.created_at,
+                   u.full_name as patient_name, d.name as doctor_name, d.specialty
+            FROM appointments a
+            JOIN users u ON a.patient_id = u.id
+            JOIN doctors d ON a.doctor_id = d.id
+            WHERE a.doctor_id = ? AND a.appointment_date BETWEEN ? AND ?
+        '''
+        params = [doctor_id, self._normalize_date(start_date), self._normalize_date(end_date)]
+        if status:
+            query += ' AND a.status = ?'
+            params.append(status)
+        query += ' ORDER BY a.appointment_date, a.appointment_time'
+
+        cursor.row_factory = row_factory(AppointmentRow)
+        cursor.execute(query, params)
         appointments = cursor.fetchall()
         conn.close()
 
         return appointments
 
     def update_appointment_status(self, appointment_id, status):
+        """Set an appointment's status; returns False if it can't be reactivated.
+
+        A cancelled appointment gives its slot back, and one moved out of
+        'cancelled' takes it again. If the doctor has been booked at that
+        time in the meantime, the appointment stays cancelled.
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        cursor.execute('UPDATE appointments SET status = ? WHERE id = ?', (status, appointment_id))
+        try:
+            cursor.execute('''
+                SELECT patient_id, doctor_id, appointment_date, appointment_time, status
+                FROM appointments WHERE id = ?
+            ''', (appointment_id,))
+            appointment = cursor.fetchone()
+            if not appointment:
+                return False
+            patient_id, doctor_id, appointment_date, appointment_time, previous_status = appointment
+
+            try:
+                cursor.execute('UPDATE appointments SET status = ? WHERE id = ?', (status, appointment_id))
+            except sqlite3.IntegrityError:
+                return False  # Another live appointment has the doctor at that date and time
+
+            if status == 'cancelled':
+                cursor.execute('''
+                    UPDATE appointment_slots
+                    SET status = 'open', patient_id = NULL, held_until = NULL, appointment_id = NULL
+                    WHERE appointment_id = ?
+                ''', (appointment_id,))
+            elif previous_status == 'cancelled':
+                # Same as create_appointment: a patient holding the slot loses it
+                cursor.execute('''
+                    UPDATE appointment_slots
+                    SET status = 'booked', patient_id = ?, held_until = NULL, appointment_id = ?
+                    WHERE doctor_id = ? AND slot_date = ? AND slot_time = ? AND status != 'booked'
+                ''', (patient_id, appointment_id, doctor_id, appointment_date, appointment_time))
+
+            conn.commit()
+            return True
+        finally:
+            conn.close()
+
+    # Appointment booking methods
+    def set_doctor_availability(self, doctor_id, template):
+        """Replace a doctor's weekly template with (weekday, start_time, end_time, slot_minutes) rows"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('DELETE FROM doctor_availability WHERE doctor_id = ?', (doctor_id,))
+        cursor.executemany('''
+            INSERT INTO doctor_availability (doctor_id, weekday, start_time, end_time, slot_minutes)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(doctor_id,) + tuple(row) for row in template])
+        # Untaken future slots follow the new template; held and booked ones stay
+        cursor.execute('''
+            DELETE FROM appointment_slots
+            WHERE doctor_id = ? AND slot_date >= ? AND status = 'open'
+        ''', (doctor_id, datetime.now().date().isoformat()))
 
         conn.commit()
         conn.close()
+        self.materialize_slots(doctor_id, datetime.now().date(), days=self.SLOT_HORIZON_DAYS)
+
+    def get_doctor_availability(self, doctor_id):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT weekday, start_time, end_time, slot_minutes
+            FROM doctor_availability WHERE doctor_id = ?
+            ORDER BY weekday, start_time
+        ''', (doctor_id,))
+        template = cursor.fetchall()
+        conn.close()
+
+        return template or list(self.DEFAULT_AVAILABILITY)
+
+    def materialize_slots(self, doctor_id, start_date, days=14):
+        """Create the doctor's slots for a date range from their template; existing slots are kept"""
+        if isinstance(start_date, str):
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+
+        template = self.get_doctor_availability(doctor_id)
+        slots = []
+        for offset in range(days):
+            day = start_date + timedelta(days=offset)
+            for weekday, start_time, end_time, slot_minutes in template:
+                if weekday != day.weekday():
+                    continue
+                slot = datetime.combine(day, datetime.strptime(start_time, '%H:%M').time())
+                end = datetime.combine(day, datetime.strptime(end_time, '%H:%M').time())
+                while slot + timedelta(minutes=slot_minutes) <= end:
+                    slots.append((doctor_id, day.isoformat(), slot.strftime('%H:%M')))
+                    slot += timedelta(minutes=slot_minutes)
+        if not slots:
+            return 0
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.executemany('''
+            INSERT OR IGNORE INTO appointment_slots (doctor_id, slot_date, slot_time)
+            VALUES (?, ?, ?)
+        ''', slots)
+        created = cursor.rowcount
+
+        conn.commit()
+        conn.close()
+        return created
+
+    def materialize_all_slots(self, days=None):
+        """Create every doctor's slots from today to SLOT_HORIZON_DAYS ahead; run at startup"""
+        conn = self.get_connection()
+        doctor_ids = [row[0] for row in conn.execute('SELECT id FROM doctors')]
+        conn.close()
+
+        today = datetime.now().date()
+        return sum(self.materialize_slots(doctor_id, today, days=days or self.SLOT_HORIZON_DAYS)
+                   for doctor_id in doctor_ids)
+
+    def has_slots(self, doctor_id, slot_date):
+        """Whether slots were materialized for the doctor on a date, taken or not"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT 1 FROM appointment_slots WHERE doctor_id = ? AND slot_date = ? LIMIT 1
+        ''', (doctor_id, self._normalize_date(slot_date)))
+        found = cursor.fetchone() is not None
+        conn.close()
+
+        return found
+
+    def get_open_slots(self, doctor_id, slot_date):
+        """Get (slot_id, slot_time) pairs that can still be reserved on a date; a read only,
+        slots come from materialize_slots"""
+        if isinstance(slot_date, str):
+            slot_date = datetime.strptime(slot_date, '%Y-%m-%d').date()
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT id, slot_time FROM appointment_slots
+            WHERE doctor_id = ? AND slot_date = ?
+              AND (status = 'open' OR (status = 'held' AND held_until < ?))
+            ORDER BY slot_time
+        ''', (doctor_id, slot_date.isoformat(), int(time.time())))
+        slots = cursor.fetchall()
+        conn.close()
+
+        return slots
+
+    def reserve_slot(self, slot_id, patient_id, hold_seconds=300):
+        """Hold a slot for a patient; False if someone else got it first.
+
+        This is a single conditional UPDATE, so concurrent reservations for
+        the same slot are decided by SQLite and exactly one of them wins.
+        Expired holds can be taken over.
+        """
+        now = int(time.time())
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            UPDATE appointment_slots
+            SET status = 'held', patient_id = ?, held_until = ?
+            WHERE id = ? AND (status = 'open' OR (status = 'held' AND held_until < ?))
+        ''', (patient_id, now + hold_seconds, slot_id, now))
+        reserved = cursor.rowcount == 1
+
+        conn.commit()
+        conn.close()
+        return reserved
+
+    def confirm_slot(self, slot_id, patient_id, reason="", notes=""):
+        """Turn a patient's hold into an appointment; returns the appointment id or None"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+                UPDATE appointment_slots SET status = 'booked', held_until = NULL
+                WHERE id = ? AND status = 'held' AND patient_id = ?
+            ''', (slot_id, patient_id))
+            if cursor.rowcount != 1:
+                conn.rollback()
+                return None
+
+            cursor.execute('''
+                INSERT INTO appointments (patient_id, doctor_id, appointment_date, appointment_time, reason, notes)
+                SELECT patient_id, doctor_id, slot_date, slot_time, ?, ?
+                FROM appointment_slots WHERE id = ?
+            ''', (reason, notes, slot_id))
+            appointment_id = cursor.lastrowid
+
+            cursor.execute('UPDATE appointment_slots SET appointment_id = ? WHERE id = ?', (appointment_id, slot_id))
+            conn.commit()
+            APPOINTMENTS_CREATED.inc(source='slot')
+            return appointment_id
+        except sqlite3.IntegrityError:
+            # Booked outside the slot system (create_appointment) at the same time
+            conn.rollback()
+            return None
+        finally:
+            conn.close()
+
+    def release_slot(self, slot_id, patient_id):
+        """Give up a hold that hasn't been confirmed"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            UPDATE appointment_slots
+            SET status = 'open', patient_id = NULL, held_until = NULL
+            WHERE id = ? AND status = 'held' AND patient_id = ?
+        ''', (slot_id, patient_id))
+        released = cursor.rowcount == 1
+
+        conn.commit()
+        conn.close()
+        return released
+
+    def book_slot(self, slot_id, patient_id, reason="", notes=""):
+        """Reserve and confirm a slot in one go; returns the appointment id or None"""
+        if not self.reserve_slot(slot_id, patient_id):
+            return None
+        appointment_id = self.confirm_slot(slot_id, patient_id, reason, notes)
+        if appointment_id is None:
+            self.release_slot(slot_id, patient_id)
+        return appointment_id
 
     # Symptom analysis methods
     def add_symptom_analysis(self, patient_id, symptoms, analysis):
@@ -407,9 +1282,9 @@ class DatabaseManager:
         cursor = conn.cursor()
 
         cursor.execute('''
-            INSERT INTO symptom_analyses (patient_id, symptoms, analysis)
-            VALUES (?, ?, ?)
-        ''', (patient_id, symptoms, analysis))
+            INSERT INTO symptom_analyses (patient_id, symptoms, analysis, timestamp_epoch)
+            VALUES (?, ?, ?, ?)
+        ''', (patient_id, symptoms, analysis, int(time.time())))
 
         analysis_id = cursor.lastrowid
         conn.commit()
@@ -420,7 +1295,11 @@ class DatabaseManager:
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        cursor.execute('SELECT * FROM symptom_analyses WHERE patient_id = ? ORDER BY timestamp DESC', (user_id,))
+        cursor.row_factory = row_factory(AnalysisRow)
+        cursor.execute('''
+            SELECT id, patient_id, symptoms, analysis, timestamp
+            FROM symptom_analyses WHERE patient_id = ? ORDER BY timestamp_epoch DESC
+        ''', (user_id,))
 
         analyses = cursor.fetchall()
         conn.close()
@@ -432,12 +1311,13 @@ class DatabaseManager:
         conn = self.get_connection()
         cursor = conn.cursor()
 
+        cursor.row_factory = row_factory(PatientAnalysisRow)
         cursor.execute('''
             SELECT sa.id, sa.patient_id, sa.symptoms, sa.analysis, sa.timestamp,
                    u.full_name, u.age, u.gender, u.email
             FROM symptom_analyses sa
             JOIN users u ON sa.patient_id = u.id
-            ORDER BY sa.timestamp DESC
+            ORDER BY sa.timestamp_epoch DESC
         ''')
 
         analyses = cursor.fetchall()
@@ -445,17 +1325,82 @@ class DatabaseManager:
 
         return analyses
 
+    @staticmethod
+    def _analysis_filter(search=None, search_email=False):
+        """WHERE clause matching patient name and symptoms (or email), for analysis list queries"""
+        if not search:
+            return '', []
+        other = 'u.email' if search_email else 'sa.symptoms'
+        return f' WHERE (u.full_name LIKE ? OR {other} LIKE ?)', [f'%{search}%'] * 2
+
+    def list_symptom_analyses_with_patients(self, search=None, search_email=False, limit=None, offset=0):
+        """Like get_all_symptom_analyses_with_patients, without the analysis text.
+
+        The text is the bulk of each row; list views fetch it per analysis
+        with get_analysis_text when it is shown. `search` matches the patient
+        name and the symptoms (or the email with search_email); `limit` and
+        `offset` select one page.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        where, params = self._analysis_filter(search, search_email)
+        query = f'''
+            SELECT sa.id, sa.patient_id, sa.symptoms, sa.timestamp,
+                   u.full_name, u.age, u.gender, u.email
+            FROM symptom_analyses sa
+            JOIN users u ON sa.patient_id = u.id{where}
+            ORDER BY sa.timestamp_epoch DESC, sa.id DESC
+        '''
+        if limit is not None:
+            query += ' LIMIT ? OFFSET ?'
+            params += [limit, offset]
+
+        cursor.row_factory = row_factory(PatientAnalysisSummaryRow)
+        cursor.execute(query, params)
+
+        analyses = cursor.fetchall()
+        conn.close()
+
+        return analyses
+
+    def count_symptom_analyses(self, search=None, search_email=False):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        where, params = self._analysis_filter(search, search_email)
+        cursor.execute(f'''
+            SELECT COUNT(*)
+            FROM symptom_analyses sa
+            JOIN users u ON sa.patient_id = u.id{where}
+        ''', params)
+        count = cursor.fetchone()[0]
+        conn.close()
+
+        return count
+
+    def get_analysis_text(self, analysis_id):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT analysis FROM symptom_analyses WHERE id = ?', (analysis_id,))
+        row = cursor.fetchone()
+        conn.close()
+
+        return row[0] if row else None
+
     def get_symptom_analytics_data(self):
         """Get symptom analysis data with patient demographics for analytics"""
         conn = self.get_connection()
         cursor = conn.cursor()
 
+        cursor.row_factory = row_factory(AnalyticsRow)
         cursor.execute('''
             SELECT sa.id, sa.symptoms, sa.analysis, sa.timestamp,
                    u.age, u.gender
             FROM symptom_analyses sa
             JOIN users u ON sa.patient_id = u.id
-            ORDER BY sa.timestamp DESC
+            ORDER BY sa.timestamp_epoch DESC
         ''')
 
         analyses = cursor.fetchall()
@@ -463,8 +1408,179 @@ class DatabaseManager:
 
         return analyses
 
+    # Doctor assessment methods
+    def save_assessments(self, assessments):
+        """Insert or update many (analysis_id, doctor_id, assessment) rows in one transaction"""
+        epoch = int(time.time())
+        rows = [(analysis_id, doctor_id, text, epoch) for analysis_id, doctor_id, text in assessments]
+        if not rows:
+            return 0
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.executemany('''
+            INSERT INTO doctor_assessments (analysis_id, doctor_id, assessment, updated_at, updated_epoch)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?)
+            ON CONFLICT (analysis_id, doctor_id) DO UPDATE SET
+                assessment = excluded.assessment,
+                updated_at = excluded.updated_at,
+                updated_epoch = excluded.updated_epoch
+        ''', rows)
+
+        conn.commit()
+        conn.close()
+        return len(rows)
+
+    def save_assessment(self, analysis_id, doctor_id, assessment):
+        return self.save_assessments([(analysis_id, doctor_id, assessment)]) == 1
+
+    def get_assessment(self, analysis_id, doctor_id):
+        """The given doctor's assessment of an analysis, or None"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.row_factory = row_factory(AssessmentRow)
+        cursor.execute('''
+            SELECT da.id, da.analysis_id, da.doctor_id, COALESCE(d.name, 'Former doctor'), da.assessment, da.updated_at
+            FROM doctor_assessments da
+            LEFT JOIN doctors d ON da.doctor_id = d.id
+            WHERE da.analysis_id = ? AND da.doctor_id = ?
+        ''', (analysis_id, doctor_id))
+
+        assessment = cursor.fetchone()
+        conn.close()
+
+        return assessment
+
+    def get_latest_assessments(self, analysis_ids):
+        """Most recently updated assessment for each analysis, as {analysis_id: AssessmentRow}.
+
+        One query for a whole page of analyses; analyses without an
+        assessment are left out of the result.
+        """
+        analysis_ids = list(analysis_ids)
+        if not analysis_ids:
+            return {}
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        placeholders = ', '.join('?' * len(analysis_ids))
+        cursor.row_factory = row_factory(AssessmentRow)
+        cursor.execute(f'''
+            SELECT id, analysis_id, doctor_id, doctor_name, assessment, updated_at
+            FROM (
+                SELECT da.id, da.analysis_id, da.doctor_id, COALESCE(d.name, 'Former doctor') AS doctor_name,
+                       da.assessment, da.updated_at,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY da.analysis_id ORDER BY da.updated_epoch DESC, da.id DESC
+                       ) AS position
+                FROM doctor_assessments da
+                LEFT JOIN doctors d ON da.doctor_id = d.id
+                WHERE da.analysis_id IN ({placeholders})
+            )
+            WHERE position = 1
+        ''', analysis_ids)
+
+        latest = {row.analysis_id: row for row in cursor.fetchall()}
+        conn.close()
+
+        return latest
+
     # Analytics methods
+    def count_analyses_in_window(self, window):
+        """Number of symptom analyses in a named time window (see time_window)"""
+        start, end = self.time_window(window)
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT COUNT(*) FROM symptom_analyses WHERE timestamp_epoch >= ? AND timestamp_epoch < ?',
+                       (start, end))
+        count = cursor.fetchone()[0]
+        conn.close()
+
+        return count
+
+    def count_active_users(self, window):
+        """Number of users who logged in during a named time window"""
+        self._sync_pending_writes('users')
+        start, end = self.time_window(window)
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT COUNT(*) FROM users WHERE last_login_epoch >= ? AND last_login_epoch < ?', (start, end))
+        count = cursor.fetchone()[0]
+        conn.close()
+
+        return count
+
+    def get_analysis_demographics(self):
+        """(age, gender, count) of the patients behind the symptom analyses, one row per age and gender"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT u.age, u.gender, COUNT(*)
+            FROM symptom_analyses sa
+            JOIN users u ON sa.patient_id = u.id
+            GROUP BY u.age, u.gender
+        ''')
+        demographics = cursor.fetchall()
+        conn.close()
+
+        return demographics
+
+    def count_analyses_by_keywords(self, categories):
+        """{category: count} of analyses whose text contains one of its keywords (case-insensitive).
+
+        `categories` maps each category to its keywords and is tried in order;
+        analyses matching none count as 'Unknown' and ones without text are
+        left out. Matching runs in SQLite, so the texts never leave it.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cases, params = [], []
+        for category, keywords in categories.items():
+            cases.append('WHEN ' + ' OR '.join(['analysis LIKE ?'] * len(keywords)) + ' THEN ?')
+            params += [f'%{keyword}%' for keyword in keywords] + [category]
+        cursor.execute(f'''
+            SELECT CASE {' '.join(cases)} ELSE 'Unknown' END AS category, COUNT(*)
+            FROM symptom_analyses
+            WHERE analysis IS NOT NULL AND analysis != ''
+            GROUP BY category
+        ''', params)
+        counts = dict.fromkeys(list(categories) + ['Unknown'], 0)
+        counts.update(cursor.fetchall())
+        conn.close()
+
+        return counts
+
+    def get_analysis_counts_by_day(self, window=None):
+        """(YYYY-MM-DD, count) pairs of symptom analyses per local day, oldest first"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        query = '''
+            SELECT date(timestamp_epoch, 'unixepoch', 'localtime') AS day, COUNT(*)
+            FROM symptom_analyses
+            WHERE timestamp_epoch IS NOT NULL
+        '''
+        params = ()
+        if window:
+            query += ' AND timestamp_epoch >= ? AND timestamp_epoch < ?'
+            params = self.time_window(window)
+        query += ' GROUP BY day ORDER BY day'
+
+        cursor.execute(query, params)
+        counts = cursor.fetchall()
+        conn.close()
+
+        return counts
+
     def get_stats(self):
+        self._sync_pending_writes('users', 'doctors')
         conn = self.get_connection()
         cursor = conn.cursor()
 
@@ -473,7 +1589,8 @@ class DatabaseManager:
         total_users = cursor.fetchone()[0]
 
         # Get active today (users who logged in today)
-        cursor.execute('SELECT COUNT(*) FROM users WHERE DATE(last_login) = DATE("now")')
+        start, end = self.time_window('today')
+        cursor.execute('SELECT COUNT(*) FROM users WHERE last_login_epoch >= ? AND last_login_epoch < ?', (start, end))
         active_today = cursor.fetchone()[0]
 
         cursor.execute('SELECT COUNT(*) FROM doctors WHERE available = 1')
@@ -494,3 +1611,196 @@ class DatabaseManager:
             'total_appointments': total_appointments,
             'total_analyses': total_analyses
         }
+
+    # Notification outbox methods
+    def enqueue_notification(self, recipient, subject, body, transport='email'):
+        """Add a message to the outbox; delivery happens on the dispatcher thread"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            INSERT INTO notification_outbox (transport, recipient, subject, body, next_attempt_epoch)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (transport, recipient, subject, body, int(time.time())))
+
+        notification_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return notification_id
+
+    def claim_notifications(self, limit=50, lease_seconds=300, max_attempts=None):
+        """Claim up to `limit` due messages for delivery.
+
+        Claimed rows are marked 'sending' with a lease and count as an
+        attempt; if the process dies before reporting back, they become due
+        again when the lease expires. A message whose lease expired after
+        `max_attempts` attempts is marked 'failed' instead, so one that
+        keeps taking the process down stops being retried. Returns a list of
+        dicts ordered by transport so each batch can reuse one connection;
+        'attempts' includes this one.
+        """
+        now = int(time.time())
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            if max_attempts is not None:
+                cursor.execute('''
+                    UPDATE notification_outbox
+                    SET status = 'failed', last_error = 'Delivery did not finish within its lease'
+                    WHERE status = 'sending' AND next_attempt_epoch <= ? AND attempts >= ?
+                ''', (now, max_attempts))
+            if sqlite3.sqlite_version_info >= (3, 35, 0):
+                cursor.execute('''
+                    UPDATE notification_outbox
+                    SET status = 'sending', next_attempt_epoch = ?, attempts = attempts + 1
+                    WHERE id IN (
+                        SELECT id FROM notification_outbox
+                        WHERE status IN ('pending', 'sending') AND next_attempt_epoch <= ?
+                        ORDER BY next_attempt_epoch, id
+                        LIMIT ?
+                    )
+                    RETURNING id, transport, recipient, subject, body, attempts
+                ''', (now + lease_seconds, now, limit))
+                rows = cursor.fetchall()
+            else:
+                # No RETURNING: pick the rows, then lease them; BEGIN IMMEDIATE
+                # holds the write lock, so no other worker can claim them between
+                cursor.execute('''
+                    SELECT id, transport, recipient, subject, body, attempts
+                    FROM notification_outbox
+                    WHERE status IN ('pending', 'sending') AND next_attempt_epoch <= ?
+                    ORDER BY next_attempt_epoch, id
+                    LIMIT ?
+                ''', (now, limit))
+                rows = cursor.fetchall()
+                cursor.executemany('''
+                    UPDATE notification_outbox SET status = 'sending', next_attempt_epoch = ?, attempts = attempts + 1
+                    WHERE id = ?
+                ''', [(now + lease_seconds, row[0]) for row in rows])
+                rows = [row[:5] + (row[5] + 1,) for row in rows]
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        claimed = [
+            {'id': row[0], 'transport': row[1], 'recipient': row[2],
+             'subject': row[3], 'body': row[4], 'attempts': row[5]}
+            for row in rows
+        ]
+        claimed.sort(key=lambda message: (message['transport'], message['id']))
+        return claimed
+
+    def mark_notifications_sent(self, notification_ids):
+        notification_ids = list(notification_ids)
+        if not notification_ids:
+            return
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.executemany('''
+            UPDATE notification_outbox
+            SET status = 'sent', last_error = NULL, sent_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', [(notification_id,) for notification_id in notification_ids])
+
+        conn.commit()
+        conn.close()
+
+    def mark_notification_failed(self, notification_id, error, retry_at=None):
+        """Record a failed attempt (counted when it was claimed); retry at epoch `retry_at`, or give up when it is None"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        if retry_at is None:
+            cursor.execute('''
+                UPDATE notification_outbox
+                SET status = 'failed', last_error = ?
+                WHERE id = ?
+            ''', (error, notification_id))
+        else:
+            cursor.execute('''
+                UPDATE notification_outbox
+                SET status = 'pending', last_error = ?, next_attempt_epoch = ?
+                WHERE id = ?
+            ''', (error, int(retry_at), notification_id))
+
+        conn.commit()
+        conn.close()
+
+    def get_notification_counts(self):
+        """Number of outbox messages per status"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT status, COUNT(*) FROM notification_outbox GROUP BY status')
+        counts = dict(cursor.fetchall())
+        conn.close()
+
+        return counts
+
+    # Maintenance methods
+    def reconcile_orphaned_doctors(self, dry_run=False):
+        """Remove doctors that don't have a corresponding doctor user account.
+
+        Orphans are found with a single anti-join and deleted set-based inside
+        one transaction, so the number of round trips does not grow with the
+        size of the directory. Their slots and availability go with them;
+        their appointments and assessments are patient history and stay, with
+        scheduled appointments cancelled. Returns a JSON-serialisable report
+        whose 'affected' counts cover those rows; with dry_run=True nothing
+        is changed.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        orphan_filter = '''
+            NOT EXISTS (
+                SELECT 1 FROM users u
+                WHERE u.id = d.user_id AND u.role = 'doctor'
+            )
+        '''
+
+        try:
+            # Take the write lock up front so the report and the delete see the same rows
+            cursor.execute('BEGIN IMMEDIATE')
+
+            cursor.execute('''
+                SELECT (SELECT COUNT(*) FROM doctors),
+                       (SELECT COUNT(*) FROM users WHERE role = 'doctor')
+            ''')
+            total_doctors, doctor_users = cursor.fetchone()
+
+            cursor.execute(f'SELECT d.id, d.name FROM doctors d WHERE {orphan_filter} ORDER BY d.id')
+            orphaned = [{'id': row[0], 'name': row[1]} for row in cursor.fetchall()]
+            orphan_ids = f'SELECT d.id FROM doctors d WHERE {orphan_filter}'
+            affected = self._doctor_dependents(cursor, orphan_ids)
+
+            deleted = 0
+            if orphaned and not dry_run:
+                deleted = self._delete_doctors(cursor, orphan_ids)
+                conn.commit()
+            else:
+                conn.rollback()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        return {
+            'checked_at': datetime.now().isoformat(timespec='seconds'),
+            'dry_run': dry_run,
+            'total_doctors': total_doctors,
+            'doctor_users': doctor_users,
+            'orphaned': orphaned,
+            # What deleting the orphans does (or, in a dry run, would do) to related rows
+            'affected': affected,
+            'deleted': deleted,
+            'remaining': total_doctors - deleted
+        }
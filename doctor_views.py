@@ -0,0 +1,478 @@
+import streamlit as st
+from datetime import datetime, timedelta
+from components import record_list
+from notifications import get_dispatcher
+from page_metrics import instrument_page
+
+@instrument_page
+def show_doctor_dashboard():
+    st.markdown("### 👨‍⚕️ Doctor Dashboard")
+    st.write("Manage your patients, view symptom analyses, and provide medical consultations.")
+
+    user_info = st.session_state.user_info
+    doctor_id = user_info.get('patient_id')
+
+    # Doctor info display
+    st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
+    st.subheader("👤 Doctor Profile")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write(f"**Name:** {user_info.get('full_name', 'N/A')}")
+        st.write(f"**Specialty:** {user_info.get('specialty', 'N/A')}")
+        st.write(f"**Experience:** {user_info.get('experience', 'N/A')}")
+    with col2:
+        st.write(f"**Location:** {user_info.get('location', 'N/A')}")
+        st.write(f"**Languages:** {', '.join(user_info.get('languages', []))}")
+        st.write(f"**Consultation Fee:** ₱{user_info.get('consultation_fee', 0)}")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Navigation buttons
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        if st.button("📊 Patient Symptoms", use_container_width=True):
+            st.session_state.doctor_section = 'symptoms'
+            st.rerun()
+
+    with col2:
+        if st.button("👥 Patient Records", use_container_width=True):
+            st.session_state.doctor_section = 'records'
+            st.rerun()
+
+    with col3:
+        if st.button("📅 Appointments", use_container_width=True):
+            st.session_state.doctor_section = 'appointments'
+            st.rerun()
+
+    with col4:
+        if st.button("⚙️ Doctor Profile", use_container_width=True):
+            st.session_state.doctor_section = 'settings'
+            st.rerun()
+
+    # Initialize doctor section
+    if 'doctor_section' not in st.session_state:
+        st.session_state.doctor_section = 'symptoms'
+
+    # Display selected section
+    if st.session_state.doctor_section == 'symptoms':
+        show_doctor_symptoms()
+    elif st.session_state.doctor_section == 'records':
+        show_doctor_records()
+    elif st.session_state.doctor_section == 'appointments':
+        show_doctor_appointments()
+    elif st.session_state.doctor_section == 'settings':
+        show_doctor_settings()
+
+    # Logout button
+    st.markdown("---")
+    if st.button("🚪 Logout", use_container_width=True):
+        st.session_state.user_logged_in = False
+        st.session_state.current_screen = 'login_signup'
+        st.session_state.user_info = {}
+        st.rerun()
+
+@instrument_page
+def show_doctor_symptoms():
+    st.markdown("#### 📊 Patient Symptom Analyses")
+    st.write("Review and provide medical advice on patient symptom analyses.")
+
+    db = st.session_state.db_manager
+    doctor_record = db.get_doctor_by_user_id(st.session_state.user_info.get('patient_id'))
+    total_analyses = db.count_symptom_analyses()
+
+    if total_analyses:
+        st.write(f"Total Symptom Analyses: {total_analyses}")
+
+        # Search filter (applied in the database)
+        search_term = st.text_input("🔍 Search by patient name or symptoms...")
+        matching = db.count_symptom_analyses(search=search_term) if search_term else total_analyses
+
+        # Latest assessments are loaded with each page, in one query
+        page_assessments = {}
+
+        def fetch_page(limit, offset):
+            rows = db.list_symptom_analyses_with_patients(search=search_term, limit=limit, offset=offset)
+            page_assessments.update(db.get_latest_assessments(row.id for row in rows))
+            return rows
+
+        def summarize(a):
+            latest = page_assessments.get(a.id)
+            return {
+                "Patient": a.full_name,
+                "Symptoms": a.symptoms[:60],
+                "Date": a.timestamp,
+                "Assessed by": latest.doctor_name if latest else "-"
+            }
+
+        # Summary table; only the selected analysis gets a detail panel
+        analysis = record_list(
+            "doctor_symptoms",
+            matching,
+            fetch_page,
+            summarize,
+            lambda a: f"{a.full_name} - {a.timestamp}"
+        )
+        if not matching:
+            st.info("No analyses match your search.")
+
+        if analysis:
+            st.markdown(f"##### Patient: {analysis.full_name} - {analysis.timestamp}")
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.markdown("**Patient Information**")
+                st.write(f"**Name:** {analysis.full_name}")
+                st.write(f"**Age:** {analysis.age}")
+                st.write(f"**Gender:** {analysis.gender}")
+                st.write(f"**Email:** {analysis.email}")
+                st.write(f"**Patient ID:** {analysis.patient_id}")
+
+            with col2:
+                st.markdown("**Analysis Information**")
+                st.write(f"**Date:** {analysis.timestamp}")
+                st.write(f"**Analysis ID:** {analysis.id}")
+
+            st.markdown("---")
+            st.markdown("**Symptoms Reported:**")
+            st.info(analysis.symptoms)
+
+            st.markdown("**AI Analysis:**")
+            st.success(db.get_analysis_text(analysis.id))
+
+            latest = page_assessments.get(analysis.id)
+            if latest and (not doctor_record or latest.doctor_id != doctor_record['id']):
+                st.markdown(f"**Latest Assessment ({latest.doctor_name}, {latest.updated_at}):**")
+                st.write(latest.assessment)
+
+            if not doctor_record:
+                st.error("Doctor record not found. Please contact support.")
+                return
+
+            # Doctor's assessment, stored in the database
+            st.markdown("**Your Medical Assessment:**")
+            own_assessment = db.get_assessment(analysis.id, doctor_record['id'])
+
+            # One text area for the single detail panel; a new selection loads that analysis' saved text
+            if st.session_state.get('assessment_analysis_id') != analysis.id:
+                st.session_state.assessment_analysis_id = analysis.id
+                st.session_state.assessment_text = own_assessment.assessment if own_assessment else ""
+
+            doctor_comment = st.text_area(
+                "Add your professional assessment and recommendations:",
+                key="assessment_text",
+                height=100
+            )
+            if own_assessment:
+                st.caption(f"Last saved {own_assessment.updated_at}")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("💾 Save Assessment", key="save_assessment"):
+                    if doctor_comment.strip():
+                        db.save_assessment(analysis.id, doctor_record['id'], doctor_comment.strip())
+                        st.success("Assessment saved successfully!")
+                        st.rerun()
+                    else:
+                        st.error("Please write an assessment before saving.")
+
+            with col2:
+                if st.button("📧 Send to Patient", key="send_assessment"):
+                    if not doctor_comment.strip():
+                        st.error("Please write an assessment before sending.")
+                    elif not analysis.email:
+                        st.error("This patient has no email address on file.")
+                    else:
+                        # Saved and queued here; the dispatcher thread does the actual sending
+                        db.save_assessment(analysis.id, doctor_record['id'], doctor_comment.strip())
+                        db.enqueue_notification(
+                            analysis.email,
+                            f"Your MediConnect assessment from {doctor_record['name']}",
+                            f"Dear {analysis.full_name},\n\n"
+                            f"{doctor_record['name']} has reviewed the symptoms you reported on {analysis.timestamp}:\n"
+                            f"{analysis.symptoms}\n\n"
+                            f"Assessment:\n{doctor_comment.strip()}\n\n"
+                            f"This message was sent from MediConnect. Please book a consultation if your symptoms persist."
+                        )
+                        get_dispatcher(db).wakeup()
+                        st.success(f"Assessment queued for delivery to {analysis.email}.")
+    else:
+        st.info("No patient symptom analyses available yet.")
+
+@instrument_page
+def show_doctor_records():
+    st.markdown("#### 👥 Patient Records Management")
+    st.write("View and manage patient medical records.")
+
+    db = st.session_state.db_manager
+    total_patients = db.count_users(role='patient')
+
+    if total_patients:
+        st.write(f"Total Patients: {total_patients}")
+
+        # Search filter (applied in the database)
+        search_term = st.text_input("🔍 Search patients by name or email...")
+        matching = db.count_users(role='patient', search=search_term) if search_term else total_patients
+
+        # Summary table; only the selected patient gets a detail panel
+        patient = record_list(
+            "doctor_records",
+            matching,
+            lambda limit, offset: db.list_users(role='patient', search=search_term, limit=limit, offset=offset),
+            lambda p: {"Name": p.full_name, "Email": p.email, "Age": p.age, "Location": p.location},
+            lambda p: f"{p.full_name} (ID: {p.id})"
+        )
+        if not matching:
+            st.info("No patients match your search.")
+
+        if patient:
+            st.markdown(f"##### Patient: {patient.full_name} (ID: {patient.id})")
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.write(f"**Name:** {patient.full_name}")
+                st.write(f"**Age:** {patient.age}")
+                st.write(f"**Gender:** {patient.gender}")
+                st.write(f"**Email:** {patient.email}")
+                st.write(f"**Phone:** {patient.phone if patient.phone else 'N/A'}")
+
+            with col2:
+                st.write(f"**Location:** {patient.location}")
+                st.write(f"**Emergency Contact:** {patient.emergency_contact if patient.emergency_contact else 'N/A'}")
+                st.write(f"**Registered:** {patient.created_at if patient.created_at else 'N/A'}")
+                st.write(f"**Last Login:** {patient.last_login if patient.last_login else 'Never'}")
+
+            medical_history = db.get_user_medical_history(patient.id)
+            if medical_history:
+                st.write(f"**Medical History:** {medical_history}")
+
+            # Get patient's symptom analyses (newest first)
+            patient_analyses = db.get_user_analyses(patient.id)
+            if patient_analyses:
+                st.markdown("**Recent Symptom Analyses:**")
+                for analysis in patient_analyses[:3]:  # Show last 3
+                    st.write(f"• {analysis.analysis[:50]}... ({analysis.timestamp.split()[0]})")
+
+            # Get patient's appointments
+            patient_appointments = db.get_user_appointments(patient.id)
+            if patient_appointments:
+                st.markdown("**Recent Appointments:**")
+                for appt in patient_appointments[:3]:  # Show last 3
+                    st.write(f"• {appt.doctor_name} - {appt.specialty} ({appt.appointment_date})")
+    else:
+        st.info("No patients in the system yet.")
+
+@instrument_page
+def show_doctor_appointments():
+    st.markdown("#### 📅 Appointment Management")
+    st.write("View and manage your appointments with patients.")
+
+    doctor_record = st.session_state.db_manager.get_doctor_by_user_id(st.session_state.user_info.get('patient_id'))
+    if not doctor_record:
+        st.error("Doctor record not found. Please contact support.")
+        return
+
+    # Calendar range and status filter
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        view = st.selectbox("View", ["Day", "Week"])
+    with col2:
+        anchor_date = st.date_input("Date", value=datetime.now().date())
+    with col3:
+        status_filter = st.selectbox("Filter by Status", ["All", "Scheduled", "Completed", "Cancelled"])
+
+    if view == "Week":
+        start_date = anchor_date - timedelta(days=anchor_date.weekday())
+        end_date = start_date + timedelta(days=6)
+    else:
+        start_date = end_date = anchor_date
+
+    filtered_appointments = st.session_state.db_manager.get_doctor_appointments(
+        doctor_record['id'], start_date, end_date,
+        status=None if status_filter == "All" else status_filter.lower()
+    )
+
+    if filtered_appointments:
+        st.write(f"Appointments {start_date} – {end_date}: {len(filtered_appointments)}")
+
+        # Display appointments
+        for appt in filtered_appointments:
+            with st.expander(f"Appointment: {appt.patient_name} - {appt.appointment_date} {appt.appointment_time}"):
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.write(f"**Patient:** {appt.patient_name}")
+                    st.write(f"**Date:** {appt.appointment_date}")
+                    st.write(f"**Time:** {appt.appointment_time}")
+                    st.write(f"**Status:** {appt.status.title()}")
+
+                with col2:
+                    st.write(f"**Doctor:** {appt.doctor_name}")
+                    st.write(f"**Specialty:** {appt.specialty}")
+                    st.write(f"**Reason:** {appt.reason if appt.reason else 'N/A'}")
+
+                if appt.notes:
+                    st.write(f"**Notes:** {appt.notes}")
+
+                # Status update buttons
+                if appt.status == 'scheduled':
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.button("✅ Mark Completed", key=f"complete_{appt.id}"):
+                            st.session_state.db_manager.update_appointment_status(appt.id, 'completed')
+                            st.success("Appointment marked as completed!")
+                            st.rerun()
+                    with col2:
+                        if st.button("❌ Cancel", key=f"cancel_{appt.id}"):
+                            st.session_state.db_manager.update_appointment_status(appt.id, 'cancelled')
+                            st.success("Appointment cancelled!")
+                            st.rerun()
+    else:
+        st.info("No appointments in this period.")
+
+@instrument_page
+def show_doctor_settings():
+    st.markdown("#### ⚙️ Doctor Profile")
+    st.write("Update your profile and availability settings.")
+
+    user_info = st.session_state.user_info
+    doctor_id = user_info.get('patient_id')
+
+    # Get doctor record from doctors table
+    doctor_record = st.session_state.db_manager.get_doctor_by_user_id(doctor_id)
+
+    if doctor_record:
+        with st.form("doctor_settings_form"):
+            st.markdown("**Basic Information**")
+            col1, col2 = st.columns(2)
+
+            with col1:
+                full_name = st.text_input("Full Name", value=user_info.get('full_name', ''))
+                age = st.number_input("Age", min_value=18, max_value=120, value=user_info.get('age', 30))
+                gender = st.selectbox("Gender", ["Male", "Female", "Other", "Prefer not to say"],
+                                    index=["Male", "Female", "Other", "Prefer not to say"].index(user_info.get('gender', 'Male')) if user_info.get('gender') in ["Male", "Female", "Other", "Prefer not to say"] else 0)
+
+            with col2:
+                email = st.text_input("Email Address", value=user_info.get('email', ''))
+                phone = st.text_input("Phone Number", value=user_info.get('phone', ''))
+                location = st.text_input("Location", value=user_info.get('location', ''))
+
+            st.markdown("**Professional Information**")
+            col3, col4 = st.columns(2)
+
+            with col3:
+                specialty = st.selectbox("Medical Specialty", [
+                    "General Medicine", "Cardiology", "Pediatrics", "Dermatology",
+                    "Orthopedics", "Gynecology", "Neurology", "Psychiatry", "Ophthalmology",
+                    "Internal Medicine", "Surgery", "Endocrinology", "Urology", "Dentistry",
+                    "Emergency Medicine", "Radiology", "Anesthesiology", "Pathology", "Other"
+                ], index=[
+                    "General Medicine", "Cardiology", "Pediatrics", "Dermatology",
+                    "Orthopedics", "Gynecology", "Neurology", "Psychiatry", "Ophthalmology",
+                    "Internal Medicine", "Surgery", "Endocrinology", "Urology", "Dentistry",
+                    "Emergency Medicine", "Radiology", "Anesthesiology", "Pathology", "Other"
+                ].index(doctor_record['specialty']) if doctor_record['specialty'] in [
+                    "General Medicine", "Cardiology", "Pediatrics", "Dermatology",
+                    "Orthopedics", "Gynecology", "Neurology", "Psychiatry", "Ophthalmology",
+                    "Internal Medicine", "Surgery", "Endocrinology", "Urology", "Dentistry",
+                    "Emergency Medicine", "Radiology", "Anesthesiology", "Pathology", "Other"
+                ] else 0)
+
+                experience = st.text_input("Years of Experience", value=doctor_record['experience'])
+
+            with col4:
+                languages = st.multiselect("Languages Spoken", ["English", "Tagalog", "Visayan", "Mandarin", "Spanish", "Hindi", "Arabic", "Korean", "Japanese", "German", "Other"],
+                                         default=doctor_record['languages'])
+                consultation_fee = st.number_input("Consultation Fee (₱)", min_value=0, value=int(doctor_record['consultation_fee']), step=50)
+
+            # Availability settings
+            st.markdown("**Availability Settings**")
+            current_status = doctor_record['status']
+            status_options = ["available", "online", "offline"]
+            status_index = status_options.index(current_status) if current_status in status_options else 0
+            new_status = st.selectbox("Current Status", status_options, index=status_index)
+
+            available = st.checkbox("Available for new consultations", value=doctor_record['available'])
+
+            submitted = st.form_submit_button("💾 Update Profile")
+
+            if submitted:
+                # Update user table
+                user_update = {
+                    'full_name': full_name,
+                    'age': age,
+                    'gender': gender,
+                    'email': email,
+                    'phone': phone,
+                    'location': location
+                }
+                st.session_state.db_manager.update_user(doctor_id, user_update)
+
+                # Update doctors table
+                doctor_update = {
+                    'name': full_name,
+                    'specialty': specialty,
+                    'experience': experience,
+                    'location': location,
+                    'languages': languages,
+                    'consultation_fee': consultation_fee,
+                    'status': new_status,
+                    'available': available
+                }
+                # Note: We'll need to add an update method to DatabaseManager for doctors
+                # For now, we'll update the session state
+                st.session_state.user_info.update(user_update)
+                st.session_state.user_info.update({
+                    'specialty': specialty,
+                    'experience': experience,
+                    'languages': languages,
+                    'consultation_fee': consultation_fee
+                })
+
+                st.success("Profile updated successfully!")
+                st.rerun()
+
+        show_availability_form(doctor_record['id'])
+    else:
+        st.error("Doctor record not found. Please contact support.")
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+SLOT_LENGTHS = [15, 20, 30, 45, 60]
+
+def show_availability_form(doctor_id):
+    """Weekly consultation hours; saving regenerates the doctor's open slots"""
+    template = st.session_state.db_manager.get_doctor_availability(doctor_id)
+    # The form edits one block of hours per day; the first block of each day is shown
+    hours = {}
+    for weekday, start_time, end_time, slot_minutes in template:
+        hours.setdefault(weekday, (start_time, end_time))
+    current_length = template[0][3] if template else 30
+
+    with st.form("doctor_availability_form"):
+        st.markdown("**Weekly Consultation Hours**")
+        slot_minutes = st.selectbox("Appointment length (minutes)", SLOT_LENGTHS,
+                                    index=SLOT_LENGTHS.index(current_length) if current_length in SLOT_LENGTHS else 2)
+
+        new_template = []
+        for weekday, day in enumerate(WEEKDAYS):
+            start_time, end_time = hours.get(weekday, ('09:00', '17:00'))
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                working = st.checkbox(day, value=weekday in hours, key=f"availability_day_{weekday}")
+            with col2:
+                start = st.time_input("From", value=datetime.strptime(start_time, '%H:%M').time(),
+                                      step=900, key=f"availability_start_{weekday}")
+            with col3:
+                end = st.time_input("To", value=datetime.strptime(end_time, '%H:%M').time(),
+                                    step=900, key=f"availability_end_{weekday}")
+            if working:
+                new_template.append((weekday, start.strftime('%H:%M'), end.strftime('%H:%M'), slot_minutes))
+
+        if st.form_submit_button("💾 Save Availability"):
+            if not new_template:
+                st.error("Select at least one day. To stop new bookings, untick \"Available for new consultations\" above.")
+            elif any(start >= end for _, start, end, _ in new_template):
+                st.error("Each working day must end after it starts.")
+            else:
+                st.session_state.db_manager.set_doctor_availability(doctor_id, new_template)
+                st.success("Availability updated! Open slots now follow these hours; booked ones are kept.")
+                st.rerun()
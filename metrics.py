@@ -0,0 +1,322 @@
+import atexit
+import bisect
+import itertools
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from singleton import process_singleton
+
+# Updates from different threads land in different stripes, each with its own
+# lock, so concurrent sessions rarely contend; a scrape adds the stripes up.
+STRIPES = 16
+
+_stripe_numbers = itertools.count()
+_thread_stripe = threading.local()
+
+def _stripe():
+    try:
+        return _thread_stripe.index
+    except AttributeError:
+        _thread_stripe.index = next(_stripe_numbers) % STRIPES
+        return _thread_stripe.index
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(labelnames, key, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, key)]
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._stripes = [(threading.Lock(), {}) for _ in range(STRIPES)]
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple([str(labels[name]) for name in self.labelnames]) if labels else ()
+
+    def header(self):
+        return [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        lock, values = self._stripes[_stripe()]
+        with lock:
+            values[key] = values.get(key, 0) + amount
+
+    def values(self):
+        """{label values: total} summed over the stripes"""
+        totals = {}
+        for lock, values in self._stripes:
+            with lock:
+                for key, value in values.items():
+                    totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def expose(self):
+        return self.header() + [
+            f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+            for key, value in sorted(self.values().items())
+        ]
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    # Seconds; suits anything from a single query to a full page render
+    DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        lock, values = self._stripes[_stripe()]
+        with lock:
+            state = values.get(key)
+            if state is None:
+                # Per-bucket counts (the last is above every bound), then sum and count
+                state = values[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def quantile(self, state, fraction):
+        """Upper bound of the bucket holding `fraction` of the observations in `state` (a values() entry);
+        inf when it falls in the last, open bucket"""
+        rank = fraction * state[-1]
+        seen = 0
+        for bound, count in zip(self.buckets, state):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def values(self):
+        totals = {}
+        for lock, values in self._stripes:
+            with lock:
+                for key, state in values.items():
+                    total = totals.get(key)
+                    if total is None:
+                        totals[key] = list(state)
+                    else:
+                        for i, value in enumerate(state):
+                            total[i] += value
+        return totals
+
+    def expose(self):
+        lines = self.header()
+        for key, state in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), state):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, [("le", _format_value(bound))])} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(state[-2])}')
+            lines.append(f'{self.name}_count{labels} {state[-1]}')
+        return lines
+
+class Gauge(_Metric):
+    """A value set directly, or computed by `function` at scrape time"""
+    kind = 'gauge'
+
+    def __init__(self, name, help, labelnames=(), function=None):
+        super().__init__(name, help, labelnames)
+        self.function = function
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def values(self):
+        if self.function is not None:
+            value = self.function()
+            return value if isinstance(value, dict) else {(): value}
+        with self._lock:
+            return dict(self._values)
+
+    def expose(self):
+        return self.header() + [
+            f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+            for key, value in sorted(self.values().items())
+        ]
+
+class CallbackCounter(Gauge):
+    """A counter kept elsewhere (e.g. a cache's hit count) and read at scrape time"""
+    kind = 'counter'
+
+class Registry:
+    """Named metrics; asking for an existing name returns the same metric"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"{name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def histogram(self, name, help, labelnames=(), buckets=Histogram.DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help, labelnames, buckets)
+
+    def gauge(self, name, help, labelnames=(), function=None):
+        return self._get_or_create(Gauge, name, help, labelnames, function)
+
+    def callback_counter(self, name, help, function, labelnames=()):
+        metric = self._get_or_create(CallbackCounter, name, help, labelnames, function)
+        # The latest owner wins, e.g. a replaced password hasher
+        metric.function = function
+        return metric
+
+    def exposition(self):
+        """All metrics in the Prometheus text format (version 0.0.4)"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            try:
+                lines += metric.expose()
+            except Exception as e:
+                # A failing callback shouldn't take the other metrics down with it
+                lines.append(f'# {metric.name} unavailable: {type(e).__name__}')
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+
+class SessionTracker:
+    """Sessions that rendered a page in the last `window` seconds"""
+
+    def __init__(self, window=300):
+        self.window = window
+        self._lock = threading.Lock()
+        self._last_seen = {}
+
+    def touch(self, session_id):
+        with self._lock:
+            self._last_seen[session_id] = time.monotonic()
+
+    def active(self):
+        cutoff = time.monotonic() - self.window
+        with self._lock:
+            for session_id in [s for s, seen in self._last_seen.items() if seen < cutoff]:
+                del self._last_seen[session_id]
+            return len(self._last_seen)
+
+ACTIVE_SESSIONS = SessionTracker()
+
+# Metrics the app reports into
+LOGINS = REGISTRY.counter(
+    'mediconnect_logins_total', 'Password checks by authenticate_user', ['result'])
+SYMPTOM_ANALYSES = REGISTRY.counter(
+    'mediconnect_symptom_analyses_total', 'Symptom checker analyses by urgency level', ['urgency'])
+SYMPTOM_ANALYSIS_SECONDS = REGISTRY.histogram(
+    'mediconnect_symptom_analysis_seconds', 'Time to analyze one symptom description',
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025))
+APPOINTMENTS_CREATED = REGISTRY.counter(
+    'mediconnect_appointments_created_total', 'Appointments created, directly or by confirming a slot', ['source'])
+# Seconds; finer than the defaults, since most statements finish well under a millisecond
+QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    'mediconnect_db_query_seconds', 'SQL statement latency by DatabaseManager method', ['query'],
+    buckets=QUERY_BUCKETS)
+PAGE_RENDER_SECONDS = REGISTRY.histogram(
+    'mediconnect_page_render_seconds', 'Server time to run a page function', ['page'])
+PAGE_RENDERS = REGISTRY.counter(
+    'mediconnect_page_renders_total', 'Page function runs by outcome', ['page', 'outcome'])
+REGISTRY.gauge(
+    'mediconnect_active_sessions', 'Browser sessions that rendered a page in the last five minutes',
+    function=ACTIVE_SESSIONS.active)
+
+class _Handler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.registry.exposition().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the Streamlit console
+        pass
+
+class MetricsExporter:
+    """Serves the registry at http://host:port/metrics from a background thread"""
+
+    def __init__(self, registry=REGISTRY, host='127.0.0.1', port=9464):
+        handler = type('MetricsHandler', (_Handler,), {'registry': registry})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.address = self.server.server_address
+
+        self._thread = threading.Thread(target=self.server.serve_forever, name='metrics-exporter', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def close(self):
+        if self._thread.is_alive():
+            self.server.shutdown()
+            self.server.server_close()
+            self._thread.join(timeout=5)
+
+@process_singleton
+def start_exporter():
+    """Start the process-wide exporter if METRICS_PORT is set; returns it, or None.
+
+    METRICS_HOST picks the interface (default 127.0.0.1). If the port is
+    taken, e.g. by another app process, this process goes without one.
+    """
+    port = os.getenv('METRICS_PORT')
+    if not port:
+        return None
+    try:
+        return MetricsExporter(host=os.getenv('METRICS_HOST', '127.0.0.1'), port=int(port))
+    except OSError:
+        return None
@@ -0,0 +1,226 @@
+import atexit
+import logging
+import os
+import random
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+
+from singleton import process_singleton
+
+logger = logging.getLogger(__name__)
+
+# Where FileTransport drops messages when no SMTP server is configured
+DEFAULT_OUTBOX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'outbox')
+
+def build_email(message, sender):
+    email = EmailMessage()
+    email['From'] = sender
+    email['To'] = message['recipient']
+    email['Subject'] = message['subject']
+    email['Date'] = formatdate(localtime=True)
+    email['Message-ID'] = make_msgid(domain='mediconnect.local')
+    email.set_content(message['body'])
+    return email
+
+class SmtpTransport:
+    """Sends a batch of messages over one SMTP connection"""
+
+    def __init__(self, host, port=587, username=None, password=None, sender='no-reply@mediconnect.local',
+                 starttls=True, timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender
+        self.starttls = starttls
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            host=os.getenv('SMTP_HOST'),
+            port=int(os.getenv('SMTP_PORT', '587')),
+            username=os.getenv('SMTP_USERNAME'),
+            password=os.getenv('SMTP_PASSWORD'),
+            sender=os.getenv('SMTP_FROM', 'no-reply@mediconnect.local'),
+            starttls=os.getenv('SMTP_STARTTLS', '1') != '0'
+        )
+
+    def send_batch(self, messages):
+        """Send messages; returns {message id: error string} for the ones that failed.
+
+        Connection-level errors raise, which fails the whole batch.
+        """
+        failures = {}
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            for message in messages:
+                try:
+                    email = build_email(message, self.sender)
+                except Exception as e:
+                    # e.g. a newline in a header; only this message is affected
+                    failures[message['id']] = f"{type(e).__name__}: {e}"
+                    continue
+                try:
+                    smtp.send_message(email)
+                except smtplib.SMTPRecipientsRefused as e:
+                    failures[message['id']] = f"Recipient refused: {e.recipients}"
+                except smtplib.SMTPDataError as e:
+                    failures[message['id']] = f"SMTP {e.smtp_code}: {e.smtp_error!r}"
+        return failures
+
+class FileTransport:
+    """Writes each message as an .eml file; a local stand-in for SMTP in development and tests"""
+
+    def __init__(self, directory=DEFAULT_OUTBOX_DIR, sender='no-reply@mediconnect.local'):
+        self.directory = directory
+        self.sender = sender
+
+    def send_batch(self, messages):
+        """Write messages; returns {message id: error string} for the ones that failed.
+
+        Files are named by outbox id and renamed into place once written, so
+        a retried message replaces its earlier copy instead of adding one.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        failures = {}
+        for message in messages:
+            path = os.path.join(self.directory, f"{message['id']:08d}.eml")
+            try:
+                data = build_email(message, self.sender).as_bytes()
+                with open(path + '.tmp', 'wb') as f:
+                    f.write(data)
+                os.replace(path + '.tmp', path)
+            except Exception as e:
+                failures[message['id']] = f"{type(e).__name__}: {e}"
+        return failures
+
+def default_transports():
+    """SMTP when SMTP_HOST is set, otherwise .eml files in NOTIFY_OUTBOX_DIR"""
+    if os.getenv('SMTP_HOST'):
+        return {'email': SmtpTransport.from_env()}
+    return {'email': FileTransport(os.getenv('NOTIFY_OUTBOX_DIR', DEFAULT_OUTBOX_DIR))}
+
+class NotificationDispatcher:
+    """Background delivery of the notification_outbox table.
+
+    Due messages are claimed in batches of batch_size, grouped by transport
+    and handed to that transport in one call so it can reuse a connection.
+    A failed message is retried after base_delay * 2**attempts seconds (with
+    jitter, capped at max_delay) and marked 'failed' after max_attempts.
+    Every claim counts as an attempt, so a message whose delivery never
+    reports back (a crash, a hung transport) also ends up 'failed'.
+    """
+
+    def __init__(self, db_manager, transports=None, batch_size=50, poll_interval=5,
+                 max_attempts=5, base_delay=30, max_delay=3600):
+        self.db = db_manager
+        self.transports = transports or default_transports()
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+        self.batches = 0
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+        self._thread = threading.Thread(target=self._run, name='notification-dispatcher', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def wakeup(self):
+        """Deliver now instead of waiting for the next poll, e.g. right after enqueueing"""
+        self._wakeup.set()
+
+    def retry_delay(self, attempts):
+        delay = min(self.max_delay, self.base_delay * 2 ** attempts)
+        return delay * random.uniform(0.8, 1.2)
+
+    def _record_failure(self, message, error):
+        attempts = message['attempts']
+        if attempts >= self.max_attempts:
+            self.db.mark_notification_failed(message['id'], error)
+            self.failed += 1
+        else:
+            self.db.mark_notification_failed(message['id'], error, time.time() + self.retry_delay(attempts - 1))
+            self.retried += 1
+
+    def dispatch_once(self):
+        """Claim and deliver one batch; returns the number of messages claimed"""
+        with self._lock:
+            messages = self.db.claim_notifications(self.batch_size, max_attempts=self.max_attempts)
+            if not messages:
+                return 0
+
+            by_transport = {}
+            for message in messages:
+                by_transport.setdefault(message['transport'], []).append(message)
+
+            for name, batch in by_transport.items():
+                transport = self.transports.get(name)
+                if transport is None:
+                    for message in batch:
+                        self._record_failure(message, f"No transport named {name!r}")
+                    continue
+
+                try:
+                    failures = transport.send_batch(batch)
+                except Exception as e:
+                    # Anything the transport raises fails its batch; the messages are retried
+                    failures = {message['id']: f"{type(e).__name__}: {e}" for message in batch}
+
+                self.db.mark_notifications_sent(m['id'] for m in batch if m['id'] not in failures)
+                self.sent += len(batch) - len(failures)
+                for message in batch:
+                    if message['id'] in failures:
+                        self._record_failure(message, failures[message['id']])
+
+            self.batches += 1
+            return len(messages)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            try:
+                # Keep going while full batches come back, then wait for the next poll
+                while not self._stopped.is_set() and self.dispatch_once() == self.batch_size:
+                    pass
+            except Exception:
+                # The outbox keeps the messages; try again on the next poll
+                logger.exception("Notification dispatch failed; retrying in %s seconds", self.poll_interval)
+
+    def close(self):
+        """Stop the background thread; unsent messages stay in the outbox"""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join(timeout=10)
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'sent': self.sent,
+            'retried': self.retried,
+            'failed': self.failed,
+            'outbox': self.db.get_notification_counts()
+        }
+
+@process_singleton
+def get_dispatcher(db_manager):
+    """Process-wide dispatcher; the app starts it with the shared database manager"""
+    return NotificationDispatcher(db_manager)
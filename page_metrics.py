@@ -0,0 +1,208 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from metrics import ACTIVE_SESSIONS, PAGE_RENDER_SECONDS, PAGE_RENDERS, percentile
+from singleton import process_singleton
+from sql_metrics import get_sql_recorder
+
+DEFAULT_LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'page_metrics.jsonl')
+
+class PageMetrics:
+    """Recent renders of each page, kept in memory and appended to a rotating JSON lines log.
+
+    Renders only queue their sample; a background thread appends the queue
+    to the log every flush_interval seconds and at exit. The log moves to
+    `<path>.1` once it passes max_log_bytes, so at most two files are kept.
+    An empty log_path keeps the samples in memory only.
+    """
+
+    def __init__(self, log_path=DEFAULT_LOG_PATH, max_log_bytes=5 * 1024 * 1024, samples_per_page=500,
+                 flush_interval=2):
+        self.log_path = log_path
+        self.max_log_bytes = max_log_bytes
+        self.samples_per_page = samples_per_page
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._unwritten = []
+        self._log_bytes = None
+        self._flush_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(log_path=os.getenv('PAGE_METRICS_LOG', DEFAULT_LOG_PATH))
+
+    def record(self, sample):
+        with self._lock:
+            samples = self._samples.get(sample['page'])
+            if samples is None:
+                samples = self._samples[sample['page']] = deque(maxlen=self.samples_per_page)
+            samples.append(sample)
+            if self.log_path:
+                self._unwritten.append(sample)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='page-metrics-log', daemon=True)
+                    self._thread.start()
+                    atexit.register(self.close)
+
+    def flush(self):
+        """Append the queued samples to the log; returns how many were written"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._unwritten = self._unwritten, []
+            if not batch:
+                return 0
+
+            if self._log_bytes is None:
+                os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+                self._log_bytes = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+            if self._log_bytes > self.max_log_bytes:
+                os.replace(self.log_path, self.log_path + '.1')
+                self._log_bytes = 0
+            data = ''.join(json.dumps(sample) + '\n' for sample in batch)
+            with open(self.log_path, 'a') as f:
+                f.write(data)
+            self._log_bytes += len(data.encode('utf-8'))
+            return len(batch)
+
+    def _run(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError:
+                # The samples are still in memory; the log just misses this batch
+                pass
+
+    def close(self):
+        """Stop the log thread and write whatever is still queued"""
+        if self._thread is None or self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._thread.join(timeout=5)
+        atexit.unregister(self.close)
+        try:
+            self.flush()
+        except OSError:
+            pass
+
+    def summary(self):
+        """One dict per page over its recent renders, most total wall time first"""
+        with self._lock:
+            pages = {page: list(samples) for page, samples in self._samples.items()}
+
+        rows = []
+        for page, samples in pages.items():
+            wall = sorted(sample['wall_ms'] for sample in samples)
+            total_wall = sum(wall)
+            db_ms = sum(sample['db_ms'] for sample in samples)
+            elements = [sample['elements'] for sample in samples if sample['elements'] is not None]
+            rows.append({
+                'page': page,
+                'renders': len(samples),
+                'p50_ms': round(percentile(wall, 0.50), 1),
+                'p95_ms': round(percentile(wall, 0.95), 1),
+                'max_ms': round(wall[-1], 1),
+                'total_s': round(total_wall / 1000, 2),
+                'db_ms': round(db_ms / len(samples), 1),
+                'db_share': round(db_ms / total_wall, 2) if total_wall else 0,
+                'db_calls': round(sum(sample['db_calls'] for sample in samples) / len(samples), 1),
+                'rows': round(sum(sample['rows'] for sample in samples) / len(samples), 1),
+                'elements': round(sum(elements) / len(elements), 1) if elements else None,
+                'errors': sum(sample['outcome'] == 'error' for sample in samples)
+            })
+        rows.sort(key=lambda row: row['total_s'], reverse=True)
+        return rows
+
+    def recent(self):
+        """Every sample still in memory, oldest first, as JSON lines"""
+        with self._lock:
+            samples = [sample for page_samples in self._samples.values() for sample in page_samples]
+        samples.sort(key=lambda sample: sample['time'])
+        return ''.join(json.dumps(sample) + '\n' for sample in samples)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+@process_singleton
+def get_page_metrics():
+    """Process-wide PageMetrics; PAGE_METRICS_LOG overrides the log path ('' for no file)"""
+    return PageMetrics.from_env()
+
+class _ElementCounter:
+    """Counts the deltas (elements and containers) a script run sends to the browser while active"""
+
+    def __init__(self):
+        self.count = None
+        self._ctx = None
+        self._original = None
+
+    def __enter__(self):
+        ctx = get_script_run_ctx()
+        # _enqueue is private to Streamlit; without it the count is just left out
+        if ctx is not None and hasattr(ctx, '_enqueue'):
+            self.count = 0
+            self._ctx = ctx
+            self._original = ctx._enqueue
+
+            def enqueue(msg):
+                if msg.WhichOneof('type') == 'delta':
+                    self.count += 1
+                return self._original(msg)
+            ctx._enqueue = enqueue
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._ctx is not None:
+            self._ctx._enqueue = self._original
+
+def instrument_page(page):
+    """Record wall time, DB calls, DB time, rows fetched and elements drawn for each run of a page.
+
+    Nested pages (a dashboard drawing its current section) are each
+    recorded with their own inclusive numbers.
+    """
+    @functools.wraps(page)
+    def wrapper(*args, **kwargs):
+        outcome = 'ok'
+        start = time.perf_counter()
+        with get_sql_recorder().scope() as queries, _ElementCounter() as elements:
+            try:
+                return page(*args, **kwargs)
+            except BaseException as e:
+                # st.rerun() and st.stop() end a page by raising
+                outcome = {'RerunException': 'rerun', 'StopException': 'stop'}.get(type(e).__name__, 'error')
+                raise
+            finally:
+                wall = time.perf_counter() - start
+                PAGE_RENDER_SECONDS.observe(wall, page=page.__name__)
+                PAGE_RENDERS.inc(page=page.__name__, outcome=outcome)
+                ctx = get_script_run_ctx()
+                if ctx is not None:
+                    ACTIVE_SESSIONS.touch(ctx.session_id)
+
+                user_info = st.session_state.get('user_info') or {}
+                get_page_metrics().record({
+                    'time': datetime.now().isoformat(timespec='milliseconds'),
+                    'page': page.__name__,
+                    'role': user_info.get('role'),
+                    'outcome': outcome,
+                    'wall_ms': round(wall * 1000, 2),
+                    'db_calls': queries.calls,
+                    'db_ms': round(queries.seconds * 1000, 2),
+                    'rows': queries.rows,
+                    'elements': elements.count
+                })
+    return wrapper
@@ -0,0 +1,735 @@
+import streamlit as st
+from datetime import datetime, timedelta
+import random
+import os
+from static_assets import show_image
+from page_metrics import instrument_page
+
+@instrument_page
+def show_dashboard():
+    # Header row: Logo only (no user profile header on main dashboard)
+    logo_path = os.path.join(os.path.dirname(__file__), "assets", "mediconnect_logo.png")
+    if os.path.exists(logo_path):
+        show_image("mediconnect_logo.png", width=260, alt="MediConnect Healthcare")
+    else:
+        st.markdown('<h1 class="dashboard-title-left">MediConnect Healthcare</h1>', unsafe_allow_html=True)
+
+    # Health slogan that changes every login
+    health_slogans = [
+        "Be healthy, be happy.",
+        "Fit is not a destination.",
+        "Wellness is a choice.",
+        "Eat clean, feel great.",
+        "Stay strong, live long.",
+        "Health is a journey.",
+        "Nutrition matters every day.",
+        "Less stress, more health.",
+        "Choose joy, choose health.",
+        "Your health, your wealth.",
+        "Make health a habit.",
+        "Active living is happy living.",
+        "Fuel your body wisely.",
+        "Live well, feel well.",
+        "Good vibes, good health.",
+        "Invest in your health.",
+        "Healthy life, happy life.",
+        "Wellness is a lifestyle.",
+        "Thrive, don't just survive.",
+        "Mind your health.",
+        "Small steps, big changes.",
+        "Prevention is better than cure!",
+        "Stay ahead, stay healthy!",
+        "Healthy habits start today!",
+        "Act now for a healthier future!",
+        "Protect your health every day.",
+        "Small steps lead to big health!",
+        "Wellness is the best defense.",
+        "Invest in health, enjoy the benefits!",
+        "Be proactive, not reactive!",
+        "Checkups matter for longevity.",
+        "Take charge of your health!",
+        "Screenings save lives, don't skip!",
+        "Catch it early, live better!",
+        "Stay informed, stay ahead!",
+        "Prevention is your best medicine.",
+        "Live smart, prioritize prevention!",
+        "Healthy choices for a lasting life!",
+        "Knowledge is power for health.",
+        "Plan for health, plan for life.",
+        "Prevent today for a brighter tomorrow!"
+    ]
+
+    # Select a random slogan (displayed above circle button)
+    selected_slogan = random.choice(health_slogans)
+    st.markdown(f"""
+    <div class="health-slogan">
+        <p>{selected_slogan}</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Find Doctors, Profile, Logout - above circle button
+    st.markdown('<div id="dashboard-nav-buttons-row"></div>', unsafe_allow_html=True)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("👨‍⚕️ Find Doctors", use_container_width=True):
+            st.session_state.current_screen = 'doctors'
+            st.rerun()
+    with col2:
+        if st.button("👤 Profile", use_container_width=True):
+            st.session_state.current_screen = 'profile'
+            st.rerun()
+    with col3:
+        if st.button("🚪 Logout", use_container_width=True):
+            st.session_state.user_logged_in = False
+            st.session_state.current_screen = 'login_signup'
+            st.session_state.user_info = {}
+            st.rerun()
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Symptom Checker button (circle)
+    st.markdown('<div id="consult-btn-area"></div>', unsafe_allow_html=True)
+    _c1, col_consult, _c2 = st.columns([1, 1, 1])
+    with col_consult:
+        if st.button("Symptom Checker", key="consult_main_btn", type="primary"):
+            st.session_state.current_screen = 'symptom_checker'
+            st.rerun()
+
+    # Emergency section
+    st.markdown("""
+    <div class="emergency-card">
+        <h3>🚨 Emergency Medical Reminder 🚨</h3>
+        <p>If experiencing chest pain, difficulty breathing, or severe symptoms - seek immediate help</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Admin: show access to admin dashboard only (no Activity Trends / Recent Activity)
+    user_role = st.session_state.user_info.get('role', 'patient')
+    is_admin = user_role == 'admin'
+    if is_admin:
+        st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
+        st.subheader("👑 Admin Panel")
+        if st.button("🔧 Access Admin Dashboard", use_container_width=True):
+            st.session_state.current_screen = 'admin'
+            st.rerun()
+        st.markdown('</div>', unsafe_allow_html=True)
+
+@instrument_page
+def show_patient_records():
+    st.markdown("### 📊 Patient Records Management")
+    
+    analytics = st.session_state.healthcare_analytics
+    
+    # Add new patient form
+    with st.expander("➕ Add New Patient", expanded=False):
+        with st.form("new_patient_form"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                full_name = st.text_input("Full Name*")
+                age = st.number_input("Age*", min_value=1, max_value=120, value=25)
+                gender = st.selectbox("Gender*", ["Select", "Male", "Female", "Other", "Prefer not to say"])
+            
+            with col2:
+                email = st.text_input("Email Address*")
+                phone = st.text_input("Phone Number")
+                location = st.text_input("Location (City/Province)*")
+            
+            emergency_contact = st.text_input("Emergency Contact")
+            medical_history = st.text_area("Medical History & Allergies")
+            
+            if st.form_submit_button("Add Patient to System"):
+                if all([full_name, age, gender != "Select", email, location]):
+                    patient_data = {
+                        'full_name': full_name,
+                        'age': age,
+                        'gender': gender,
+                        'email': email,
+                        'phone': phone,
+                        'location': location,
+                        'emergency_contact': emergency_contact,
+                        'medical_history': medical_history
+                    }
+                    patient_id = analytics.add_patient(patient_data)
+                    st.success(f"Patient {full_name} added successfully! Patient ID: {patient_id}")
+                    st.rerun()
+                else:
+                    st.error("Please fill in all required fields (*)")
+    
+    # Patient records table
+    st.markdown("### 📋 Patient Database")
+    
+    if analytics.patients:
+        # Search and filter
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            search_term = st.text_input("🔍 Search patients...")
+        with col2:
+            status_filter = st.selectbox("Filter", ["All", "Active Today", "Inactive"])
+        
+        # Filter patients
+        filtered_patients = analytics.patients
+        if search_term:
+            filtered_patients = [p for p in filtered_patients if 
+                               search_term.lower() in p['full_name'].lower() or 
+                               search_term in p.get('id', '') or
+                               search_term.lower() in p['email'].lower()]
+        
+        if status_filter == "Active Today":
+            filtered_patients = [p for p in filtered_patients if p['last_active'] == datetime.now().strftime('%Y-%m-%d')]
+        
+        # Display patients
+        for patient in filtered_patients:
+            with st.container():
+                st.markdown('<div class="patient-record">', unsafe_allow_html=True)
+                col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
+                
+                with col1:
+                    st.write(f"**{patient['full_name']}**")
+                    st.write(f"🆔 {patient['id']}")
+                    st.write(f"📧 {patient['email']}")
+                
+                with col2:
+                    st.write(f"🎂 {patient['age']} years • {patient['gender']}")
+                    st.write(f"📞 {patient.get('phone', 'N/A')}")
+                    st.write(f"📍 {patient['location']}")
+                
+                with col3:
+                    status = "🟢 Active" if patient['last_active'] == datetime.now().strftime('%Y-%m-%d') else "⚪ Inactive"
+                    st.write(status)
+                    st.write(f"Registered: {patient['registration_date'].split()[0]}")
+                
+                with col4:
+                    if st.button("View Details", key=f"view_{patient['id']}"):
+                        show_patient_detail_view(patient)
+                
+                st.markdown('</div>', unsafe_allow_html=True)
+    else:
+        st.info("No patients in the system yet. Add your first patient above.")
+    
+    if st.button("← Back to Dashboard"):
+        st.session_state.current_screen = 'home'
+        st.rerun()
+
+def show_patient_detail_view(patient):
+    """Show detailed patient view"""
+    st.markdown(f"### 👤 Patient Details: {patient['full_name']}")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write(f"**Patient ID:** {patient['id']}")
+        st.write(f"**Age:** {patient['age']}")
+        st.write(f"**Gender:** {patient['gender']}")
+        st.write(f"**Location:** {patient['location']}")
+    
+    with col2:
+        st.write(f"**Email:** {patient['email']}")
+        st.write(f"**Phone:** {patient.get('phone', 'N/A')}")
+        st.write(f"**Emergency Contact:** {patient.get('emergency_contact', 'N/A')}")
+        st.write(f"**Last Active:** {patient['last_active']}")
+    
+    # Medical History
+    if patient.get('medical_history'):
+        st.markdown("#### 📝 Medical History")
+        st.info(patient['medical_history'])
+    
+    # Patient's consultations
+    patient_consultations = [c for c in st.session_state.healthcare_analytics.consultations 
+                           if c['patient_id'] == patient['id']]
+    
+    if patient_consultations:
+        st.markdown("#### 🏥 Consultation History")
+        for consult in patient_consultations:
+            with st.container():
+                col1, col2, col3 = st.columns([3, 2, 1])
+                with col1:
+                    st.write(f"**{consult['type']}**")
+                with col2:
+                    st.write(consult['timestamp'])
+                with col3:
+                    st.success(consult['status'])
+                st.divider()
+
+@instrument_page
+def show_analytics():
+    # Charting libraries are only loaded once an analytics page is opened
+    import pandas as pd
+    import plotly.express as px
+
+    st.markdown("### 📈 Healthcare Analytics")
+    
+    analytics = st.session_state.healthcare_analytics
+    stats = analytics.get_patient_stats()
+    
+    # Key Metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Patients", stats['total_patients'])
+    with col2:
+        st.metric("Active Today", stats['active_today'])
+    with col3:
+        st.metric("Total Consultations", stats['total_consultations'])
+    with col4:
+        st.metric("AI Analyses", stats['total_analyses'])
+    
+    # Charts
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
+        st.subheader("📊 Activity Trends")
+        
+        trends_data = analytics.get_consultation_trends()
+        fig = px.line(trends_data, x='date', y=['consultations', 'ai_analyses'],
+                     title='Weekly Activity Comparison',
+                     color_discrete_sequence=['#1a73e8', '#ff6b6b'])
+        st.plotly_chart(fig, use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
+        st.subheader("🎯 Consultation Types")
+        
+        if analytics.consultations:
+            consult_types = pd.DataFrame(analytics.consultations)['type'].value_counts()
+            fig = px.pie(consult_types, values=consult_types.values, names=consult_types.index,
+                        title="Consultation Distribution")
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No consultation data available yet.")
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Patient Demographics
+    st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
+    st.subheader("👥 Patient Demographics")
+    
+    if analytics.patients:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Age distribution
+            ages = [p['age'] for p in analytics.patients]
+            fig_age = px.histogram(x=ages, nbins=10, title="Age Distribution",
+                                 color_discrete_sequence=['#1a73e8'])
+            st.plotly_chart(fig_age, use_container_width=True)
+        
+        with col2:
+            # Gender distribution
+            genders = [p['gender'] for p in analytics.patients]
+            gender_counts = pd.Series(genders).value_counts()
+            fig_gender = px.pie(values=gender_counts.values, names=gender_counts.index,
+                              title="Gender Distribution")
+            st.plotly_chart(fig_gender, use_container_width=True)
+    else:
+        st.info("No patient data available yet.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    if st.button("← Back to Dashboard"):
+        st.session_state.current_screen = 'home'
+        st.rerun()
+
+@instrument_page
+def show_symptom_checker():
+    st.markdown("### 🤖 AI Symptom Checker (Powered by ChatGPT)")
+    st.write("Get accurate first-level medical assessment with AI-powered analysis")
+    
+    with st.form("symptom_form"):
+        symptoms = st.text_area(
+            "Describe your symptoms in detail:",
+            placeholder="Example: I've had fever and headache for 2 days, with occasional coughing. Temperature around 38°C...",
+            height=120
+        )
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            duration = st.selectbox(
+                "Duration of symptoms:",
+                ["Select", "Less than 24 hours", "1-3 days", "4-7 days", "1-2 weeks", "More than 2 weeks"]
+            )
+        with col2:
+            severity = st.selectbox(
+                "Severity:",
+                ["Select", "Mild", "Moderate", "Severe"]
+            )
+        with col3:
+            age = st.number_input("Patient Age", min_value=1, max_value=120, value=st.session_state.user_info.get('age', 25))
+        
+        analyze_clicked = st.form_submit_button("🔍 Analyze")
+    
+    if analyze_clicked:
+        if not symptoms or duration == "Select" or severity == "Select":
+            st.error("Please fill in all fields before analyzing symptoms.")
+        else:
+            with st.spinner("🤖 ChatGPT is analyzing your symptoms with medical accuracy..."):
+                medical_history = st.session_state.user_info.get('medical_history', '')
+                analysis_result = st.session_state.symptom_analyzer.analyze_with_chatgpt(
+                    symptoms, duration, severity, age, medical_history
+                )
+                
+                # Store the analysis in database
+                if st.session_state.user_info.get('patient_id'):
+                    # Save to database
+                    analysis_text = analysis_result.get('analysis', '')
+                    st.session_state.db_manager.add_symptom_analysis(
+                        st.session_state.user_info['patient_id'],
+                        symptoms,
+                        analysis_text
+                    )
+                    # Also save to session state for backwards compatibility
+                    st.session_state.healthcare_analytics.add_symptom_analysis(
+                        st.session_state.user_info['patient_id'],
+                        symptoms,
+                        analysis_result
+                    )
+                
+                # Display results
+                st.markdown("---")
+                st.markdown("### 📊 AI Medical Analysis Results")
+                
+                if analysis_result.get('error'):
+                    st.error(f"AI Service Error: {analysis_result['error']}")
+                    st.info("Please try again later or contact support.")
+                else:
+                    st.markdown('<div class="analysis-result">', unsafe_allow_html=True)
+                    
+                    # Display analysis with better formatting
+                    analysis_text = analysis_result['analysis']
+                    
+                    # Split into sections if possible
+                    sections = analysis_text.split('\n\n')
+                    for section in sections:
+                        if section.strip():
+                            st.write(section.strip())
+                    
+                    st.markdown('</div>', unsafe_allow_html=True)
+                    
+                    # Additional info
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.info(f"**AI Model:** {analysis_result.get('ai_model', 'GPT-3.5-turbo')}")
+                    with col2:
+                        st.info(f"**Confidence:** {analysis_result.get('confidence', 'High')}")
+                    with col3:
+                        st.info(f"**Analysis Time:** {datetime.now().strftime('%H:%M:%S')}")
+                
+                # Important disclaimer
+                st.markdown("""
+                <div style='padding: 15px; border-radius: 10px; border-left: 4px solid #ffc107;'>
+                <h4>⚠️ MEDICAL DISCLAIMER</h4>
+                <p>This AI analysis is for <strong>first-level assessment and informational purposes only</strong> and is not a substitute for professional medical advice, diagnosis, or treatment. Always consult qualified healthcare providers for medical concerns.</p>
+                <p><strong>For emergencies:</strong> Call your local emergency number immediately.</p>
+                </div>
+                """, unsafe_allow_html=True)
+    
+    if st.button("← Back to Dashboard"):
+        st.session_state.current_screen = 'home'
+        st.rerun()
+
+@instrument_page
+def show_doctors():
+    st.markdown("### 👨‍⚕️ Find Healthcare Professionals")
+    st.write("Connect with qualified doctors and healthcare specialists in your area")
+
+    # Get doctors from database
+    doctors_data = st.session_state.db_manager.get_all_doctors()
+
+    # Filters
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        specialty_filter = st.selectbox(
+            "Filter by Specialty",
+            ["All Specialties"] + list(set([doc['specialty'] for doc in doctors_data]))
+        )
+
+    with col2:
+        location_filter = st.selectbox(
+            "Filter by Location",
+            ["All Locations"] + list(set([doc['location'] for doc in doctors_data]))
+        )
+
+    with col3:
+        availability_filter = st.selectbox(
+            "Availability",
+            ["All", "Available", "Online"]
+        )
+
+    # Filter doctors
+    filtered_doctors = doctors_data.copy()
+
+    if specialty_filter != "All Specialties":
+        filtered_doctors = [doc for doc in filtered_doctors if doc['specialty'] == specialty_filter]
+
+    if location_filter != "All Locations":
+        filtered_doctors = [doc for doc in filtered_doctors if doc['location'] == location_filter]
+
+    if availability_filter == "Available":
+        filtered_doctors = [doc for doc in filtered_doctors if doc['status'] == 'available']
+    elif availability_filter == "Online":
+        filtered_doctors = [doc for doc in filtered_doctors if doc['status'] == 'online']
+
+    # Display doctors
+    st.markdown(f"### 📋 Available Doctors ({len(filtered_doctors)})")
+
+    if filtered_doctors:
+        for doctor in filtered_doctors:
+            with st.container():
+                st.markdown('<div class="doctor-card">', unsafe_allow_html=True)
+
+                col1, col2, col3 = st.columns([2, 2, 1])
+
+                with col1:
+                    st.markdown(f"**{doctor['name']}**")
+                    st.write(f"🏥 {doctor['specialty']}")
+                    st.write(f"📍 {doctor['location']}")
+                    st.write(f"⭐ {doctor['rating']}/5.0 • {doctor['experience']} experience")
+
+                with col2:
+                    status_color = "🟢" if doctor['status'] == 'online' else "🔵" if doctor['status'] == 'available' else "⚪"
+                    st.write(f"{status_color} {doctor['status'].title()}")
+                    st.write(f"🗣️ Languages: {', '.join(doctor['languages'])}")
+                    if doctor.get('consultation_fee'):
+                        st.write(f"💰 Consultation: ₱{doctor['consultation_fee']}")
+
+                with col3:
+                    if doctor['available']:
+                        if st.button("📞 Book Consultation", key=f"book_{doctor['name'].replace(' ', '_')}"):
+                            st.session_state.booking_doctor_id = doctor['id']
+                            st.rerun()
+
+                if st.session_state.get('booking_doctor_id') == doctor['id']:
+                    show_booking_form(doctor)
+
+    if st.button("← Back to Dashboard"):
+        st.session_state.current_screen = 'home'
+        st.rerun()
+
+def show_booking_form(doctor):
+    """Pick an open slot for a doctor and book it"""
+    db = st.session_state.db_manager
+    patient_id = st.session_state.user_info.get('patient_id')
+
+    st.markdown(f"#### 📅 Book a consultation with {doctor['name']}")
+    booking_date = st.date_input(
+        "Date",
+        min_value=datetime.now().date(),
+        max_value=datetime.now().date() + timedelta(days=30),
+        key=f"booking_date_{doctor['id']}"
+    )
+
+    slots = db.get_open_slots(doctor['id'], booking_date)
+    if not slots and not db.has_slots(doctor['id'], booking_date):
+        # Past the days materialized at startup, e.g. in a process that has run for a while
+        db.materialize_slots(doctor['id'], booking_date, days=1)
+        slots = db.get_open_slots(doctor['id'], booking_date)
+
+    # Hide slots that have already started today
+    now_time = datetime.now().strftime('%H:%M')
+    open_slots = [(slot_id, slot_time) for slot_id, slot_time in slots
+                  if booking_date > datetime.now().date() or slot_time > now_time]
+
+    if not open_slots:
+        st.info("No open slots on this date. Please choose another day.")
+    else:
+        slot_times = {slot_time: slot_id for slot_id, slot_time in open_slots}
+        selected_time = st.selectbox("Time", list(slot_times), key=f"booking_time_{doctor['id']}")
+        reason = st.text_input("Reason for consultation", key=f"booking_reason_{doctor['id']}")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("✅ Confirm Booking", key=f"confirm_booking_{doctor['id']}"):
+                appointment_id = db.book_slot(slot_times[selected_time], patient_id, reason)
+                if appointment_id:
+                    st.session_state.booking_doctor_id = None
+                    st.success(f"Consultation booked with {doctor['name']} on {booking_date} at {selected_time}!")
+                else:
+                    st.error("Sorry, that slot was just taken. Please pick another time.")
+        with col2:
+            if st.button("Cancel", key=f"cancel_booking_{doctor['id']}"):
+                st.session_state.booking_doctor_id = None
+                st.rerun()
+
+@instrument_page
+def show_profile():
+    st.markdown("### 👤 My Profile")
+    st.write("View and manage your personal health information")
+
+    user_info = st.session_state.user_info
+
+    
+
+    # Profile display mode
+    if 'edit_mode' not in st.session_state:
+        st.session_state.edit_mode = False
+
+    if not st.session_state.edit_mode:
+        # Display current profile information
+        st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
+        st.subheader("📋 Personal Information")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.write(f"**Full Name:** {user_info.get('full_name', 'N/A')}")
+            st.write(f"**Age:** {user_info.get('age', 'N/A')}")
+            st.write(f"**Gender:** {user_info.get('gender', 'N/A')}")
+            st.write(f"**Patient ID:** {user_info.get('patient_id', 'N/A')}")
+
+        with col2:
+            st.write(f"**Email:** {user_info.get('email', 'N/A')}")
+            st.write(f"**Phone:** {user_info.get('phone', 'N/A')}")
+            st.write(f"**Location:** {user_info.get('location', 'N/A')}")
+            st.write(f"**Emergency Contact:** {user_info.get('emergency_contact', 'N/A')}")
+
+        # Medical History
+        if user_info.get('medical_history'):
+            st.markdown("#### 📝 Medical History & Allergies")
+            st.info(user_info['medical_history'])
+        else:
+            st.info("No medical history recorded yet.")
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # Edit button
+        if st.button("✏️ Edit Profile", use_container_width=True):
+            st.session_state.edit_mode = True
+            st.rerun()
+
+    else:
+        # Edit profile mode
+        st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
+        st.subheader("✏️ Edit Profile Information")
+
+        with st.form("edit_profile_form"):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                full_name = st.text_input("Full Name*", value=user_info.get('full_name', ''))
+                age = st.number_input("Age*", min_value=1, max_value=120, value=user_info.get('age', 25))
+                gender_options = ["Select", "Male", "Female", "Other", "Prefer not to say"]
+                current_gender = user_info.get('gender', 'Select')
+                gender_index = gender_options.index(current_gender) if current_gender in gender_options else 0
+                gender = st.selectbox("Gender*", gender_options, index=gender_index)
+
+            with col2:
+                email = st.text_input("Email Address*", value=user_info.get('email', ''))
+                phone = st.text_input("Phone Number", value=user_info.get('phone', ''))
+                location = st.text_input("Location (City/Province)*", value=user_info.get('location', ''))
+
+            emergency_contact = st.text_input("Emergency Contact Name and Number", value=user_info.get('emergency_contact', ''))
+            medical_history = st.text_area("Medical History & Allergies", value=user_info.get('medical_history', ''), height=100)
+
+            col3, col4 = st.columns(2)
+            with col3:
+                save_clicked = st.form_submit_button("💾 Save Changes", use_container_width=True)
+            with col4:
+                cancel_clicked = st.form_submit_button("❌ Cancel", use_container_width=True)
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        if save_clicked:
+            if not all([full_name, age, gender != "Select", email, location]):
+                st.error("Please fill in all required fields (*)")
+            else:
+                # Update user info
+                updated_info = {
+                    'full_name': full_name,
+                    'age': age,
+                    'gender': gender,
+                    'email': email,
+                    'phone': phone,
+                    'location': location,
+                    'emergency_contact': emergency_contact,
+                    'medical_history': medical_history,
+                    'patient_id': user_info.get('patient_id')
+                }
+
+                st.session_state.user_info = updated_info
+
+                # Update in analytics system if patient exists
+                if user_info.get('patient_id'):
+                    for patient in st.session_state.healthcare_analytics.patients:
+                        if patient['id'] == user_info['patient_id']:
+                            patient.update(updated_info)
+                            break
+
+                st.session_state.edit_mode = False
+                st.success("Profile updated successfully!")
+                st.rerun()
+
+        elif cancel_clicked:
+            st.session_state.edit_mode = False
+            st.rerun()
+
+    # Profile Statistics
+    st.markdown("---")
+    st.markdown("### 📊 Your Health Activity")
+
+    patient_id = user_info.get('patient_id')
+    if patient_id:
+        # Get user's consultations
+        user_consultations = [c for c in st.session_state.healthcare_analytics.consultations
+                            if c['patient_id'] == patient_id]
+        user_analyses = [a for a in st.session_state.healthcare_analytics.symptom_analyses
+                        if a['patient_id'] == patient_id]
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.metric("Total Consultations", len(user_consultations))
+
+        with col2:
+            st.metric("AI Symptom Analyses", len(user_analyses))
+
+        with col3:
+            last_activity = "Never"
+            if user_consultations or user_analyses:
+                all_dates = []
+                for c in user_consultations:
+                    all_dates.append(datetime.strptime(c['timestamp'].split()[0], '%Y-%m-%d'))
+                for a in user_analyses:
+                    all_dates.append(datetime.strptime(a['timestamp'].split()[0], '%Y-%m-%d'))
+                if all_dates:
+                    last_activity = max(all_dates).strftime('%Y-%m-%d')
+            st.metric("Last Activity", last_activity)
+
+        # Recent activity
+        if user_consultations or user_analyses:
+            st.markdown("#### 🕒 Recent Activity")
+            recent_activity = []
+
+            for consult in user_consultations[-3:]:
+                recent_activity.append({
+                    'type': 'Consultation',
+                    'description': consult['type'],
+                    'date': consult['timestamp'].split()[0]
+                })
+
+            for analysis in user_analyses[-3:]:
+                recent_activity.append({
+                    'type': 'AI Analysis',
+                    'description': 'Symptom Analysis',
+                    'date': analysis['timestamp'].split()[0]
+                })
+
+            # Sort by date
+            recent_activity.sort(key=lambda x: x['date'], reverse=True)
+
+            for activity in recent_activity[:5]:
+                col1, col2, col3 = st.columns([2, 2, 1])
+                with col1:
+                    st.write(f"**{activity['type']}**")
+                with col2:
+                    st.write(activity['description'])
+                with col3:
+                    st.write(activity['date'])
+                st.divider()
+    else:
+        st.info("Complete your profile to view health activity statistics.")
+
+    if st.button("← Back to Dashboard"):
+        st.session_state.current_screen = 'home'
+        st.rerun()
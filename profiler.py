@@ -0,0 +1,304 @@
+import cProfile
+import functools
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from singleton import process_singleton
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'profiles')
+MODES = ('sample', 'cprofile')
+# Upper bound on one arming, so a stray ?profile=100000 can't fill the disk
+MAX_RUNS = 50
+
+logger = logging.getLogger(__name__)
+
+# cProfile hooks the whole interpreter, so only one run can be traced at a time
+# (on Python 3.12+ a second enable() raises)
+_cprofile_lock = threading.Lock()
+
+def _frame_name(code):
+    # Collapsed stacks separate frames with ';' and end with ' <count>'
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ':')
+
+class StackSampler:
+    """Samples one thread's Python stack every `interval` seconds from a background thread.
+
+    Stacks are kept root first and cut at the frame running `root`, so the
+    Streamlit machinery below the app doesn't show up. Each sample is
+    weighted by the time since the previous one, and runs of the same stack
+    are merged, which keeps a long capture small.
+    """
+
+    def __init__(self, thread_id, root=None, interval=0.01):
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.samples = []
+        self.seconds = 0.0
+
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        self.seconds = time.perf_counter() - self._start
+
+    def _stack(self):
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            if frame.f_code is self.root:
+                break
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def _run(self):
+        last = self._start
+        while not self._stopped.wait(self.interval):
+            stack = self._stack()
+            now = time.perf_counter()
+            if stack:
+                if self.samples and self.samples[-1][0] == stack:
+                    self.samples[-1][1] += now - last
+                else:
+                    self.samples.append([stack, now - last])
+            last = now
+
+    def collapsed(self):
+        """Brendan Gregg's collapsed stack format, one 'frame;frame;frame microseconds' line per stack"""
+        totals = {}
+        for stack, seconds in self.samples:
+            totals[stack] = totals.get(stack, 0) + seconds
+        return ''.join(
+            ';'.join(_frame_name(code) for code in stack) + f' {round(seconds * 1e6)}\n'
+            for stack, seconds in totals.items()
+        )
+
+    def speedscope(self, name):
+        """A sampled speedscope profile (https://www.speedscope.app) in time order"""
+        frames, index = [], {}
+        samples = []
+        for stack, _ in self.samples:
+            for code in stack:
+                if code not in index:
+                    index[code] = len(frames)
+                    frames.append({'name': code.co_name, 'file': code.co_filename, 'line': code.co_firstlineno})
+            samples.append([index[code] for code in stack])
+        weights = [seconds for _, seconds in self.samples]
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'mediconnect profiler',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights
+            }]
+        }
+
+class Profiler:
+    """Profiles the next N script runs, of one session or of any session, into output_dir.
+
+    'sample' mode polls the run's stack from another thread and writes
+    .collapsed (flamegraph.pl, speedscope, inferno) and .speedscope.json
+    files; its cost to the run is the GIL time the sampler takes. 'cprofile'
+    mode traces every call and writes a .prof file for pstats or snakeviz;
+    it is exact but slows the run down noticeably.
+    """
+
+    def __init__(self, output_dir=DEFAULT_OUTPUT_DIR, interval_ms=10, allow_query_param=False, history=50):
+        self.output_dir = output_dir
+        self.interval = interval_ms / 1000
+        self.allow_query_param = allow_query_param
+
+        self._lock = threading.Lock()
+        # session id, or None for any session -> [runs left, mode]
+        self._armed = {}
+        self._captures = deque(maxlen=history)
+        self._sequence = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            output_dir=os.getenv('PROFILE_DIR', DEFAULT_OUTPUT_DIR),
+            interval_ms=float(os.getenv('PROFILE_INTERVAL_MS', '10')),
+            allow_query_param=os.getenv('PROFILE_QUERY_PARAM', '0') == '1'
+        )
+
+    def arm(self, runs, mode='sample', session_id=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode {mode!r}; expected one of {MODES}")
+        with self._lock:
+            self._armed[session_id] = [max(1, min(int(runs), MAX_RUNS)), mode]
+
+    def disarm(self, session_id=None):
+        with self._lock:
+            self._armed.pop(session_id, None)
+
+    def armed(self):
+        """{session id or None: (runs left, mode)}"""
+        with self._lock:
+            return {session_id: tuple(state) for session_id, state in self._armed.items()}
+
+    def _take(self, session_id):
+        """(armed key, mode) of the run to profile, or None"""
+        # Unlocked fast path: nearly every run finds nothing armed
+        if not self._armed:
+            return None
+        with self._lock:
+            for key in (session_id, None):
+                state = self._armed.get(key)
+                if state is not None:
+                    state[0] -= 1
+                    if state[0] <= 0:
+                        del self._armed[key]
+                    return key, state[1]
+        return None
+
+    def _give_back(self, key, mode):
+        # A run that couldn't be profiled stays armed for the next one
+        with self._lock:
+            state = self._armed.get(key)
+            if state is None:
+                self._armed[key] = [1, mode]
+            else:
+                state[0] += 1
+
+    @contextmanager
+    def profile(self, function, session_id=None, label=None):
+        """Runs the block under a profiler if a run is armed for session_id; yields the mode or None.
+
+        A cProfile run that finds another one in progress runs unprofiled and
+        leaves its arming for a later run.
+        """
+        taken = self._take(session_id)
+        if taken is None:
+            yield None
+            return
+        key, mode = taken
+        if mode == 'cprofile' and not _cprofile_lock.acquire(blocking=False):
+            self._give_back(key, mode)
+            yield None
+            return
+
+        if mode == 'sample':
+            profiler = StackSampler(threading.get_ident(), root=function.__code__, interval=self.interval)
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except BaseException:
+                _cprofile_lock.release()
+                raise
+        start = time.perf_counter()
+        try:
+            yield mode
+        finally:
+            wall = time.perf_counter() - start
+            if mode == 'sample':
+                profiler.stop()
+            else:
+                profiler.disable()
+                _cprofile_lock.release()
+            try:
+                self._write(profiler, mode, function.__name__, session_id, label, wall)
+            except Exception:
+                # Losing a capture must not replace the page's own outcome or exception
+                logger.exception("Could not write the %s profile of %s", mode, function.__name__)
+
+    def _write(self, profiler, mode, name, session_id, label, wall):
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        stem = '_'.join(part for part in (
+            datetime.now().strftime('%Y%m%d-%H%M%S'), f'{sequence:04d}', name,
+            re.sub(r'\W+', '-', label or ''), (session_id or '')[:8]
+        ) if part)
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, stem)
+
+        if mode == 'sample':
+            files = [base + '.collapsed', base + '.speedscope.json']
+            with open(files[0], 'w') as f:
+                f.write(profiler.collapsed())
+            with open(files[1], 'w') as f:
+                json.dump(profiler.speedscope(f"{name} {label or ''}".strip()), f)
+        else:
+            files = [base + '.prof']
+            profiler.dump_stats(files[0])
+
+        with self._lock:
+            self._captures.append({
+                'time': datetime.now().isoformat(timespec='seconds'),
+                'function': name,
+                'label': label,
+                'session': (session_id or '')[:8],
+                'mode': mode,
+                'wall_ms': round(wall * 1000, 1),
+                'samples': len(profiler.samples) if mode == 'sample' else None,
+                'files': files
+            })
+
+    def captures(self):
+        """The most recent captures, newest first"""
+        with self._lock:
+            return list(self._captures)[::-1]
+
+@process_singleton
+def get_profiler():
+    """Process-wide Profiler configured from PROFILE_DIR, PROFILE_INTERVAL_MS and PROFILE_QUERY_PARAM"""
+    return Profiler.from_env()
+
+def _arm_from_query_params(profiler, session_id):
+    # ?profile=5&profile_mode=cprofile; removed from the URL so later reruns don't re-arm
+    runs = st.query_params.get('profile')
+    if runs is None:
+        return
+    mode = st.query_params.get('profile_mode', 'sample')
+    del st.query_params['profile']
+    st.query_params.pop('profile_mode', None)
+    try:
+        profiler.arm(int(runs), mode, session_id=session_id)
+    except ValueError:
+        pass
+
+def profile_reruns(main):
+    """Run `main` under the profiler whenever a run is armed for the current session.
+
+    Admins arm runs from the diagnostics page; with PROFILE_QUERY_PARAM=1 any
+    session can arm its own next runs with ?profile=N.
+    """
+    @functools.wraps(main)
+    def wrapper(*args, **kwargs):
+        profiler = get_profiler()
+        ctx = get_script_run_ctx()
+        session_id = ctx.session_id if ctx is not None else None
+        if profiler.allow_query_param and session_id is not None:
+            _arm_from_query_params(profiler, session_id)
+        with profiler.profile(main, session_id, label=st.session_state.get('current_screen')):
+            return main(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,23 @@
+import os
+
+import streamlit as st
+
+from analyzer import AdvancedSymptomAnalyzer
+from database import DatabaseManager
+from notifications import get_dispatcher
+from session_memory import mark_shared
+
+# Shared by every session in this process; the session state only holds a reference
+@st.cache_resource
+def get_shared_db_manager():
+    # MEDICONNECT_DB points the app at another file, e.g. a generated benchmark database
+    db_manager = DatabaseManager(os.getenv('MEDICONNECT_DB', 'mediconnect.db'))
+    # Bookable slots are written here, once, so the booking picker only reads
+    db_manager.materialize_all_slots()
+    # Deliver the outbox from startup, not only after the next message is enqueued
+    get_dispatcher(db_manager)
+    return mark_shared(db_manager)
+
+@st.cache_resource
+def get_shared_symptom_analyzer():
+    return mark_shared(AdvancedSymptomAnalyzer())
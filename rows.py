@@ -0,0 +1,103 @@
+from collections import namedtuple
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# Typed result rows returned by DatabaseManager queries.
+# NamedTuples are plain tuples with __slots__ = (), so they cost no more memory
+# than the positional tuples they replace, but callers read columns by name.
+
+class UserRow(NamedTuple):
+    id: int
+    full_name: str
+    age: Optional[int]
+    gender: Optional[str]
+    email: str
+    phone: Optional[str]
+    location: Optional[str]
+    emergency_contact: Optional[str]
+    medical_history: Optional[str]
+    role: str
+    created_at: Optional[str]
+    last_login: Optional[str]
+
+class AppointmentRow(NamedTuple):
+    id: int
+    patient_id: int
+    doctor_id: int
+    appointment_date: str
+    appointment_time: str
+    status: str
+    reason: Optional[str]
+    notes: Optional[str]
+    created_at: Optional[str]
+    patient_name: str
+    doctor_name: str
+    specialty: str
+
+class PatientAppointmentRow(NamedTuple):
+    id: int
+    doctor_id: int
+    appointment_date: str
+    appointment_time: str
+    status: str
+    reason: Optional[str]
+    doctor_name: str
+    specialty: str
+
+class AnalysisRow(NamedTuple):
+    id: int
+    patient_id: int
+    symptoms: str
+    analysis: str
+    timestamp: str
+
+class PatientAnalysisRow(NamedTuple):
+    id: int
+    patient_id: int
+    symptoms: str
+    analysis: str
+    timestamp: str
+    full_name: str
+    age: Optional[int]
+    gender: Optional[str]
+    email: str
+
+class PatientAnalysisSummaryRow(NamedTuple):
+    """PatientAnalysisRow without the analysis text, for list views"""
+    id: int
+    patient_id: int
+    symptoms: str
+    timestamp: str
+    full_name: str
+    age: Optional[int]
+    gender: Optional[str]
+    email: str
+
+class AnalyticsRow(NamedTuple):
+    id: int
+    symptoms: str
+    analysis: str
+    timestamp: str
+    age: Optional[int]
+    gender: Optional[str]
+
+class AssessmentRow(NamedTuple):
+    id: int
+    analysis_id: int
+    doctor_id: int
+    doctor_name: Optional[str]
+    assessment: str
+    updated_at: str
+
+# Columns list views may ask for; medical_history is left out and loaded per user on demand
+USER_LIST_FIELDS = tuple(field for field in UserRow._fields if field != 'medical_history')
+
+@lru_cache(maxsize=None)
+def user_projection(fields):
+    """Row class for a narrow users query selecting only `fields` (a tuple of column names)"""
+    return namedtuple('UserListRow', fields)
+
+def row_factory(row_class):
+    """sqlite3 row_factory that builds row_class instances from result tuples"""
+    make = row_class._make
+    return lambda cursor, row: make(row)
@@ -0,0 +1,264 @@
+import os
+import sys
+import threading
+import time
+import types
+from collections import deque
+from fnmatch import fnmatchcase
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from metrics import REGISTRY
+from singleton import process_singleton
+
+# Session state keys that may be dropped to stay within budget; the app
+# recreates them on the next run (empty, or from the database). Mostly
+# widgets keyed per record, which pile up as a user opens records. Not
+# 'healthcare_analytics': patients and consultations added there exist
+# nowhere else. Nor 'assessment_text' or 'booking_doctor_id', the
+# doctor's unsaved assessment and the booking form a patient has open.
+REBUILDABLE = (
+    # Delete confirmations left pending on the admin user lists, and their buttons
+    'confirm_delete_*', 'delete_user_*', 'yes_delete_user_*', 'cancel_delete_user_*', 'delete_doctor_*',
+    # record_list page selections; one dropped just closes its detail panel
+    '*_selected_*',
+    # Booking form fields per doctor; the date and time fall back to the first open slot
+    'book_*', 'booking_date_*', 'booking_time_*', 'booking_reason_*', 'confirm_booking_*', 'cancel_booking_*',
+    # Status controls and buttons per appointment or doctor, initialised from the database
+    'apt_status_*', 'update_apt_*', 'complete_*', 'cancel_[0-9]*',
+    'status_[0-9]*', 'available_[0-9]*', 'update_[0-9]*', 'view_*', 'contact_*',
+    # The doctor's weekly hours form, reloaded from doctor_availability
+    'availability_*',
+)
+
+# Not followed when measuring: code, classes and modules belong to the process
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+           types.MethodType, types.CodeType, types.FrameType)
+
+_shared_ids = set()
+
+def mark_shared(obj):
+    """Marks a process-wide object (e.g. a cached resource) so sessions holding it aren't charged for it"""
+    _shared_ids.add(id(obj))
+    return obj
+
+def deep_sizeof(obj, limit=200_000):
+    """(bytes, complete) for obj and everything it references, each object counted once.
+
+    Containers and instance __dict__/__slots__ are followed; an object with
+    its own __sizeof__ (a DataFrame, say) is trusted to report itself.
+    Shared objects count as 0. Stops after `limit` objects, returning
+    complete=False, so one huge entry can't stall a run.
+    """
+    seen = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        if len(seen) >= limit:
+            return size, False
+        obj = stack.pop()
+        if id(obj) in seen or id(obj) in _shared_ids or isinstance(obj, _OPAQUE):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj, 0)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        elif isinstance(obj, (str, bytes, bytearray, int, float, complex, bool)) or obj is None:
+            pass
+        elif type(obj).__sizeof__ is object.__sizeof__:
+            if hasattr(obj, '__dict__'):
+                stack.append(vars(obj))
+            for cls in type(obj).__mro__:
+                for name in getattr(cls, '__slots__', ()):
+                    if hasattr(obj, name):
+                        stack.append(getattr(obj, name))
+    return size, True
+
+def is_rebuildable(key, patterns=REBUILDABLE):
+    return any(fnmatchcase(key, pattern) for pattern in patterns)
+
+class SessionMemoryAuditor:
+    """Measures each session's state per key and keeps sessions within memory budgets.
+
+    Each session measures its own state, at most every audit_interval
+    seconds, from its own script run; the auditor keeps the latest numbers
+    of every session for top_consumers(). A session over session_budget
+    bytes, or every session together over total_budget bytes, loses
+    rebuildable entries, least recently changed first. Entries of other
+    sessions are dropped at the start of their next run, since only the
+    script thread may touch a session's state.
+    """
+
+    def __init__(self, session_budget=1024 * 1024, total_budget=256 * 1024 * 1024, audit_interval=30,
+                 rebuildable=REBUILDABLE, forget_after=24 * 3600):
+        self.session_budget = session_budget
+        self.total_budget = total_budget
+        self.audit_interval = audit_interval
+        self.rebuildable = rebuildable
+        self.forget_after = forget_after
+
+        self._lock = threading.Lock()
+        # session id -> {'audited': monotonic time, 'role': ..., 'keys': {key: entry}}
+        self._sessions = {}
+        # session id -> keys to drop at that session's next run
+        self._pending = {}
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            session_budget=int(float(os.getenv('SESSION_MEMORY_BUDGET_KB', '1024')) * 1024),
+            total_budget=int(float(os.getenv('SESSION_MEMORY_TOTAL_MB', '256')) * 1024 * 1024),
+            audit_interval=float(os.getenv('SESSION_AUDIT_SECONDS', '30'))
+        )
+
+    def _measure(self, state, previous):
+        now = time.monotonic()
+        keys = {}
+        for key in list(state.keys()):
+            try:
+                value = state[key]
+            except KeyError:
+                continue
+            size, complete = deep_sizeof(value)
+            entry = previous.get(key)
+            if entry is None or entry['bytes'] != size or entry['id'] != id(value):
+                entry = {'bytes': size, 'id': id(value), 'changed': now}
+            else:
+                entry = dict(entry)
+            entry['complete'] = complete
+            entry['shared'] = id(value) in _shared_ids
+            keys[key] = entry
+        return keys
+
+    def _evict(self, state, session_id, keys):
+        freed = 0
+        for key in keys:
+            if key in state:
+                del state[key]
+            entry = self._sessions.get(session_id, {}).get('keys', {}).pop(key, None)
+            if entry is not None:
+                freed += entry['bytes']
+                self.evictions += 1
+        self.evicted_bytes += freed
+        return freed
+
+    def _over_budget(self, session_id):
+        """Rebuildable entries to drop, as {session id: [keys]}; called with the lock held"""
+        def candidates(sessions):
+            return sorted(
+                (entry['changed'], sid, key, entry['bytes'])
+                for sid in sessions
+                for key, entry in self._sessions[sid]['keys'].items()
+                if is_rebuildable(key, self.rebuildable)
+            )
+
+        chosen = {}
+        own = self._sessions[session_id]['keys']
+        excess = sum(entry['bytes'] for entry in own.values()) - self.session_budget
+        for _, sid, key, size in candidates([session_id]):
+            if excess <= 0:
+                break
+            chosen.setdefault(sid, []).append(key)
+            excess -= size
+
+        excess = self._total_bytes() - self.total_budget - sum(
+            own[key]['bytes'] for key in chosen.get(session_id, ()))
+        for _, sid, key, size in candidates(self._sessions):
+            if excess <= 0:
+                break
+            if key not in chosen.get(sid, ()):
+                chosen.setdefault(sid, []).append(key)
+                excess -= size
+        return chosen
+
+    def _total_bytes(self):
+        return sum(entry['bytes'] for session in self._sessions.values()
+                   for entry in session['keys'].values() if not entry['shared'])
+
+    def check(self, state, session_id, role=None, force=False):
+        """Audit this session's state if it is due, and drop what the budgets require; returns bytes freed"""
+        now = time.monotonic()
+        with self._lock:
+            freed = self._evict(state, session_id, self._pending.pop(session_id, ()))
+            session = self._sessions.get(session_id)
+            if session is not None and not force and now - session['audited'] < self.audit_interval:
+                return freed
+            previous = session['keys'] if session else {}
+
+        keys = self._measure(state, previous)
+
+        with self._lock:
+            self._sessions[session_id] = {'audited': now, 'role': role, 'keys': keys}
+            for sid in [sid for sid, s in self._sessions.items() if now - s['audited'] > self.forget_after]:
+                del self._sessions[sid]
+                self._pending.pop(sid, None)
+            for sid, evict in self._over_budget(session_id).items():
+                if sid == session_id:
+                    freed += self._evict(state, sid, evict)
+                else:
+                    self._pending.setdefault(sid, set()).update(evict)
+        return freed
+
+    def top_consumers(self, limit=20):
+        """The largest entries across all sessions, as of each session's last audit"""
+        now = time.monotonic()
+        with self._lock:
+            rows = [
+                {
+                    'session': sid[:8],
+                    'role': session['role'],
+                    'key': key,
+                    'kb': round(entry['bytes'] / 1024, 1),
+                    'rebuildable': is_rebuildable(key, self.rebuildable),
+                    'shared': entry['shared'],
+                    'idle_s': round(now - entry['changed']),
+                    'complete': entry['complete']
+                }
+                for sid, session in self._sessions.items()
+                for key, entry in session['keys'].items()
+            ]
+        rows.sort(key=lambda row: row['kb'], reverse=True)
+        return rows[:limit]
+
+    def summary(self):
+        with self._lock:
+            sessions = {sid: sum(entry['bytes'] for entry in session['keys'].values() if not entry['shared'])
+                        for sid, session in self._sessions.items()}
+            return {
+                'sessions': len(sessions),
+                'total_kb': round(sum(sessions.values()) / 1024, 1),
+                'largest_session_kb': round(max(sessions.values(), default=0) / 1024, 1),
+                'session_budget_kb': round(self.session_budget / 1024),
+                'total_budget_kb': round(self.total_budget / 1024),
+                'pending_evictions': sum(len(keys) for keys in self._pending.values()),
+                'evictions': self.evictions,
+                'evicted_kb': round(self.evicted_bytes / 1024, 1)
+            }
+
+@process_singleton
+def get_session_auditor():
+    """Process-wide auditor configured from SESSION_MEMORY_BUDGET_KB, SESSION_MEMORY_TOTAL_MB and
+    SESSION_AUDIT_SECONDS"""
+    auditor = SessionMemoryAuditor.from_env()
+    REGISTRY.gauge('mediconnect_session_state_bytes',
+                   'Session state held by all sessions, as of their last audit',
+                   function=lambda: auditor.summary()['total_kb'] * 1024)
+    REGISTRY.callback_counter('mediconnect_session_state_evictions_total',
+                              'Rebuildable session state entries dropped to stay within budget',
+                              lambda: auditor.evictions)
+    return auditor
+
+def enforce_session_budget():
+    """Run the auditor for the current session; call before the session state defaults are filled in"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return 0
+    user_info = st.session_state.get('user_info') or {}
+    return get_session_auditor().check(st.session_state, ctx.session_id, role=user_info.get('role'))
@@ -0,0 +1,23 @@
+import functools
+import threading
+
+def process_singleton(factory):
+    """Turns `factory` into a getter that builds its object once per process.
+
+    The first call runs the factory under a lock; later calls return the same
+    object without locking. Arguments only matter on that first call. A
+    factory that returns None is tried again on the next call, e.g. an
+    exporter that isn't configured.
+    """
+    lock = threading.Lock()
+    instance = None
+
+    @functools.wraps(factory)
+    def get(*args, **kwargs):
+        nonlocal instance
+        if instance is None:
+            with lock:
+                if instance is None:
+                    instance = factory(*args, **kwargs)
+        return instance
+    return get
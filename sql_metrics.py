@@ -0,0 +1,439 @@
+import argparse
+import contextvars
+import functools
+import inspect
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from metrics import DB_QUERY_SECONDS, QUERY_BUCKETS, Histogram
+from singleton import process_singleton
+
+# Queries on the request path, by DatabaseManager method, with the tables each
+# may legitimately scan. A plan that scans any other table is a regression.
+HOT_QUERIES = {
+    'authenticate_user': set(),
+    'get_user_medical_history': set(),
+    'list_users': set(),
+    'count_users': set(),
+    'get_doctor_by_user_id': set(),
+    'get_user_appointments': set(),
+    'get_doctor_appointments': set(),
+    # Walks the date/time index newest first and stops at LIMIT
+    'list_appointments': {'a'},
+    # Counting every appointment reads the whole table
+    'count_appointments': {'a', 'u'},
+    'get_open_slots': set(),
+    'has_slots': set(),
+    'get_user_analyses': set(),
+    # Walks the timestamp index newest first and stops at LIMIT
+    'list_symptom_analyses_with_patients': {'sa'},
+    # Counting every analysis (or every search match) reads the whole table
+    'count_symptom_analyses': {'sa', 'u'},
+    'get_analysis_text': set(),
+    'get_assessment': set(),
+    'get_latest_assessments': set(),
+    'count_analyses_in_window': set(),
+    'count_active_users': set(),
+    'claim_notifications': set(),
+}
+
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE', 'INSERT', 'REPLACE', 'WITH')
+# "SCAN users" or "SCAN sa USING INDEX ..."; not "SCAN (subquery-1)" or "SCAN CONSTANT ROW"
+FULL_SCAN = re.compile(r'^SCAN (\w+)(?: |$)(?!ROW)')
+
+class QueryPlanError(AssertionError):
+    """A hot query's plan scans a table it is not allowed to scan"""
+
+def normalize_sql(sql):
+    """Whitespace collapsed and IN (?, ?, ...) lists of any length folded into one shape"""
+    sql = ' '.join(sql.split())
+    return re.sub(r'\?(?:\s*,\s*\?)+', '?, ...', sql)
+
+def _value_shape(value):
+    if value is None:
+        return 'NULL'
+    if isinstance(value, (str, bytes)):
+        return f'{type(value).__name__}[{len(value)}]'
+    return type(value).__name__
+
+def parameter_shape(parameters):
+    """Types (and lengths of strings) of bound parameters; never the values, which may be patient data"""
+    if isinstance(parameters, dict):
+        return {key: _value_shape(value) for key, value in parameters.items()}
+    return [_value_shape(value) for value in parameters]
+
+# The named_queries method running on this thread; the innermost one when they call each other
+_current_query = contextvars.ContextVar('current_query', default=None)
+
+def _named_query(method):
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        token = _current_query.set(name)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _current_query.reset(token)
+    return wrapper
+
+def named_queries(cls):
+    """Class decorator: statements run by a public method of cls are recorded under the method's name"""
+    for name, value in list(vars(cls).items()):
+        if not name.startswith('_') and inspect.isfunction(value):
+            setattr(cls, name, _named_query(value))
+    return cls
+
+def query_name():
+    """The named_queries method running the statement, or module.function of the caller outside one"""
+    name = _current_query.get()
+    if name is not None:
+        return name
+    # Only statements run outside those methods pay for looking at the stack
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if not code.co_filename.endswith('sql_metrics.py'):
+            return f"{os.path.splitext(os.path.basename(code.co_filename))[0]}.{code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+class QueryScope:
+    """Statements recorded on one thread while a SqlRecorder.scope() is open"""
+    __slots__ = ('calls', 'seconds', 'rows')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows = 0
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Times each statement from execute until its rows are fetched (or the cursor or connection closes)"""
+
+    def _finish(self):
+        pending = getattr(self, '_pending', None)
+        if pending is not None:
+            self._pending = None
+            self.connection.recorder.record(*pending)
+
+    def _timed(self, method, sql, parameters, many=False):
+        self._finish()
+        recorder = self.connection.recorder
+        name = query_name()
+        if many:
+            parameters = list(parameters)
+            first = parameters[0] if parameters else ()
+        else:
+            first = parameters
+        recorder.capture_plan(self.connection, name, sql, first)
+
+        start = time.perf_counter()
+        method(sql, parameters)
+        elapsed = time.perf_counter() - start
+        # [name, sql, parameters, seconds, rows, executions]
+        self._pending = [name, sql, first, elapsed, 0, len(parameters) if many else 1]
+        if many or self.description is None:
+            # Nothing to fetch; writes report their affected row count
+            self._pending[4] = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def execute(self, sql, parameters=()):
+        return self._timed(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._timed(super().executemany, sql, seq_of_parameters, many=True)
+
+    def _fetch(self, method, *args):
+        start = time.perf_counter()
+        result = method(*args)
+        elapsed = time.perf_counter() - start
+        pending = getattr(self, '_pending', None)
+        if pending is not None:
+            pending[3] += elapsed
+            if isinstance(result, list):
+                pending[4] += len(result)
+            elif result is not None:
+                pending[4] += 1
+        return result
+
+    def fetchone(self):
+        row = self._fetch(super().fetchone)
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._fetch(super().fetchmany, self.arraysize if size is None else size)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._fetch(super().fetchall)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3 connection whose cursors report to `recorder`; made by SqlRecorder.connect"""
+
+    recorder = None
+
+    def cursor(self, factory=None):
+        cursor = super().cursor(factory or InstrumentedCursor)
+        if isinstance(cursor, InstrumentedCursor):
+            self._cursors.add(cursor)
+        return cursor
+
+    # Connection.execute creates its cursor in C, bypassing cursor() above
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def close(self):
+        # Statements whose rows were only partly fetched end here
+        for cursor in list(self._cursors):
+            cursor._finish()
+        super().close()
+
+class SqlRecorder:
+    """Per-query latency histograms, a slow query log and plans of the hot queries.
+
+    Statements are named after the DatabaseManager method that runs them.
+    Statements slower than slow_ms go to an in-memory ring of the last
+    slow_log_size entries and, with slow_log_path, to a JSON lines file;
+    entries carry the parameter shapes, not their values. The first time a
+    HOT_QUERIES method runs a statement its EXPLAIN QUERY PLAN is kept, and
+    full_scans() lists plans that scan a table the method may not scan.
+    Latencies go to `histogram` (labelled by query), a private one unless
+    given; the process recorder reports into the exported DB_QUERY_SECONDS.
+    """
+
+    def __init__(self, enabled=True, slow_ms=100, slow_log_path=None, slow_log_size=200,
+                 hot_queries=HOT_QUERIES, histogram=None):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.slow_log_path = slow_log_path
+        self.hot_queries = hot_queries
+        self.histogram = histogram or Histogram('sql_query_seconds', 'SQL statement latency by query',
+                                                ['query'], buckets=QUERY_BUCKETS)
+
+        self._lock = threading.Lock()
+        # Histogram values as of the last reset(), since an exported histogram can't be cleared
+        self._baseline = {}
+        # query name -> [rows, slowest seconds] since the last reset()
+        self._stats = {}
+        self._slow = deque(maxlen=slow_log_size)
+        self._plans = {}
+        self._local = threading.local()
+
+    @classmethod
+    def from_env(cls, histogram=None):
+        return cls(
+            enabled=os.getenv('SQL_METRICS', '1') != '0',
+            slow_ms=float(os.getenv('SQL_SLOW_MS', '100')),
+            slow_log_path=os.getenv('SQL_SLOW_LOG'),
+            histogram=histogram
+        )
+
+    def connect(self, database, **kwargs):
+        conn = sqlite3.connect(database, factory=InstrumentedConnection, **kwargs)
+        conn.recorder = self
+        conn._cursors = weakref.WeakSet()
+        return conn
+
+    @contextmanager
+    def scope(self):
+        """Yields a QueryScope that adds up the statements this thread runs until the block exits"""
+        scopes = self._local.__dict__.setdefault('scopes', [])
+        query_scope = QueryScope()
+        scopes.append(query_scope)
+        try:
+            yield query_scope
+        finally:
+            scopes.remove(query_scope)
+
+    def record(self, name, sql, parameters, seconds, rows, executions=1):
+        for query_scope in getattr(self._local, 'scopes', ()):
+            query_scope.calls += 1
+            query_scope.seconds += seconds
+            query_scope.rows += rows
+        self.histogram.observe(seconds, query=name)
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = [0, 0.0]
+            stats[0] += rows
+            stats[1] = max(stats[1], seconds)
+
+        if seconds * 1000 < self.slow_ms:
+            return
+        entry = {
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'query': name,
+            'ms': round(seconds * 1000, 3),
+            'rows': rows,
+            'executions': executions,
+            'sql': normalize_sql(sql),
+            'parameters': parameter_shape(parameters)
+        }
+        with self._lock:
+            self._slow.append(entry)
+            if self.slow_log_path:
+                with open(self.slow_log_path, 'a') as f:
+                    f.write(json.dumps(entry) + '\n')
+
+    def capture_plan(self, conn, name, sql, parameters):
+        """EXPLAIN QUERY PLAN the first run of each statement of a hot query"""
+        if name not in self.hot_queries:
+            return
+        normalized = normalize_sql(sql)
+        key = (name, normalized)
+        if key in self._plans or not normalized.upper().startswith(EXPLAINABLE):
+            return
+        try:
+            # A plain cursor, so the EXPLAIN itself isn't recorded
+            plan = [row[3] for row in sqlite3.Cursor(conn).execute('EXPLAIN QUERY PLAN ' + sql, parameters)]
+        except sqlite3.Error as e:
+            plan = [f'EXPLAIN failed: {e}']
+        with self._lock:
+            self._plans[key] = plan
+
+    def plans(self):
+        with self._lock:
+            return [{'query': name, 'sql': sql, 'plan': plan} for (name, sql), plan in self._plans.items()]
+
+    def full_scans(self):
+        """[{'query', 'sql', 'scan'}] for every captured plan that scans a table its query may not scan"""
+        scans = []
+        for entry in self.plans():
+            allowed = self.hot_queries.get(entry['query'], set())
+            for line in entry['plan']:
+                match = FULL_SCAN.match(line)
+                if match and match.group(1) not in allowed:
+                    scans.append({'query': entry['query'], 'sql': entry['sql'], 'scan': line})
+        return scans
+
+    def assert_no_full_scans(self):
+        """Raise QueryPlanError listing the offending plans; for tests and CI"""
+        scans = self.full_scans()
+        if scans:
+            raise QueryPlanError('Hot queries scan whole tables:\n' + '\n'.join(
+                f"  {scan['query']}: {scan['scan']}\n    {scan['sql']}" for scan in scans))
+
+    def snapshot(self):
+        """{query name: stats dict}, slowest total first.
+
+        Percentiles are the upper bound of the bucket they fall in, capped at
+        the slowest statement.
+        """
+        values = self.histogram.values()
+        with self._lock:
+            baseline = dict(self._baseline)
+            extra = {name: tuple(stats) for name, stats in self._stats.items()}
+
+        snapshot = []
+        for name, (rows, max_seconds) in extra.items():
+            state = values.get((name,))
+            if state is None:
+                continue
+            before = baseline.get((name,))
+            if before is not None:
+                state = [value - old for value, old in zip(state, before)]
+            seconds, count = state[-2], state[-1]
+            if not count:
+                continue
+            snapshot.append((seconds, name, {
+                'count': count,
+                'total_ms': round(seconds * 1000, 3),
+                'mean_ms': round(seconds / count * 1000, 3),
+                'p50_ms': round(min(self.histogram.quantile(state, 0.50), max_seconds) * 1000, 3),
+                'p95_ms': round(min(self.histogram.quantile(state, 0.95), max_seconds) * 1000, 3),
+                'p99_ms': round(min(self.histogram.quantile(state, 0.99), max_seconds) * 1000, 3),
+                'max_ms': round(max_seconds * 1000, 3),
+                'rows': rows,
+                # Upper bounds in milliseconds
+                'buckets': dict(zip([f'{bound * 1000:g}' for bound in self.histogram.buckets] + ['+Inf'],
+                                    state[:-2]))
+            }))
+        snapshot.sort(key=lambda item: item[0], reverse=True)
+        return {name: stats for _, name, stats in snapshot}
+
+    def slow_queries(self):
+        with self._lock:
+            return list(self._slow)
+
+    def reset(self):
+        values = self.histogram.values()
+        with self._lock:
+            self._baseline = values
+            self._stats.clear()
+            self._slow.clear()
+            self._plans.clear()
+
+@process_singleton
+def get_sql_recorder():
+    """Process-wide SqlRecorder configured from SQL_METRICS, SQL_SLOW_MS and SQL_SLOW_LOG"""
+    return SqlRecorder.from_env(histogram=DB_QUERY_SECONDS)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run every DatabaseManager method once against a benchmark database and check the '
+                    'query plans of the hot queries; exits with status 1 if one scans a whole table.')
+    parser.add_argument('--db', help='Benchmark database (default bench_<scale>.db, generated if missing)')
+    parser.add_argument('--scale', default='10k', help='Scale of a generated database (default 10k)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='Print plans and timings as JSON')
+    args = parser.parse_args()
+
+    from bench_database import SCALES, Workload, generate, read_meta
+    from credentials import PasswordHasher, load_params
+    from database import DatabaseManager
+
+    scale = SCALES.get(args.scale.lower()) or int(args.scale)
+    db_path = args.db or f'bench_{args.scale.lower()}.db'
+    hasher = PasswordHasher(**load_params())
+    if not read_meta(db_path):
+        print(f"Generating {db_path} at scale {scale}...", file=sys.stderr)
+        generate(db_path, scale, args.seed, hasher=hasher, log=lambda message: print(message, file=sys.stderr))
+
+    recorder = SqlRecorder(slow_ms=float('inf'))
+    db = DatabaseManager(db_path, password_hasher=hasher, write_behind=False, sql_recorder=recorder)
+    for _, call in Workload(db, args.seed).cases():
+        call()
+
+    scans = recorder.full_scans()
+    if args.json:
+        print(json.dumps({'queries': recorder.snapshot(), 'plans': recorder.plans(), 'full_scans': scans}, indent=2))
+    else:
+        for entry in recorder.plans():
+            flagged = {scan['scan'] for scan in scans if scan['sql'] == entry['sql']}
+            print(f"{entry['query']}: {entry['sql'][:100]}")
+            for line in entry['plan']:
+                print(f"  {'!!' if line in flagged else '  '} {line}")
+        print(f"\n{len(scans)} disallowed full scan(s) in {len(recorder.plans())} hot statements")
+    sys.exit(1 if scans else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+from functools import lru_cache
+
+import streamlit as st
+
+from singleton import process_singleton
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(ROOT, 'assets')
+# Served by Streamlit at app/static/ when server.enableStaticServing is on (.streamlit/config.toml)
+STATIC_DIR = os.path.join(ROOT, 'static')
+STATIC_URL = 'app/static'
+MANIFEST_FILE = os.path.join(STATIC_DIR, 'asset-manifest.json')
+
+# Widths (CSS pixels) each source image is displayed at; variants are built at 1x and 2x
+DISPLAY_WIDTHS = {
+    'mediconnect_logo.png': [260],
+}
+
+# App stylesheet source; the built copy keeps only selectors the app's markup can match
+CSS_SOURCE = os.path.join(ROOT, 'styles', 'app.css')
+CSS_NAME = 'app.css'
+# Classes rendered by Streamlit itself rather than by our HTML; selectors using them are always kept
+FRAMEWORK_CLASS = re.compile(r'^(st[A-Z]\w*|block-container)$')
+
+FORMATS = [
+    ('webp', 'WEBP', {'quality': 85, 'method': 6}),
+    ('png', 'PNG', {'optimize': True}),
+]
+
+def _content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+def _app_source_text(scan_dir=ROOT):
+    """All Python source in the app directory, where the HTML class names are written"""
+    text = []
+    for name in sorted(os.listdir(scan_dir)):
+        if name.endswith('.py'):
+            with open(os.path.join(scan_dir, name), encoding='utf-8') as f:
+                text.append(f.read())
+    return '\n'.join(text)
+
+def _selector_used(selector, source_text):
+    for name in re.findall(r'[.#]([A-Za-z_][\w-]*)', selector):
+        if FRAMEWORK_CLASS.match(name):
+            continue
+        if not re.search(rf'(?<![\w-]){re.escape(name)}(?![\w-])', source_text):
+            return False
+    return True
+
+def minify_css(css, source_text=None):
+    """Strip comments and whitespace; with source_text, also drop selectors it never uses.
+
+    Handles flat rule lists (no @media or other nested blocks), which is all
+    styles/app.css contains. Returns (css, removed selectors).
+    """
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    rules, removed = [], []
+    for selectors, body in re.findall(r'([^{}]+)\{([^{}]*)\}', css):
+        kept = []
+        for selector in selectors.split(','):
+            selector = re.sub(r'\s*([>+~])\s*', r'\1', ' '.join(selector.split()))
+            if source_text is None or _selector_used(selector, source_text):
+                kept.append(selector)
+            else:
+                removed.append(selector)
+        declarations = []
+        for declaration in body.split(';'):
+            prop, _, value = declaration.partition(':')
+            if prop.strip():
+                declarations.append(f"{prop.strip()}:{' '.join(value.split())}")
+        if kept and declarations:
+            rules.append(f"{','.join(kept)}{{{';'.join(declarations)}}}")
+    return ''.join(rules), removed
+
+def build_css(source=CSS_SOURCE, static_dir=STATIC_DIR, scan_dir=ROOT):
+    """Write the pruned, minified stylesheet as app.<hash>.css; returns its manifest entry"""
+    with open(source, encoding='utf-8') as f:
+        css = f.read()
+    source_text = _app_source_text(scan_dir)
+    minified, removed = minify_css(css, source_text)
+    data = minified.encode('utf-8')
+
+    os.makedirs(static_dir, exist_ok=True)
+    filename = f"app.{_content_hash(data)}.css"
+    path = os.path.join(static_dir, filename)
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    return {
+        'file': filename,
+        'source_hash': _content_hash(css.encode('utf-8') + source_text.encode('utf-8')),
+        'bytes': len(data),
+        'removed_selectors': removed
+    }
+
+def build_images(source_dir=SOURCE_DIR, static_dir=STATIC_DIR, display_widths=DISPLAY_WIDTHS):
+    """Render resized WebP/PNG variants with content-hashed names; returns their manifest entries.
+
+    Requires Pillow. Files whose name already exists are not rewritten, since
+    the name is derived from the content.
+    """
+    from PIL import Image
+
+    os.makedirs(static_dir, exist_ok=True)
+    manifest = {}
+
+    for name, widths in display_widths.items():
+        with open(os.path.join(source_dir, name), 'rb') as f:
+            source = f.read()
+        stem = os.path.splitext(name)[0]
+
+        image = Image.open(io.BytesIO(source))
+        image.load()
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+
+        variants = []
+        for width in widths:
+            for scale in (1, 2):
+                pixels = min(width * scale, image.width)
+                if pixels == image.width:
+                    resized = image
+                else:
+                    resized = image.resize((pixels, round(image.height * pixels / image.width)), Image.LANCZOS)
+
+                for extension, pil_format, options in FORMATS:
+                    buffer = io.BytesIO()
+                    resized.save(buffer, pil_format, **options)
+                    data = buffer.getvalue()
+
+                    filename = f"{stem}-{pixels}w.{_content_hash(data)}.{extension}"
+                    path = os.path.join(static_dir, filename)
+                    if not os.path.exists(path):
+                        with open(path, 'wb') as f:
+                            f.write(data)
+                    variants.append({
+                        'file': filename, 'display_width': width, 'scale': scale,
+                        'format': extension, 'bytes': len(data)
+                    })
+
+        manifest[name] = {'source_hash': _content_hash(source), 'variants': variants}
+
+    return manifest
+
+def build_assets(static_dir=STATIC_DIR):
+    """Build the stylesheet and image variants into static_dir and write the manifest"""
+    manifest = {CSS_NAME: build_css(static_dir=static_dir)}
+    try:
+        manifest.update(build_images(static_dir=static_dir))
+    except ImportError:
+        # Pillow isn't installed; show_image falls back to the source files
+        pass
+
+    with open(os.path.join(static_dir, os.path.basename(MANIFEST_FILE)), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def _manifest_is_current(manifest, source_dir=SOURCE_DIR, display_widths=DISPLAY_WIDTHS):
+    css = manifest.get(CSS_NAME)
+    if not css or not os.path.exists(os.path.join(STATIC_DIR, css['file'])):
+        return False
+    with open(CSS_SOURCE, 'rb') as f:
+        if _content_hash(f.read() + _app_source_text().encode('utf-8')) != css['source_hash']:
+            return False
+
+    for name, widths in display_widths.items():
+        entry = manifest.get(name)
+        if not entry or {v['display_width'] for v in entry['variants']} != set(widths):
+            return False
+        with open(os.path.join(source_dir, name), 'rb') as f:
+            if _content_hash(f.read()) != entry['source_hash']:
+                return False
+        if not all(os.path.exists(os.path.join(STATIC_DIR, v['file'])) for v in entry['variants']):
+            return False
+    return True
+
+@process_singleton
+def get_manifest():
+    """Process-wide asset manifest, rebuilt once if the sources changed.
+
+    Images are missing from it without Pillow, and everything is missing if
+    the build fails; show_image and inject_styles then fall back to the
+    source files.
+    """
+    try:
+        with open(MANIFEST_FILE) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    if not _manifest_is_current(manifest):
+        try:
+            manifest = build_assets()
+        except OSError:
+            manifest = {}
+    return manifest
+
+@lru_cache(maxsize=None)
+def _source_bytes(name):
+    with open(os.path.join(SOURCE_DIR, name), 'rb') as f:
+        return f.read()
+
+@lru_cache(maxsize=None)
+def _picture_html(name, width, alt):
+    entry = get_manifest().get(name)
+    if not entry:
+        return None
+
+    variants = [v for v in entry['variants'] if v['display_width'] == width]
+    if not variants:
+        return None
+
+    def srcset(extension):
+        return ', '.join(f"{STATIC_URL}/{v['file']} {v['scale']}x"
+                         for v in variants if v['format'] == extension)
+
+    fallback = next(v for v in variants if v['format'] == 'png' and v['scale'] == 1)
+    return (
+        f'<picture>'
+        f'<source type="image/webp" srcset="{srcset("webp")}">'
+        f'<img src="{STATIC_URL}/{fallback["file"]}" srcset="{srcset("png")}" width="{width}" alt="{alt}">'
+        f'</picture>'
+    )
+
+def show_image(name, width, alt=''):
+    """Display a branding image from assets/.
+
+    With static serving on, the page references the pre-built hashed files,
+    so the browser caches them and nothing goes through Streamlit's media
+    manager on reruns. Otherwise the original bytes are read once per
+    process and passed to st.image.
+    """
+    html = _picture_html(name, width, alt) if st.get_option('server.enableStaticServing') else None
+    if html:
+        st.markdown(html, unsafe_allow_html=True)
+    else:
+        st.image(_source_bytes(name), width=width)
+
+@lru_cache(maxsize=None)
+def _inline_css():
+    with open(CSS_SOURCE, encoding='utf-8') as f:
+        return minify_css(f.read())[0]
+
+def inject_styles():
+    """Add the app stylesheet to the page; call once per script run.
+
+    With static serving on this is a one-line <link> to the hashed file,
+    which the browser downloads once and caches. Otherwise the minified
+    stylesheet is inlined.
+    """
+    entry = get_manifest().get(CSS_NAME)
+    if entry and st.get_option('server.enableStaticServing'):
+        st.markdown(f'<link rel="stylesheet" href="{STATIC_URL}/{entry["file"]}">', unsafe_allow_html=True)
+    else:
+        st.markdown(f'<style>{_inline_css()}</style>', unsafe_allow_html=True)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build the minified stylesheet and resized image variants, content-hashed, into static/.')
+    parser.parse_args()
+
+    manifest = build_assets()
+    css = manifest[CSS_NAME]
+    print(f"{CSS_NAME}: {css['file']} ({css['bytes']} bytes, {len(css['removed_selectors'])} unused selectors removed)")
+    for selector in css['removed_selectors']:
+        print(f"  - {selector}")
+    for name, entry in manifest.items():
+        if name == CSS_NAME:
+            continue
+        print(name)
+        for variant in entry['variants']:
+            print(f"  {variant['file']} ({variant['bytes']} bytes)")
+
+if __name__ == "__main__":
+    main()
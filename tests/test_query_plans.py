@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_database import Workload, generate
+from credentials import PasswordHasher
+from database import DatabaseManager
+from sql_metrics import HOT_QUERIES, SqlRecorder
+
+SCALE = 2000
+SEED = 42
+
+@pytest.fixture(scope='module')
+def recorder(tmp_path_factory):
+    """A recorder that has seen every benchmark workload call once against a seeded database"""
+    db_path = str(tmp_path_factory.mktemp('plans') / 'bench.db')
+    # Cheap KDF parameters; hashing isn't what this test is about
+    hasher = PasswordHasher(n=2 ** 4, r=1, p=1)
+    generate(db_path, SCALE, SEED, hasher=hasher, log=lambda message: None)
+
+    recorder = SqlRecorder(slow_ms=float('inf'))
+    db = DatabaseManager(db_path, password_hasher=hasher, write_behind=False, sql_recorder=recorder)
+    for _, call in Workload(db, SEED).cases():
+        call()
+    return recorder
+
+def test_hot_queries_use_indexes(recorder):
+    recorder.assert_no_full_scans()
+
+def test_every_hot_query_was_explained(recorder):
+    explained = {entry['query'] for entry in recorder.plans()}
+    assert set(HOT_QUERIES) <= explained, sorted(set(HOT_QUERIES) - explained)
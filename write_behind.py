@@ -0,0 +1,146 @@
+import atexit
+import logging
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+class WriteBehindBuffer:
+    """Coalescing write-behind queue for idempotent UPDATEs.
+
+    Updates are keyed by (table, row id); a newer update for the same row
+    replaces the older one's columns instead of queueing another statement.
+    Pending updates are written in a single transaction every
+    flush_interval_ms, as soon as max_items rows are pending, and at exit.
+    A batch that fails is queued again; after max_retries failed flushes
+    in a row the queued updates are logged and dropped, so a bad update
+    can't keep the buffer retrying forever.
+    """
+
+    def __init__(self, connect, flush_interval_ms=500, max_items=500, max_retries=5):
+        self._connect = connect
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_items = max_items
+        self.max_retries = max_retries
+
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+        self.flushes = 0
+        self.rows_written = 0
+        self.updates_coalesced = 0
+        self.failed_flushes = 0
+        self.rows_dropped = 0
+        self._failures_in_row = 0
+
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, table, row_id, values):
+        """Queue `UPDATE table SET values WHERE id = row_id`"""
+        with self._lock:
+            key = (table, row_id)
+            if key in self._pending:
+                self._pending[key].update(values)
+                self.updates_coalesced += 1
+            else:
+                self._pending[key] = dict(values)
+            full = len(self._pending) >= self.max_items
+        if full:
+            self._wakeup.set()
+
+    def has_pending(self, *tables):
+        with self._lock:
+            if not tables:
+                return bool(self._pending)
+            return any(table in tables for table, _ in self._pending)
+
+    def flush(self):
+        """Write everything pending in one transaction; returns the number of rows written"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+
+            # Group rows that update the same columns so each group is one executemany
+            statements = {}
+            for (table, row_id), values in batch.items():
+                columns = tuple(sorted(values))
+                statements.setdefault((table, columns), []).append(
+                    tuple(values[column] for column in columns) + (row_id,)
+                )
+
+            conn = None
+            try:
+                conn = self._connect()
+                cursor = conn.cursor()
+                for (table, columns), rows in statements.items():
+                    assignments = ', '.join(f'{column} = ?' for column in columns)
+                    cursor.executemany(f'UPDATE {table} SET {assignments} WHERE id = ?', rows)
+                conn.commit()
+            except sqlite3.Error:
+                if conn is not None:
+                    conn.rollback()
+                self.failed_flushes += 1
+                self._failures_in_row += 1
+                if self._failures_in_row >= self.max_retries:
+                    self._failures_in_row = 0
+                    self.rows_dropped += len(batch)
+                    logger.error("Dropping %d write-behind updates after %d failed flushes: %s",
+                                 len(batch), self.max_retries, sorted(batch))
+                else:
+                    # Put the batch back unless a newer update for the same row arrived meanwhile
+                    with self._lock:
+                        for key, values in batch.items():
+                            merged = dict(values)
+                            merged.update(self._pending.get(key, {}))
+                            self._pending[key] = merged
+                raise
+            finally:
+                if conn is not None:
+                    conn.close()
+
+            self._failures_in_row = 0
+            self.flushes += 1
+            self.rows_written += len(batch)
+            return len(batch)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                # flush() has queued the updates again (or dropped them); retry on the next interval
+                logger.exception("Write-behind flush failed")
+
+    def close(self):
+        """Stop the background thread and write whatever is still pending; never raises"""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        atexit.unregister(self.close)
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Could not write %d pending write-behind updates at close", self.stats()['pending'])
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'pending': pending,
+            'flushes': self.flushes,
+            'rows_written': self.rows_written,
+            'updates_coalesced': self.updates_coalesced,
+            'failed_flushes': self.failed_flushes,
+            'rows_dropped': self.rows_dropped
+        }